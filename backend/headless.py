@@ -0,0 +1,248 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+
+"""
+Headless auto-tune daemon: follows the TRX frequency and switches the tuner
+using the saved settings, without Qt.
+
+Usage:
+    python main.py --headless [--settings settings.json] [--latency-dump latency.json]
+
+Runs until SIGINT/SIGTERM, so it can be supervised by systemd. TRX and SBC
+connection parameters are taken from the settings file written by the GUI.
+"""
+
+import signal
+import sys
+import threading
+from typing import Optional
+from backend.services.auto_tune_engine import AutoTuneEngine
+from backend.services.cat_poller import CatPoller
+from backend.services.impl.settings_service_impl import SettingsServiceImpl
+from backend.services.impl.trx_service_impl import TRXServiceImpl
+from backend.services.impl.tuner_service_impl import TunerServiceImpl
+from backend.services.tuner_sender import TunerSender
+from backend.utils.latency import tracer
+from backend.utils.network import HttpPortReadback
+from backend.utils.poll_scheduler import AdaptivePollScheduler
+from backend.utils.transition_planner import TransitionPlanner
+
+class HeadlessDaemon:
+    """
+    Wires the backend services together for unattended operation.
+
+    Attributes:
+        settings (SettingsServiceImpl): Loaded settings.
+        tuner (TunerServiceImpl): SBC65EC tuner service.
+        sender (TunerSender): Worker thread doing the tuner sends.
+        engine (AutoTuneEngine): Follow-the-rig logic.
+        poller (CatPoller): TRX owner/poller; runs on the main thread.
+        reconnect_delay (float): Seconds between TRX reconnect attempts.
+        heartbeat_interval (float): Seconds between tuner reachability checks.
+    """
+
+    def __init__(self, settings_file: str = "settings.json",
+                 reconnect_delay: float = 5.0, heartbeat_interval: float = 1.0):
+        """
+        Initialize the daemon from a settings file.
+
+        Args:
+            settings_file (str): Path to the JSON settings file.
+            reconnect_delay (float): Seconds between TRX reconnect attempts.
+            heartbeat_interval (float): Seconds between tuner reachability checks.
+        """
+        # Read-only: the daemon never edits, and the GUI may own the file
+        self.settings = SettingsServiceImpl(settings_file, read_only=True)
+        self.tuner = TunerServiceImpl(
+            self.settings.sbc_ip, self.settings.sbc_port,
+            full_refresh_interval=self.settings.sbc_full_refresh_interval,
+            probe_port=self.settings.sbc_probe_port,
+            planner=TransitionPlanner(
+                settle=self.settings.sbc_relay_settle,
+                settle_pins=self.settings.sbc_relay_settle_pins,
+                max_excursion=self.settings.sbc_max_excursion,
+            ) if self.settings.sbc_max_excursion is not None else None,
+            readback=HttpPortReadback(
+                self.settings.sbc_ip, self.settings.sbc_probe_port, self.settings.sbc_readback_path
+            ) if self.settings.sbc_readback_path else None,
+            readback_deadline=self.settings.sbc_readback_deadline
+        )
+        # Relay transition steps wait on the sender thread, not the poller
+        self.sender = TunerSender(self.tuner, max_rate=self.settings.sbc_max_frame_rate,
+                                  refresh_interval=self.settings.sbc_state_refresh_interval)
+        self.engine = AutoTuneEngine(self.settings, self.tuner, sender=self.sender)
+        self.poller = CatPoller(
+            TRXServiceImpl(push_address=self.settings.trx_push_address),
+            on_frequency=self._on_frequency,
+            on_status=self._on_status,
+            on_connect_result=self._on_connect_result,
+            scheduler=AdaptivePollScheduler(
+                fast_interval=self.settings.trx_poll_fast_interval,
+                slow_interval=self.settings.trx_poll_interval,
+                idle_interval=self.settings.trx_poll_idle_interval,
+            )
+        )
+        self.reconnect_delay = reconnect_delay
+        self.heartbeat_interval = heartbeat_interval
+        self._stopped = threading.Event()
+        self._reconnect_timer = None
+        self._recheck_timer = None
+        self._last_freq: Optional[float] = None
+
+    def run(self) -> None:
+        """
+        Connect and follow the rig until stop() is called.
+        """
+        heartbeat = threading.Thread(target=self._heartbeat, name="heartbeat", daemon=True)
+        heartbeat.start()
+        self.sender.start()
+        print(f"ck-netctrl headless: TRX {self.settings.trx_port}, "
+              f"tuner {self.settings.sbc_ip}:{self.settings.sbc_port}")
+        self._connect()
+        self.poller.run()
+        self._stopped.set()
+        for timer in (self._reconnect_timer, self._recheck_timer):
+            if timer is not None:
+                timer.cancel()
+        self.sender.stop()
+        print(self.engine.format_stats())
+        print(self.sender.format_stats())
+        if self.tuner.readback is not None:
+            print(f"Readback: {self.tuner.get_verify_stats()}")
+        self.settings.close()
+
+    def stop(self) -> None:
+        """
+        Stop the daemon; safe to call from a signal handler.
+
+        Only queues a stop for the poller (a reentrant SimpleQueue.put());
+        run() sets _stopped once the poller has returned. Setting the Event
+        here could deadlock on its internal lock if the signal interrupts
+        the main thread while it holds it.
+        """
+        self.poller.stop()
+
+    def _connect(self) -> None:
+        """Queues a TRX connect with the saved parameters."""
+        self._reconnect_timer = None
+        if self._stopped.is_set():
+            return
+        self.poller.request_connect(
+            rig_id=self.settings.trx_id, port=self.settings.trx_port,
+            baudrate=self.settings.trx_baudrate,
+            dtr_state=self.settings.trx_dtr_state,
+            rts_state=self.settings.trx_rts_state
+        )
+
+    def _schedule_reconnect(self) -> None:
+        """Retries the TRX connection after reconnect_delay."""
+        if self._stopped.is_set() or self._reconnect_timer is not None:
+            return
+        self._reconnect_timer = threading.Timer(self.reconnect_delay, self._connect)
+        self._reconnect_timer.daemon = True
+        self._reconnect_timer.start()
+
+    def _on_connect_result(self, connected: bool) -> None:
+        if not connected:
+            print(f"TRX connection failed, retrying in {self.reconnect_delay:.0f} s")
+            self._schedule_reconnect()
+
+    def _on_status(self, connected: bool) -> None:
+        if connected:
+            print("TRX connected")
+        else:
+            self.engine.reset()
+            if not self._stopped.is_set():
+                print(f"TRX connection lost, retrying in {self.reconnect_delay:.0f} s")
+                self._schedule_reconnect()
+
+    def _on_frequency(self, freq: float) -> None:
+        self._last_freq = freq
+        entry, switched = self.engine.process_frequency(freq)
+        self._schedule_recheck()
+        if switched:
+            if entry:
+                derived = " (interpolated)" if entry.get("interpolated") else ""
+                print(f"{int(freq)} Hz: L={entry['L']}, C={entry['C']}, HP={entry['highpass']}{derived}")
+            else:
+                print(f"{int(freq)} Hz: no corresponding frequency found")
+
+    def _schedule_recheck(self) -> None:
+        """Re-evaluates the last frequency once a held switch is due."""
+        if self._recheck_timer is not None:
+            self._recheck_timer.cancel()
+            self._recheck_timer = None
+        delay = self.engine.recheck_delay()
+        if delay is None or self._stopped.is_set():
+            return
+        # The engine belongs to the poller thread - run the recheck there
+        self._recheck_timer = threading.Timer(delay, self.poller.submit, args=(self._recheck,))
+        self._recheck_timer.daemon = True
+        self._recheck_timer.start()
+
+    def _recheck(self, trx) -> None:
+        # Nothing held any more, e.g. after a disconnect reset the engine
+        if self.engine.recheck_delay() is not None:
+            self._on_frequency(self._last_freq)
+
+    def _heartbeat(self) -> None:
+        """Keeps the tuner's reachability flag up to date."""
+        reachable = None
+        while not self._stopped.is_set():
+            now_reachable = self.tuner.check_reachability()
+            if now_reachable and reachable is False:
+                # It may have rebooted with default relays
+                self.sender.request_refresh()
+            if now_reachable != reachable:
+                reachable = now_reachable
+                print(f"Tuner {self.settings.sbc_ip}: {'reachable' if reachable else 'not reachable'}")
+            self._stopped.wait(self.heartbeat_interval)
+
+
+def run(settings_file: str = "settings.json", latency_dump: Optional[str] = None) -> int:
+    """
+    Run the headless daemon until SIGINT/SIGTERM.
+
+    Args:
+        settings_file (str): Path to the JSON settings file.
+        latency_dump (str, optional): Record tune latencies and write them
+            to this file on exit.
+
+    Returns:
+        int: Process exit code.
+    """
+    # Line-buffered output, so journald/pipes see each message immediately
+    sys.stdout.reconfigure(line_buffering=True)
+    daemon = HeadlessDaemon(settings_file)
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    signal.signal(signal.SIGINT, lambda *_: daemon.stop())
+    tracer.enabled = latency_dump is not None
+    daemon.run()
+    if latency_dump:
+        print(tracer.format())
+        tracer.dump(latency_dump)
+    return 0
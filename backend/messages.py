@@ -25,6 +25,8 @@
 #    available under this license.
 # -----------------------------------------------------------------------------
 
+from typing import Iterable, List, Optional, Tuple
+
 def build_messages(val_l: int, val_c: int, highpass: bool):
     """
     Build all control messages for the SBC65EC based on L, C values and filter type.
@@ -102,3 +104,182 @@ def build_messages(val_l: int, val_c: int, highpass: bool):
     msg_c2[4] = ord('&')
 
     return bytes(msg_a), bytes(msg_b), bytes(msg_c1), bytes(msg_c2)
+
+
+# --- Precomputed frame encoder ---
+# Every group of build_messages() only depends on a handful of bits, so all
+# possible byte sequences per group are built once at import time (64 + 32 +
+# 8 + 2 templates, indexed by the group's port bits). A complete datagram is
+# then a single join of four templates, and each joined frame is memoised in
+# a flat table covering the whole 128 L x 256 C x 2 HP state space. The table
+# is filled lazily, so memory is bounded by the states actually used (at
+# most 65,536 frames of 75 bytes).
+
+def _group_templates(group: str, pins: Iterable[int], width: int) -> Tuple[bytes, ...]:
+    """Returns the encoded group for every value of its width-bit port word."""
+    pins = list(pins)
+    return tuple(
+        b"".join(b"%s%d=%d&" % (group.encode(), pin, (value >> bit) & 1)
+                 for bit, pin in enumerate(pins))
+        for value in range(1 << width)
+    )
+
+_GROUP_A = _group_templates("a", range(6), 6)        # L1-L6 -> RA0-RA5
+_GROUP_B = _group_templates("b", range(5), 5)        # L7 + C0-C3 -> RB0-RB4
+_GROUP_C1 = _group_templates("c", range(3), 3)       # C5-C7 -> RC0-RC2
+_GROUP_C2 = _group_templates("c", (5,), 1)           # HP -> RC5
+
+_FRAME_TABLE: List[Optional[bytes]] = [None] * (1 << 16)
+
+def encode_frame(val_l: int, val_c: int, highpass: bool) -> bytes:
+    """
+    Encode the complete SBC65EC datagram for L, C and filter type.
+
+    Byte-for-byte identical to concatenating the four messages returned by
+    build_messages(), but served from precomputed templates and a lazily
+    filled frame table, so repeated states cost a single list lookup.
+
+    Parameters:
+    -----------
+    val_l : int
+        L-bank value (0–127).
+    val_c : int
+        C-bank value (0–255).
+    highpass : bool
+        Filter type: True = Highpass, False = Lowpass.
+
+    Returns:
+    --------
+    bytes
+        The full datagram (msg_a + msg_b + msg_c1 + msg_c2).
+    """
+    key = ((val_l & 0x7F) << 8) | (val_c & 0xFF) | (0x8000 if highpass else 0)
+    frame = _FRAME_TABLE[key]
+    if frame is None:
+        frame = b"".join((
+            _GROUP_A[val_l & 0x3F],
+            _GROUP_B[((val_l >> 6) & 0x01) | ((val_c & 0x0F) << 1)],
+            _GROUP_C1[(val_c >> 5) & 0x07],
+            _GROUP_C2[1 if highpass else 0],
+        ))
+        _FRAME_TABLE[key] = frame
+    return frame
+
+def encode_frames(states: Iterable[Tuple[int, int, bool]]) -> List[bytes]:
+    """
+    Encode many (L, C, highpass) states at once, e.g. for sweeps.
+
+    Parameters:
+    -----------
+    states : iterable of (int, int, bool)
+        States to encode, in order.
+
+    Returns:
+    --------
+    list[bytes]
+        One datagram per state, see encode_frame().
+    """
+    return [encode_frame(val_l, val_c, highpass) for val_l, val_c, highpass in states]
+
+
+# --- Differential updates ---
+# Port words use the SBC65EC pin number as bit position, i.e. RA0-RA5 ->
+# bits 0-5, RB0-RB4 -> bits 0-4 and RC0-RC2/RC5 -> bits 0-2/5, so a changed
+# bit maps directly to the "x<pin>=<0|1>&" segment that switches it.
+
+_PORT_PINS = (
+    (b"a", (0, 1, 2, 3, 4, 5)),
+    (b"b", (0, 1, 2, 3, 4)),
+    (b"c", (0, 1, 2, 5)),
+)
+
+_SEGMENTS = tuple(
+    {pin: (b"%s%d=0&" % (group, pin), b"%s%d=1&" % (group, pin)) for pin in pins}
+    for group, pins in _PORT_PINS
+)
+
+def port_words(val_l: int, val_c: int, highpass: bool) -> Tuple[int, int, int]:
+    """
+    Map L, C and filter type to the SBC65EC port words (RA, RB, RC).
+
+    Parameters:
+    -----------
+    val_l : int
+        L-bank value (0–127).
+    val_c : int
+        C-bank value (0–255).
+    highpass : bool
+        Filter type: True = Highpass, False = Lowpass.
+
+    Returns:
+    --------
+    tuple[int, int, int]
+        Port words with bit n = pin n, covering exactly the pins that
+        build_messages() drives.
+    """
+    ra = val_l & 0x3F
+    rb = ((val_l >> 6) & 0x01) | ((val_c & 0x0F) << 1)
+    rc = ((val_c >> 5) & 0x07) | (0x20 if highpass else 0)
+    return ra, rb, rc
+
+def encode_diff(old: Tuple[int, int, int], new: Tuple[int, int, int]) -> bytes:
+    """
+    Encode only the pin assignments that differ between two port states.
+
+    Parameters:
+    -----------
+    old : tuple[int, int, int]
+        Port words (RA, RB, RC) currently applied on the SBC65EC.
+    new : tuple[int, int, int]
+        Target port words, see port_words().
+
+    Returns:
+    --------
+    bytes
+        Concatenated "x<pin>=<0|1>&" segments in RA, RB, RC order; empty if
+        nothing changed.
+    """
+    parts = []
+    for (_, pins), segments, old_word, new_word in zip(_PORT_PINS, _SEGMENTS, old, new):
+        changed = old_word ^ new_word
+        if not changed:
+            continue
+        for pin in pins:
+            if (changed >> pin) & 1:
+                parts.append(segments[pin][(new_word >> pin) & 1])
+    return b"".join(parts)
+
+def parse_ports(data: bytes) -> Optional[Tuple[int, int, int]]:
+    """
+    Decode a frame back into port words, e.g. a port state read back from
+    the SBC65EC.
+
+    Parameters:
+    -----------
+    data : bytes
+        "x<pin>=<0|1>&" segments, such as an encode_frame() datagram.
+
+    Returns:
+    --------
+    tuple[int, int, int] | None
+        Port words (RA, RB, RC), see port_words(); None if a segment is
+        malformed or a driven pin is missing.
+    """
+    words = [0, 0, 0]
+    seen = [0, 0, 0]
+    for segment in data.strip().split(b"&"):
+        if not segment:
+            continue
+        if len(segment) != 4 or segment[2:3] != b"=" or segment[3:4] not in (b"0", b"1"):
+            return None
+        port = b"abc".find(segment[0:1])
+        pin = segment[1] - ord("0")
+        if port < 0 or pin not in _PORT_PINS[port][1]:
+            return None
+        seen[port] |= 1 << pin
+        if segment[3:4] == b"1":
+            words[port] |= 1 << pin
+    for port, (_, pins) in enumerate(_PORT_PINS):
+        if seen[port] != sum(1 << pin for pin in pins):
+            return None
+    return tuple(words)
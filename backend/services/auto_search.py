@@ -0,0 +1,268 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from backend.services.tuner_service import TunerService
+
+L_MAX = 127
+C_MAX = 255
+# C bit 4 drives no relay pin (see backend.messages.port_words), so C and
+# C ^ 0x10 are the same physical setting; only values without it are searched
+C_UNUSED_BIT = 0x10
+C_VALUES = [c for c in range(C_MAX + 1) if not c & C_UNUSED_BIT]
+C_INDEX = {c: i for i, c in enumerate(C_VALUES)}
+
+Point = Tuple[int, int, bool]
+
+
+def relay_changes(a: Optional[Point], b: Point) -> int:
+    """
+    Number of relays that switch when going from setting a to setting b.
+
+    L and C are binary-weighted relay banks, so this is the Hamming
+    distance of the values plus one for the high-pass relay.
+
+    Args:
+        a (tuple|None): Previous (L, C, highpass); None counts every set relay.
+        b (tuple): New (L, C, highpass).
+
+    Returns:
+        int: Relay operations.
+    """
+    if a is None:
+        a = (0, 0, False)
+    return bin(a[0] ^ b[0]).count("1") + bin(a[1] ^ b[1]).count("1") + int(a[2] != b[2])
+
+
+class AutoSearch:
+    """
+    Finds the L/C/high-pass setting with the lowest SWR.
+
+    Drives the tuner through TunerService.send_values() and reads the SWR
+    back through read_swr (the rig's SWR meter, with the rig transmitting
+    a carrier). The search runs in two stages:
+
+    1. A coarse grid (coarse_l x coarse_c points per high-pass setting),
+       walked in serpentine order so consecutive points differ in as few
+       relays as possible.
+    2. A pattern search from the best grid point: the four neighbours at
+       the current step are tried, the search moves to the best one that
+       improves the SWR, and the step is halved when none does, down to
+       single relay steps.
+
+    Every setting is measured at most once. C is searched over C_VALUES
+    (steps and grid in that list's index), so no measurement is spent on
+    the unused C bit 4. The search stops early once the SWR reaches
+    target_swr.
+
+    Attributes:
+        measurements (int): Settings measured so far.
+        relay_ops (int): Relay operations caused so far.
+    """
+
+    def __init__(self, tuner: TunerService, read_swr: Callable[[], Optional[float]],
+                 settle: float = 0.15, samples: int = 1, target_swr: float = 1.1,
+                 coarse_l: int = 4, coarse_c: int = 4,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the search.
+
+        Args:
+            tuner (TunerService): Tuner to drive.
+            read_swr (callable): Returns the current SWR, or None if the rig
+                delivers no reading (e.g. not transmitting).
+            settle (float, optional): Seconds to wait after switching before
+                reading the SWR (relays plus the rig's meter). Defaults to 0.15.
+            samples (int, optional): SWR readings averaged per setting.
+            target_swr (float, optional): Stop as soon as this SWR is reached.
+            coarse_l (int, optional): Grid points along L per high-pass setting.
+            coarse_c (int, optional): Grid points along C per high-pass setting.
+            sleep (callable, optional): Wait function, replaceable for simulations.
+        """
+        self.tuner = tuner
+        self.read_swr = read_swr
+        self.settle = settle
+        self.samples = max(1, samples)
+        self.target_swr = target_swr
+        self.coarse_l = coarse_l
+        self.coarse_c = coarse_c
+        self.sleep = sleep
+        self.measurements = 0
+        self.relay_ops = 0
+        self._measured: Dict[Point, float] = {}
+        self._current: Optional[Point] = None
+        self._stop = False
+
+    def stop(self) -> None:
+        """Ask a running search to return after the current measurement."""
+        self._stop = True
+
+    def run(self, progress: Optional[Callable[[Point, float, Point, float], None]] = None) -> Dict:
+        """
+        Run the search.
+
+        Args:
+            progress (callable, optional): Called after each measurement with
+                (setting, swr, best setting, best swr).
+
+        Returns:
+            dict: L, C, highpass and swr of the best setting, plus
+            measurements, relay_ops, elapsed (s) and stopped (bool).
+
+        Raises:
+            RuntimeError: If the rig delivers no SWR reading.
+        """
+        started = time.monotonic()
+        self._stop = False
+        self._progress = progress
+        self._best: Optional[Point] = None
+
+        for point in self._grid():
+            if self._measure(point) <= self.target_swr or self._stop:
+                break
+        else:
+            self._refine()
+
+        L, C, highpass = self._best
+        return {
+            "L": L, "C": C, "highpass": highpass, "swr": self._measured[self._best],
+            "measurements": self.measurements, "relay_ops": self.relay_ops,
+            "elapsed": time.monotonic() - started, "stopped": self._stop,
+        }
+
+    def _grid(self) -> List[Point]:
+        """Coarse grid points (cell centres) in serpentine order."""
+        l_values = [int((i + 0.5) * (L_MAX + 1) / self.coarse_l) for i in range(self.coarse_l)]
+        c_values = [C_VALUES[int((i + 0.5) * len(C_VALUES) / self.coarse_c)] for i in range(self.coarse_c)]
+        points = []
+        for highpass in (False, True):
+            for row, L in enumerate(l_values):
+                cs = c_values if row % 2 == 0 else c_values[::-1]
+                points.extend((L, C, highpass) for C in cs)
+            l_values = l_values[::-1]  # come back the way we went
+        return points
+
+    def _refine(self) -> None:
+        """Pattern search around the best grid point with halving steps."""
+        step_l = max(1, (L_MAX + 1) // self.coarse_l // 2)
+        step_c = max(1, len(C_VALUES) // self.coarse_c // 2)
+        while not self._stop:
+            L, C, highpass = self._best
+            c_index = C_INDEX[C]
+            candidates = [(L + step_l, c_index), (L - step_l, c_index),
+                          (L, c_index + step_c), (L, c_index - step_c)]
+            best_swr = self._measured[self._best]
+            moved = False
+            for l_value, c_index in candidates:
+                if not (0 <= l_value <= L_MAX and 0 <= c_index < len(C_VALUES)):
+                    continue
+                swr = self._measure((l_value, C_VALUES[c_index], highpass))
+                if swr <= self.target_swr:
+                    return
+                if self._stop:
+                    return
+                moved = moved or swr < best_swr
+            if not moved:
+                if step_l == 1 and step_c == 1:
+                    return
+                step_l = max(1, step_l // 2)
+                step_c = max(1, step_c // 2)
+
+    def _measure(self, point: Point) -> float:
+        """Switches to point (unless measured before) and returns its SWR."""
+        swr = self._measured.get(point)
+        if swr is None:
+            self.relay_ops += relay_changes(self._current, point)
+            self.tuner.send_values(*point)
+            self._current = point
+            self.sleep(self.settle)
+            readings = []
+            for _ in range(self.samples):
+                value = self.read_swr()
+                if value is None:
+                    raise RuntimeError("No SWR reading from the rig - is it transmitting?")
+                readings.append(value)
+            swr = sum(readings) / len(readings)
+            self._measured[point] = swr
+            self.measurements += 1
+        if self._best is None or swr < self._measured[self._best]:
+            self._best = point
+        if self._progress:
+            self._progress(point, swr, self._best, self._measured[self._best])
+        return swr
+
+
+class SimulatedLoad:
+    """
+    SWR of a made-up antenna as a function of the tuner setting.
+
+    A smooth valley around (L0, C0) on the matching high-pass setting, with
+    some coupling between L and C (as in a real L network) and the SWR
+    saturating towards max_swr far away from the match. Stands in for the
+    rig's SWR meter when testing AutoSearch without a transmitter, e.g.
+    together with the SBC65EC emulator's settled relay state.
+    """
+
+    def __init__(self, L0: int = 37, C0: int = 170, highpass: bool = False,
+                 width_l: float = 12.0, width_c: float = 30.0, coupling: float = 0.6,
+                 min_swr: float = 1.05, max_swr: float = 10.0, mismatch: float = 2.5):
+        """
+        Initialize the load model.
+
+        Args:
+            L0 (int, optional): L relay value of the best match.
+            C0 (int, optional): C relay value of the best match.
+            highpass (bool, optional): High-pass setting of the best match.
+            width_l (float, optional): L distance that doubles the mismatch.
+            width_c (float, optional): C distance that doubles the mismatch.
+            coupling (float, optional): L/C cross term (-1..1).
+            min_swr (float, optional): SWR at the match.
+            max_swr (float, optional): SWR far away from the match.
+            mismatch (float, optional): Extra mismatch on the wrong high-pass setting.
+        """
+        self.L0 = L0
+        self.C0 = C0
+        self.highpass = highpass
+        self.width_l = width_l
+        self.width_c = width_c
+        self.coupling = coupling
+        self.min_swr = min_swr
+        self.max_swr = max_swr
+        self.mismatch = mismatch
+
+    def swr(self, L: int, C: int, highpass: bool) -> float:
+        """
+        Returns:
+            float: SWR at the given tuner setting.
+        """
+        dl = (L - self.L0) / self.width_l
+        dc = (C - self.C0) / self.width_c
+        x = dl * dl + dc * dc + self.coupling * dl * dc
+        if highpass != self.highpass:
+            x += self.mismatch
+        span = self.max_swr - self.min_swr
+        return self.min_swr + span * x / (x + span)
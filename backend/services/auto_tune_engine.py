@@ -0,0 +1,185 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+from backend.services.settings_service import SettingsService
+from backend.services.tuner_service import TunerService
+from backend.services.tuner_sender import TunerSender
+from backend.utils.latency import tracer
+from backend.utils.motion_detector import VfoMotionDetector
+
+class AutoTuneEngine:
+    """
+    Follow-the-rig logic: frequency -> saved entry -> tuner values.
+
+    Shared by the GUI (live mode) and the headless daemon, and free of any
+    Qt dependency. Tuner values are only sent when the matching entry
+    changes, so repeated frequencies inside one segment cost a lookup only.
+
+    Band-edge hysteresis (settings hysteresis_margin, hysteresis_hold): the
+    active entry is kept until the frequency is more than margin Hz outside
+    of it, or has stayed with another entry for hold seconds. A VFO parked
+    or drifting a few Hz around a boundary therefore does not flip between
+    segments. Off unless both are set (the default hold of 0 disables it).
+
+    Motion gate (motion_speed, motion_max_hold): while the VFO knob is
+    spinning at motion_speed Hz/s or faster, entry changes are held, so
+    sweeping through a band does not switch the relays for every segment
+    passed; the segment the VFO comes to rest in is applied once it slows
+    down, or after motion_max_hold seconds at the latest. Off by default
+    (motion_speed 0).
+
+    As frequencies are only reported when they change, a held switch is
+    due even without a new frequency - callers ask recheck_delay() and
+    call process_frequency() again then.
+
+    Attributes:
+        sender (TunerSender|None): If set, values are handed to it instead
+            of being sent on the calling thread.
+        active_entry (dict|None): Entry whose values were sent last.
+        motion (VfoMotionDetector): VFO speed over the recent frequencies.
+        switches (int): Entry changes applied.
+        held (int): Entry changes held back by the hysteresis.
+        motion_held (int): Entry changes held back while the VFO moved.
+    """
+
+    def __init__(self, settings: SettingsService, tuner: TunerService,
+                 sender: Optional[TunerSender] = None):
+        self.settings = settings
+        self.tuner = tuner
+        self.sender = sender
+        self.active_entry: Optional[Dict] = None
+        self.motion = VfoMotionDetector()
+        self.switches = 0
+        self.held = 0
+        self.motion_held = 0
+        self._candidate: Optional[Tuple[Optional[Dict], float]] = None   # (entry, since)
+        self._motion_since: Optional[float] = None   # first change held by the motion gate
+        self._switch_times: Deque[float] = deque(maxlen=1000)
+
+    def process_frequency(self, freq: float, now: Optional[float] = None) -> Tuple[Optional[Dict], bool]:
+        """
+        Look up the entry for freq and send its values if it changed.
+
+        Args:
+            freq (float): VFO frequency in Hz.
+            now (float, optional): time.monotonic() timestamp. Defaults to now.
+
+        Returns:
+            (entry, switched): the entry the tuner is set to (None if there
+            is none) and whether it differs from the previously active one.
+            While a switch is held back, that is still the previous entry.
+        """
+        now = time.monotonic() if now is None else now
+        self.motion.record(freq, now)
+        entry = self.settings.get_for_frequency(freq)
+        if entry == self.active_entry:
+            self._candidate = None
+            self._motion_since = None
+            return entry, False
+        if self._hold(freq, entry, now):
+            self.held += 1
+            return self.active_entry, False
+        if self._motion_hold(now):
+            self.motion_held += 1
+            return self.active_entry, False
+        self._candidate = None
+        self._motion_since = None
+        self.active_entry = entry
+        self.switches += 1
+        self._switch_times.append(now)
+        if entry:
+            # Measure end_to_end from the CAT read that saw this frequency
+            tracer.arm("vfo")
+            if self.sender is not None:
+                self.sender.submit(entry["L"], entry["C"], entry["highpass"])
+            else:
+                self.tuner.send_values(entry["L"], entry["C"], entry["highpass"])
+            tracer.disarm()
+        return entry, True
+
+    def _hold(self, freq: float, entry: Optional[Dict], now: float) -> bool:
+        """True if the switch from active_entry to entry is held back."""
+        active = self.active_entry
+        margin = self.settings.hysteresis_margin
+        if active is None or margin <= 0 or self.settings.hysteresis_hold <= 0:
+            return False
+        if freq < active["min_freq"] - margin or freq > active["max_freq"] + margin:
+            return False
+        if self._candidate is None or self._candidate[0] != entry:
+            self._candidate = (entry, now)
+        return now - self._candidate[1] < self.settings.hysteresis_hold
+
+    def _motion_hold(self, now: float) -> bool:
+        """True if the switch is held back because the VFO is moving."""
+        if not self.motion.is_moving(self.settings.motion_speed, now):
+            return False
+        if self._motion_since is None:
+            self._motion_since = now
+        return now - self._motion_since < self.settings.motion_max_hold
+
+    def recheck_delay(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds until a held switch is due, or None if nothing is held.
+        """
+        now = time.monotonic() if now is None else now
+        due = []
+        if self._candidate is not None:
+            due.append(self._candidate[1] + self.settings.hysteresis_hold)
+        if self._motion_since is not None:
+            due.append(self._motion_since + self.settings.motion_max_hold)
+            expires = self.motion.expires_at()
+            if expires is not None:
+                due.append(expires)
+        if not due:
+            return None
+        return max(0.0, min(due) - now)
+
+    def switch_rate(self, window: float = 60.0) -> float:
+        """Entry switches per minute over the last window seconds."""
+        cutoff = time.monotonic() - window
+        return sum(1 for t in self._switch_times if t >= cutoff) * 60.0 / window
+
+    def stats(self) -> Dict[str, float]:
+        """Returns the switch/held counters and the switch rate."""
+        return {"switches": self.switches, "held": self.held,
+                "motion_held": self.motion_held,
+                "switches_per_minute": self.switch_rate()}
+
+    def format_stats(self) -> str:
+        """One-line summary of stats()."""
+        return (f"Segment switches: {self.switches} "
+                f"({self.switch_rate():.1f}/min), held back: {self.held} "
+                f"at edges, {self.motion_held} while the VFO moved")
+
+    def reset(self) -> None:
+        """Forget the active entry, so the next frequency is applied again."""
+        self.active_entry = None
+        self._candidate = None
+        self._motion_since = None
+        self.motion.reset()
@@ -0,0 +1,248 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+import queue
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+from backend.services.trx_service import TRXService
+from backend.utils.latency import tracer
+from backend.utils.poll_scheduler import AdaptivePollScheduler
+
+class CatPoller:
+    """
+    Owns the TRX connection and polls its frequency on a worker thread.
+
+    Every Hamlib call (connect, get_frequency, close) is issued from run(),
+    so a slow serial rig or a stalled rigctld only ever blocks the poller,
+    never the caller. Other threads talk to it through request_connect()/
+    request_close() and receive results through the callbacks, which are
+    invoked on the poller thread; one-off reads such as the SWR meter go
+    through submit().
+
+    If the TRX service can push frequency updates (TRXService.start_push()),
+    those drive on_frequency directly and polling drops to a slow keepalive
+    that only verifies the connection. Should the pushes stop arriving, the
+    adaptive poll schedule takes over again.
+    """
+
+    _STOP = "stop"
+    _CONNECT = "connect"
+    _CLOSE = "close"
+    _WAKE = "wake"
+    _PUSH = "push"
+    _CALL = "call"
+
+    def __init__(self, trx: TRXService, interval: float = 0.5,
+                 on_frequency: Optional[Callable[[float], None]] = None,
+                 on_status: Optional[Callable[[bool], None]] = None,
+                 on_connect_result: Optional[Callable[[bool], None]] = None,
+                 scheduler: Optional[AdaptivePollScheduler] = None,
+                 keepalive_interval: float = 5.0, push_timeout: float = 10.0):
+        """
+        Initialize the poller.
+
+        Args:
+            trx: TRX service to poll. Only the poller thread may use it.
+            interval: Slowest poll interval in seconds while the frequency is
+                stable; ignored if a scheduler is given.
+            on_frequency: Called with the new frequency whenever it changes.
+            on_status: Called with the connection state whenever it changes.
+            on_connect_result: Called with the outcome of each connect request.
+            scheduler: Adaptive poll-rate scheduler. Defaults to one with
+                interval as its slow bound.
+            keepalive_interval: Poll interval in seconds while pushes arrive.
+            push_timeout: Seconds without a push after which polling resumes
+                its adaptive schedule.
+        """
+        self.trx = trx
+        self.scheduler = scheduler or AdaptivePollScheduler(slow_interval=interval)
+        self.on_frequency = on_frequency
+        self.on_status = on_status
+        self.on_connect_result = on_connect_result
+        self.keepalive_interval = keepalive_interval
+        self.push_timeout = push_timeout
+
+        # SimpleQueue.put() is reentrant, so stop() may run in a signal
+        # handler that interrupts run() while it waits in get()
+        self._commands: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._connected = False
+        self._last_freq: Optional[float] = None
+        self._push_enabled = False
+        self._last_push: Optional[float] = None
+        self.pushes = 0
+
+    def request_connect(self, **kwargs) -> None:
+        """Queue a connect with the keyword arguments of TRXService.connect()."""
+        self._commands.put((self._CONNECT, kwargs))
+
+    def request_close(self) -> None:
+        """Queue closing the TRX connection."""
+        self._commands.put((self._CLOSE, None))
+
+    def submit(self, fn: Callable[[TRXService], object]) -> Future:
+        """
+        Run fn(trx) on the poller thread, e.g. to read a meter.
+
+        Args:
+            fn: Called with the TRX service; must not block for long, since
+                polling waits for it.
+
+        Returns:
+            Future resolving to fn's return value (or its exception).
+        """
+        future = Future()
+        self._commands.put((self._CALL, (fn, future)))
+        return future
+
+    def stop(self) -> None:
+        """Ask run() to close the TRX and return; safe to call from a signal handler."""
+        self._commands.put((self._STOP, None))
+
+    def set_minimized(self, minimized: bool) -> None:
+        """Switch the scheduler to its minimised (idle) rate and back."""
+        self.scheduler.set_minimized(minimized)
+        self._commands.put((self._WAKE, None))
+
+    def stats(self) -> dict:
+        """Returns polls per second, reaction latency and push state."""
+        stats = dict(self.scheduler.stats())
+        stats["push_active"] = self._push_live()
+        stats["pushes"] = self.pushes
+        return stats
+
+    def run(self) -> None:
+        """Main loop; blocks until stop() is called."""
+        next_poll = time.monotonic()
+        last_poll = next_poll
+        while True:
+            if self._connected:
+                timeout = max(0.0, next_poll - time.monotonic())
+            else:
+                timeout = None  # nothing to poll, just wait for commands
+
+            try:
+                command, args = self._commands.get(timeout=timeout)
+            except queue.Empty:
+                last_poll = time.monotonic()
+                next_poll = last_poll + self._poll()
+                continue
+
+            if command == self._STOP:
+                self._close()
+                return
+            if command == self._CONNECT:
+                self.scheduler.reset()
+                self._connect(args)
+                next_poll = time.monotonic()
+            elif command == self._CLOSE:
+                self._close()
+            elif command == self._CALL:
+                fn, future = args
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(self.trx))
+                    except Exception as e:
+                        future.set_exception(e)
+            elif command == self._WAKE:
+                next_poll = min(next_poll, last_poll + self.scheduler.interval)
+            elif command == self._PUSH and self._connected:
+                self.pushes += 1
+                self._last_push = time.monotonic()
+                self._publish(args)
+                # Pushes prove the link is alive - postpone the keepalive poll
+                next_poll = self._last_push + self.keepalive_interval
+
+    def _connect(self, kwargs: dict) -> None:
+        """Opens a (new) TRX connection and reports the outcome."""
+        if self.trx.is_connected():
+            self.trx.close()
+        ok = self.trx.connect(**kwargs)
+        self._last_freq = None
+        self._last_push = None
+        self._push_enabled = ok and self.trx.start_push(self._on_push)
+        # Publish the state change first, so the connect result (e.g. the
+        # GUI's "connection failed") is the last word on a requested connect
+        self._set_connected(ok)
+        if self.on_connect_result:
+            self.on_connect_result(ok)
+
+    def _on_push(self, freq: float) -> None:
+        """Push callback; hands the frequency over to the poller thread."""
+        tracer.mark("vfo")
+        self._commands.put((self._PUSH, freq))
+
+    def _push_live(self) -> bool:
+        """True while pushed updates keep arriving."""
+        return (self._push_enabled and self._last_push is not None and
+                time.monotonic() - self._last_push < self.push_timeout)
+
+    def _close(self) -> None:
+        """Closes the TRX connection if open."""
+        self._push_enabled = False
+        try:
+            self.trx.stop_push()
+            self.trx.close()
+        except Exception as e:
+            print(f"Error closing TRX: {e}")
+        self._set_connected(False)
+
+    def _poll(self) -> float:
+        """Reads the frequency once, publishes changes and returns the delay until the next poll."""
+        try:
+            freq = self.trx.get_frequency()
+        except Exception as e:
+            print(f"Error updating TRX status: {e}")
+            freq = None
+
+        if freq is None:
+            # get_frequency() clears the service's cached state on failure
+            self._set_connected(self.trx.is_connected())
+            return self.scheduler.record_poll(False)
+
+        interval = self.scheduler.record_poll(self._publish(freq))
+        if self._push_live():
+            return self.keepalive_interval
+        return interval
+
+    def _publish(self, freq: float) -> bool:
+        """Publishes freq if it differs from the last one; returns whether it did."""
+        if freq == self._last_freq:
+            return False
+        self._last_freq = freq
+        if self.on_frequency:
+            self.on_frequency(freq)
+        return True
+
+    def _set_connected(self, connected: bool) -> None:
+        """Updates the connection state and publishes changes."""
+        if connected == self._connected:
+            return
+        self._connected = connected
+        if not connected:
+            self._last_freq = None
+        if self.on_status:
+            self.on_status(connected)
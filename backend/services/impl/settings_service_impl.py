@@ -24,82 +24,366 @@
 # 2. Redistribution of modified versions must also make the source code
 #    available under this license.
 # -----------------------------------------------------------------------------
+import copy
 import json
 import os
+import tempfile
+import threading
 from typing import List, Dict, Optional
 from backend.services.settings_service import SettingsService
+from backend.utils.file_lock import FileLock
+from backend.utils.frequency_index import FrequencyIndex
+from backend.utils.interpolation import TuningInterpolator
+from backend.utils.latency import tracer
+
+# Scalar settings persisted next to the frequency table
+_CONFIG_KEYS = (
+    "sbc_ip", "sbc_port", "sbc_full_refresh_interval", "sbc_probe_port",
+    "sbc_relay_settle", "sbc_relay_settle_pins", "sbc_max_excursion", "sbc_max_frame_rate",
+    "sbc_readback_path", "sbc_readback_deadline", "sbc_state_refresh_interval",
+    "trx_id", "trx_port", "trx_baudrate", "trx_dtr_state", "trx_rts_state",
+    "trx_conn_type", "trx_poll_interval", "trx_poll_fast_interval",
+    "trx_poll_idle_interval", "trx_push_address", "gui_expanded",
+    "interp_mode", "interp_max_distance", "hysteresis_margin", "hysteresis_hold",
+    "motion_speed", "motion_max_hold",
+)
 
 class SettingsServiceImpl(SettingsService):
-    """Concrete implementation of settings service."""
+    """
+    Concrete implementation of settings service.
+
+    Storage is a JSON snapshot (filename) plus an append-only journal
+    (filename + ".journal") of edit records - add, delete, config - each
+    tagged with a sequence number. Edits only append one line, so their
+    cost does not depend on the table size, and a crash can at most lose a
+    half-written last line. load() replays the journal on top of the
+    snapshot; once enough records have piled up, save() compacts them into
+    a new snapshot on a background thread (temp file + atomic rename).
+
+    Only one instance may write a settings file: a writer holds an
+    exclusive lock on filename + ".lock" while the file is loaded. An
+    instance that cannot get it (e.g. a second GUI), or was opened with
+    read_only=True (the headless daemon, which only reads), keeps edits in
+    memory and never touches the snapshot or the journal.
+    """
     
-    def __init__(self, filename="settings.json"):
+    def __init__(self, filename="settings.json", compact_threshold: int = 200,
+                 read_only: bool = False):
         self.filename = filename
+        self.compact_threshold = compact_threshold  # own journal records before compaction
+        self._want_write = not read_only
+        self.read_only = read_only   # True if edits are not persisted
+        self._file_lock: Optional[FileLock] = None
         self.data = []       # Frequency entries
+        self._index = FrequencyIndex()
+        self._interpolator: Optional[TuningInterpolator] = None   # rebuilt on demand
         self.sbc_ip = "10.1.0.1"
         self.sbc_port = 54123
+        self.sbc_full_refresh_interval = 30.0   # seconds between full frames
+        self.sbc_probe_port = 80                # TCP port for liveness probes
+        self.sbc_relay_settle = 0.004           # relay settle time (s) for transition planning
+        self.sbc_relay_settle_pins = {}         # per-relay settle times, e.g. {"b4": 0.02}
+        self.sbc_max_excursion = None           # allowed L/C overshoot while switching, None = single frame
+        self.sbc_max_frame_rate = 25.0          # tuner updates per second at most
+        self.sbc_readback_path = ""             # HTTP path of the port readback, "" = no verification
+        self.sbc_readback_deadline = 0.3        # s to confirm (and resend) a frame
+        self.sbc_state_refresh_interval = 10.0  # s between full-state refreshes while idle, 0 = off
         self.trx_id = None
         self.trx_port = "localhost:19090"
         self.trx_baudrate = 9600
         self.trx_dtr_state = "UNSET"
         self.trx_rts_state = "UNSET"
         self.trx_conn_type = "serial"
+        self.trx_poll_interval = 0.5         # slowest CAT poll interval (s), VFO parked
+        self.trx_poll_fast_interval = 0.075  # CAT poll interval right after a VFO change
+        self.trx_poll_idle_interval = 2.0    # slowest CAT poll interval while minimised
+        self.trx_push_address = "224.0.0.1:4532"   # rigctld multicast publisher, "" = off
+        self.gui_expanded = True             # GUI starts with the advanced section shown
+        self.interp_mode = "off"             # gap filling between segments: off/nearest/linear
+        self.interp_max_distance = 25000     # Hz a derived value may lie from a saved segment
+        self.hysteresis_margin = 50          # Hz beyond a segment edge before switching away
+        self.hysteresis_hold = 0.0           # s within the margin before switching anyway, 0 = off
+        self.motion_speed = 0                # Hz/s of VFO motion that holds switching, 0 = off
+        self.motion_max_hold = 1.5           # s a moving VFO may hold switching at most
+
+        self._seq = 0                # sequence number of the last journal record
+        self._journal = None         # append handle, opened on first edit
+        self._journal_records = 0    # records this instance appended since the last compaction
+        self._journaled_config: Dict = {}
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
         self.load()
     
+    @property
+    def journal_filename(self) -> str:
+        """Path of the edit journal belonging to filename."""
+        return self.filename + ".journal"
+    
+    def _config(self) -> Dict:
+        """
+        Copy of the current config settings as a dict.
+
+        Deep-copied, so a dict/list setting changed in place (e.g.
+        sbc_relay_settle_pins) still differs from the journaled baseline.
+        """
+        return copy.deepcopy({key: getattr(self, key) for key in _CONFIG_KEYS})
+    
+    def _claim(self) -> None:
+        """Takes the writer lock of filename, or falls back to read-only."""
+        if not self._want_write or (self._file_lock is not None and self._file_lock.held):
+            return
+        self._file_lock = FileLock(self.filename + ".lock")
+        self.read_only = not self._file_lock.acquire()
+        if self.read_only:
+            print(f"{self.filename} is in use by another ck-netctrl instance - "
+                  f"opened read-only, changes will not be saved")
+    
+    def _release(self) -> None:
+        if self._file_lock is not None:
+            self._file_lock.release()
+            self._file_lock = None
+    
     def load(self) -> None:
-        """Load settings from the JSON file."""
+        """Load settings from the JSON snapshot and replay the journal."""
+        self.wait_for_compaction()
+        self._close_journal()
+        self._claim()
+        snapshot_seq = 0
         try:
             with open(self.filename, "r") as f:
                 obj = json.load(f)
             self.data = obj.get("frequencies", [])
-            self.sbc_ip = obj.get("sbc_ip", self.sbc_ip)
-            self.sbc_port = obj.get("sbc_port", self.sbc_port)
-            self.trx_id = obj.get("trx_id", self.trx_id)
-            self.trx_port = obj.get("trx_port", self.trx_port)
-            self.trx_baudrate = obj.get("trx_baudrate", self.trx_baudrate)
-            self.trx_dtr_state = obj.get("trx_dtr_state", self.trx_dtr_state)
-            self.trx_rts_state = obj.get("trx_rts_state", self.trx_rts_state)
-            self.trx_conn_type = obj.get("trx_conn_type", self.trx_conn_type)
+            for key in _CONFIG_KEYS:
+                setattr(self, key, obj.get(key, getattr(self, key)))
+            snapshot_seq = obj.get("journal_seq", 0)
         except FileNotFoundError:
             self.data = []
 
+        # A journal left behind by an interrupted compaction comes first;
+        # records already contained in the snapshot are skipped by seq
+        self._seq = snapshot_seq
+        for path in (self.journal_filename + ".old", self.journal_filename):
+            self._replay(path, snapshot_seq)
+        # Replayed records are no reason to compact: only edits made here are
+        self._journal_records = 0
+        self._journaled_config = self._config()
+        self._index.rebuild(self.data)
+        self._interpolator = None
+
+    def _replay(self, path: str, after_seq: int) -> int:
+        """Applies the journal records in path newer than after_seq; returns how many."""
+        replayed = 0
+        valid_end = 0
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return 0
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if not isinstance(record, dict) or not line.endswith(b"\n"):
+                    # Torn last line of a crashed append: cut it off, so the
+                    # next record does not get glued onto it
+                    # (a read-only instance leaves that to the writer)
+                    print(f"Dropping incomplete journal record in {path}")
+                    f.close()
+                    if not self.read_only:
+                        os.truncate(path, valid_end)
+                    break
+                valid_end += len(line)
+                seq = record.get("seq", 0)
+                if seq <= after_seq:
+                    continue
+                self._apply(record)
+                self._seq = max(self._seq, seq)
+                replayed += 1
+        return replayed
+
+    def _apply(self, record: Dict) -> None:
+        """Applies one journal record to the in-memory state (index excluded)."""
+        op = record.get("op")
+        if op == "add":
+            self.data.append(record["entry"])
+        elif op == "delete":
+            index = record["index"]
+            if 0 <= index < len(self.data):
+                self.data.pop(index)
+        elif op == "config":
+            for key, value in record["values"].items():
+                if key in _CONFIG_KEYS:
+                    setattr(self, key, value)
+
+    def _append(self, op: str, **fields) -> None:
+        """Appends one edit record to the journal (kept in memory only when read-only)."""
+        if self.read_only:
+            return
+        with self._lock:
+            if self._journal is None:
+                self._journal = open(self.journal_filename, "a")
+            self._seq += 1
+            record = {"seq": self._seq, "op": op}
+            record.update(fields)
+            self._journal.write(json.dumps(record) + "\n")
+            self._journal.flush()
+            self._journal_records += 1
+
+    def _close_journal(self) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
     def save(self) -> None:
-        """Save current settings to the JSON file."""
-        obj = {
-            "frequencies": self.data,
-            "sbc_ip": self.sbc_ip,
-            "sbc_port": self.sbc_port,
-            "trx_id": self.trx_id,
-            "trx_port": self.trx_port,
-            "trx_baudrate": self.trx_baudrate,
-            "trx_dtr_state": self.trx_dtr_state,
-            "trx_rts_state": self.trx_rts_state,
-            "trx_conn_type": self.trx_conn_type
-        }
-        print(">>> Saving to:", os.path.abspath(self.filename))
-        with open(self.filename, "w") as f:
-            json.dump(obj, f, indent=2)
-    
+        """
+        Make the current settings persistent.
+
+        Entry edits are already journaled; this only records config values
+        that were assigned directly and starts a background compaction once
+        the journal has grown past compact_threshold records.
+        """
+        if self.read_only:
+            return
+        config = self._config()
+        changed = {k: v for k, v in config.items() if self._journaled_config.get(k) != v}
+        if changed:
+            self._append("config", values=changed)
+            self._journaled_config = config
+        if self._journal_records >= self.compact_threshold:
+            self.compact()
+
+    def compact(self, wait: bool = False) -> None:
+        """
+        Fold the journal into a new snapshot.
+
+        The state is captured and the journal rotated on the calling thread;
+        serialising and writing the snapshot (temp file, fsync, atomic rename)
+        happens on a background thread, so edits can continue meanwhile.
+
+        Args:
+            wait (bool, optional): Block until the snapshot is written.
+        """
+        if self.read_only:
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            if wait:
+                self._compactor.join()
+            return
+        with self._lock:
+            obj = {"frequencies": list(self.data)}
+            obj.update(self._config())
+            obj["journal_seq"] = self._seq
+            # Edits from now on go to a fresh journal; the old one is kept
+            # until the snapshot containing its records is in place
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            rotated = self.journal_filename + ".old"
+            if os.path.exists(rotated):
+                # Left over from a failed compaction - keep its records too
+                with open(self.journal_filename, "a"), open(self.journal_filename) as src, \
+                        open(rotated, "a") as dst:
+                    dst.write(src.read())
+                os.unlink(self.journal_filename)
+            elif os.path.exists(self.journal_filename):
+                os.replace(self.journal_filename, rotated)
+            else:
+                rotated = None
+            self._journal_records = 0
+        self._compactor = threading.Thread(
+            target=self._write_snapshot, args=(self.filename, obj, rotated),
+            name="settings-compaction", daemon=True
+        )
+        self._compactor.start()
+        if wait:
+            self._compactor.join()
+
+    @staticmethod
+    def _write_snapshot(filename: str, obj: Dict, rotated: Optional[str]) -> None:
+        """Writes obj to filename atomically, then drops the folded journal."""
+        directory = os.path.dirname(os.path.abspath(filename))
+        try:
+            fd, tmp = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(obj, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, filename)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            if rotated:
+                os.unlink(rotated)
+        except OSError as e:
+            # The rotated journal is kept and replayed by the next load()
+            print(f"Error compacting settings to {filename}: {e}")
+
+    def wait_for_compaction(self) -> None:
+        """Block until a running background compaction has finished."""
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def close(self) -> None:
+        """
+        Fold the records this instance appended into the snapshot, close the
+        journal and release the writer lock.
+        """
+        self.save()
+        if self._journal_records:
+            self.compact(wait=True)
+        self.wait_for_compaction()
+        self._close_journal()
+        self._release()
+
+    def load_from_json(self, filename: str) -> None:
+        """Switch to another settings file and load it."""
+        self.close()
+        self.filename = filename
+        self.load()
+
     def get_for_frequency(self, freq: float) -> Optional[Dict]:
         """Retrieve the settings entry for a specific frequency."""
-        for entry in self.data:
-            if entry["min_freq"] <= freq <= entry["max_freq"]:
-                return entry
-        return None
+        t0 = tracer.start()
+        entry = self._index.lookup(freq)
+        if entry is None and self.interp_mode != "off":
+            entry = self._gap_filler().lookup(freq)
+        tracer.stop("lookup", t0)
+        return entry
+
+    def _gap_filler(self) -> TuningInterpolator:
+        """Returns the interpolator, rebuilding it after edits or a config change."""
+        interp = self._interpolator
+        if interp is None or interp.mode != self.interp_mode \
+                or interp.max_distance != self.interp_max_distance:
+            interp = TuningInterpolator(self.interp_mode, self.interp_max_distance)
+            interp.rebuild(self.data, self._index.lookup)
+            self._interpolator = interp
+        return interp
     
     def add_entry(self, min_freq: float, max_freq: float, L: float, C: float, highpass: bool) -> None:
         """Add a new frequency entry to the settings."""
-        self.data.append({
+        entry = {
             "min_freq": min_freq,
             "max_freq": max_freq,
             "L": L,
             "C": C,
             "highpass": highpass
-        })
+        }
+        self.data.append(entry)
+        self._index.add(entry)
+        self._interpolator = None
+        self._append("add", entry=entry)
     
     def delete_entry(self, index: int) -> None:
         """Delete a frequency entry by index."""
         if 0 <= index < len(self.data):
-            self.data.pop(index)
+            self._index.remove(self.data.pop(index))
+            self._interpolator = None
+            self._append("delete", index=index)
     
     def get_entries(self) -> List[Dict]:
         """Get all frequency entries."""
@@ -119,4 +403,4 @@ class SettingsServiceImpl(SettingsService):
         self.trx_conn_type = conn_type
         self.trx_baudrate = baudrate
         self.trx_dtr_state = dtr_state
-        self.trx_rts_state = rts_state
\ No newline at end of file
+        self.trx_rts_state = rts_state
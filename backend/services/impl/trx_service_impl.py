@@ -24,35 +24,42 @@
 # 2. Redistribution of modified versions must also make the source code
 #    available under this license.
 # -----------------------------------------------------------------------------
-import Hamlib
-from typing import List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional
 from backend.services.trx_service import TRXService
+from backend.utils.latency import tracer
+from backend.utils.rig_catalogue import catalogue, import_hamlib
+from backend.utils.rig_push import RigctldMulticastListener
 
 class TRXServiceImpl(TRXService):
     """Concrete implementation of TRX service using Hamlib."""
     
-    def __init__(self):
+    def __init__(self, push_address: str = "224.0.0.1:4532"):
+        """
+        Args:
+            push_address: "group:port" of rigctld's multicast data publisher
+                (rigctld --multicast-addr), used for push updates in network
+                mode. Empty disables push.
+        """
         self._rig = None
         self._connected = False
         self._freq = 5351000  # Dummy start frequency 5.351 MHz
-        
-        Hamlib.rig_set_debug(Hamlib.RIG_DEBUG_NONE)
+        self._port = ""
+        self.push_address = push_address
+        self._push_listener: Optional[RigctldMulticastListener] = None
+        # Hamlib itself is only imported by the first connect()
     
     def list_available_rigs(self) -> List[Tuple[str, int]]:
-        """Returns a list of all rigs known to Hamlib."""
-        rig_models = [
-            (name.replace("RIG_MODEL_", ""), getattr(Hamlib, name))
-            for name in dir(Hamlib)
-            if name.startswith("RIG_MODEL_")
-        ]
-        return rig_models
+        """Returns a list of all rigs known to Hamlib (from the on-disk catalogue cache)."""
+        return catalogue.models()
     
     def connect(self, rig_id: Optional[int], port: str, baudrate: int = 9600,
                 dtr_state: str = "UNSET", rts_state: str = "UNSET") -> bool:
         """Connects to the transceiver."""
         try:
+            Hamlib = import_hamlib()
             self._rig = Hamlib.Rig(rig_id if rig_id is not None else 2048)
             self._rig.set_conf("rig_pathname", port)
+            self._port = port
 
             # Serial settings only for real COM ports
             if ":" not in port:  # Network port contains ":"
@@ -80,8 +87,12 @@ class TRXServiceImpl(TRXService):
         if not self._connected:
             raise RuntimeError("TRX not connected")
         
+        t0 = tracer.start()
         try:
             freq = self._rig.get_freq()
+            tracer.stop("cat_read", t0)
+            # The VFO was read as of issuing the command - start of end_to_end
+            tracer.mark("vfo", t0)
             return freq
         except Exception as e:
             print(f"Error reading frequency: {e}")
@@ -89,6 +100,23 @@ class TRXServiceImpl(TRXService):
             self._connected = False
             return None
     
+    def get_swr(self) -> Optional[float]:
+        """Reads the SWR meter (RIG_LEVEL_SWR); None without a valid reading."""
+        if not self._connected:
+            raise RuntimeError("TRX not connected")
+        
+        Hamlib = import_hamlib()
+        try:
+            swr = self._rig.get_level_f(Hamlib.RIG_LEVEL_SWR)
+        except Exception as e:
+            print(f"Error reading SWR: {e}")
+            return None
+        # The bindings report failures through error_status, and rigs show
+        # 0 when not transmitting - neither is a usable SWR
+        if self._rig.error_status != Hamlib.RIG_OK or swr < 1.0:
+            return None
+        return swr
+    
     def is_connected(self) -> bool:
         """
         Returns True if the TRX is connected.
@@ -100,8 +128,38 @@ class TRXServiceImpl(TRXService):
         """
         return self._connected
     
+    def start_push(self, callback: Callable[[float], None]) -> bool:
+        """
+        Subscribes to frequency updates pushed by rigctld.
+
+        Only available in network mode: rigctld's multicast data publisher
+        announces every VFO change, so no get_freq round trip is needed.
+        Hamlib's Python bindings do not expose the transceive callback, so
+        serial rigs are always polled.
+        """
+        self.stop_push()
+        if not self._connected or ":" not in self._port:
+            return False
+        address = RigctldMulticastListener.parse_address(self.push_address)
+        if address is None:
+            return False
+        # Follow only the rigctld we are connected to
+        host = self._port.rpartition(":")[0]
+        listener = RigctldMulticastListener(address[0], address[1], callback, source=host)
+        if not listener.start():
+            return False
+        self._push_listener = listener
+        return True
+    
+    def stop_push(self) -> None:
+        """Stops the rigctld multicast listener, if running."""
+        if self._push_listener is not None:
+            self._push_listener.stop()
+            self._push_listener = None
+    
     def close(self) -> None:
         """Closes the connection to the TRX."""
+        self.stop_push()
         if self._rig and self._connected:
             self._rig.close()
             self._connected = False
\ No newline at end of file
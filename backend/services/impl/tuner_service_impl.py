@@ -1,23 +1,62 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
 from backend.services.tuner_service import TunerService
-from backend.utils.network import ping_icmp, send_udp
-from backend.messages import build_messages
+from backend.utils.network import HttpPortReadback, LivenessProber, UdpTransport
+from backend.messages import encode_frame, encode_diff, port_words
+from backend.utils.latency import tracer
+from backend.utils.transition_planner import TransitionPlanner
 
 class TunerServiceImpl(TunerService):
     """Concrete implementation of tuner service."""
     
-    def __init__(self, host: str = "10.1.0.1", port: int = 54123, debug: bool = False):
+    def __init__(self, host: str = "10.1.0.1", port: int = 54123, debug: bool = False,
+                 full_refresh_interval: float = 30.0, probe_port: int = 80,
+                 planner: Optional[TransitionPlanner] = None,
+                 readback: Optional[HttpPortReadback] = None, readback_deadline: float = 0.3):
         self.host = host
         self.port = port
         self.debug = debug
+        # Seconds between full frames; in between only changed pins are sent
+        self.full_refresh_interval = full_refresh_interval
+        # Splits large relay changes into ordered steps; None = one frame
+        self.planner = planner
+        # Reads the port state back after each frame; None = trust the send
+        self.readback = readback
+        self.readback_deadline = readback_deadline
+        self.verify_stats: Dict[str, int] = {
+            "confirmed": 0,     # frames confirmed by readback
+            "lost": 0,          # readbacks showing a frame not applied
+            "retries": 0,       # full frames resent after such a readback
+            "read_errors": 0,   # readbacks without an answer
+            "unconfirmed": 0,   # sends given up at the deadline
+        }
         
         self.reachable = False
+        # The sender worker and the auto search may both send
+        self._send_lock = threading.Lock()
         self.last_l_value = -1
         self.last_c_value = -1
         self.last_hp_value = None
+        # Values last asked for, sent or not - what refresh() restores
+        self._desired: Optional[Tuple[int, int, bool]] = None
+
+        # One pre-connected socket per host/port, replaced only in set_host_port()
+        self.transport = UdpTransport(host, port)
+        # In-process liveness probe (ICMP socket or TCP connect, no fork/exec)
+        self.prober = LivenessProber(host, tcp_port=probe_port)
+
+        # Last (RA, RB, RC) port words confirmed by readback; None = unknown,
+        # which forces the next frame to be a full one. Without readback a
+        # UDP send proves nothing, so every frame is a full one
+        self._port_state: Optional[Tuple[int, int, int]] = None
+        # Last port words sent successfully - where relay transitions start
+        self._sent_state: Optional[Tuple[int, int, int]] = None
+        self._last_full_frame = 0.0
     
     def check_reachability(self, timeout: float = 0.5) -> bool:
         """Check if the tuner is reachable."""
-        self.reachable = ping_icmp(self.host, timeout=timeout)
+        self.reachable = self.prober.probe(timeout=timeout)
         if self.debug:
             if self.reachable:
                 print(f"[INFO] SBC65EC {self.host}:{self.port} is reachable")
@@ -27,30 +66,175 @@ class TunerServiceImpl(TunerService):
     
     def send_values(self, l_value: int, c_value: int, highpass: bool) -> None:
         """Send tuning values to the tuner."""
+        with self._send_lock:
+            self._send_values(l_value, c_value, highpass)
+    
+    def _send_values(self, l_value: int, c_value: int, highpass: bool) -> None:
+        self._desired = (l_value, c_value, highpass)
         if not self.reachable:
             if self.debug:
                 print("[DEBUG] Device not reachable → values not sent")
             return
         
-        # Only send if values have changed
+        # Only send if values have changed; last_* only hold values known
+        # to have been sent (and confirmed, with readback)
         if (l_value == self.last_l_value and
             c_value == self.last_c_value and
             highpass == self.last_hp_value):
             return
         
+        words = port_words(l_value, c_value, highpass)
+        if self.planner is not None and self._sent_state is not None:
+            # Intermediate steps of a planned transition, each given time to
+            # settle; the last step is the frame sent below, which sets every
+            # pin that differs from the confirmed state (or all of them), so a
+            # lost step is repaired by it
+            steps = self.planner.plan(self._sent_state, words)[:-1]
+            if steps:
+                armed = tracer.suspend()
+                for step_words, wait in steps:
+                    previous = self._sent_state
+                    if previous is None or not self._send(encode_diff(previous, step_words), step_words):
+                        break
+                    time.sleep(wait)
+                tracer.resume(armed)
+        
+        t0 = tracer.start()
+        now = time.monotonic()
+        full = (self._port_state is None or
+                now - self._last_full_frame >= self.full_refresh_interval)
+        if full:
+            msg = encode_frame(l_value, c_value, highpass)
+        else:
+            # Only the "x<pin>=<0|1>&" segments whose pin differs from the
+            # confirmed state; _confirm() resends in full if one got lost
+            msg = encode_diff(self._port_state, words)
+        if msg:
+            tracer.stop("encode", t0)
+            if not self._send(msg, words):
+                return
+            if full:
+                self._last_full_frame = now
+            if self.readback is not None and not self._confirm(words, l_value, c_value, highpass):
+                return
+        
+        self._commit_values(l_value, c_value, highpass)
+    
+    def refresh(self, busy: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Re-send the last requested values as a full frame, regardless of
+        what was sent before - restores the relays after the SBC65EC
+        rebooted or browned out. With readback, the port state is read
+        first and only resent if it differs.
+
+        The readback happens outside the send lock, so a send_values()
+        meanwhile is not delayed; the lock is only taken for the corrective
+        frame. The refresh gives way if busy() reports a value waiting to be
+        sent or the requested values changed while it was reading.
+
+        Args:
+            busy (callable, optional): Returns True while a send is waiting.
+
+        Returns:
+            bool: True if the device holds (or was sent) those values.
+        """
+        desired = self._desired
+        if desired is None or not self.reachable:
+            return False
+        words = port_words(*desired)
+        if self.readback is not None:
+            state = self.readback.read(timeout=self.readback_deadline)
+            if state is None:
+                self.verify_stats["read_errors"] += 1
+            elif state == words:
+                return self._commit_refresh(desired, words)
+            else:
+                self.verify_stats["lost"] += 1
+        if busy is not None and busy():
+            return False
+        with self._send_lock:
+            if self._desired != desired:
+                return False
+            if not self._send(encode_frame(*desired), words):
+                return False
+            self._last_full_frame = time.monotonic()
+            if self.readback is None:
+                self._commit_values(*desired)
+                return True
+        # Confirm outside the lock too; if not here, the next refresh resends
+        deadline = time.monotonic() + self.readback_deadline
+        while self.readback.read(timeout=max(deadline - time.monotonic(), 0.01)) != words:
+            if time.monotonic() >= deadline or self._desired != desired:
+                return False
+            time.sleep(0.02)
+        self.verify_stats["confirmed"] += 1
+        return self._commit_refresh(desired, words)
+    
+    def _commit_refresh(self, desired: Tuple[int, int, bool], words: Tuple[int, int, int]) -> bool:
+        """Records the device as holding desired, unless a newer send overtook the refresh."""
+        with self._send_lock:
+            if self._desired != desired:
+                return False
+            self._port_state = words
+            self._commit_values(*desired)
+            return True
+    
+    def _commit_values(self, l_value: int, c_value: int, highpass: bool) -> None:
+        """Records values as sent (and confirmed, with readback)."""
         self.last_l_value = l_value
         self.last_c_value = c_value
         self.last_hp_value = highpass
-        
-        # Build messages
-        msg_a, msg_b, msg_c1, msg_c2 = build_messages(l_value, c_value, highpass)
-        full_msg = msg_a + msg_b + msg_c1 + msg_c2
-        
+    
+    def _confirm(self, words: Tuple[int, int, int], l_value: int, c_value: int, highpass: bool) -> bool:
+        """
+        Reads the port state back until it shows words, resending the full
+        frame whenever it does not, for at most readback_deadline seconds.
+        """
+        deadline = time.monotonic() + self.readback_deadline
+        while True:
+            state = self.readback.read(timeout=max(deadline - time.monotonic(), 0.01))
+            if state == words:
+                self.verify_stats["confirmed"] += 1
+                self._port_state = words
+                return True
+            if state is None:
+                self.verify_stats["read_errors"] += 1
+            else:
+                self.verify_stats["lost"] += 1
+            if time.monotonic() >= deadline:
+                break
+            if state is not None:
+                self.verify_stats["retries"] += 1
+                self._send(encode_frame(l_value, c_value, highpass), words)
+            else:
+                time.sleep(min(0.02, max(deadline - time.monotonic(), 0.0)))
+        self.verify_stats["unconfirmed"] += 1
+        # The device state is unknown - the next send is a full frame
+        self._port_state = None
+        if self.debug:
+            print(f"[WARN] SBC65EC {self.host} did not confirm L={l_value}, C={c_value}, "
+                  f"HP={highpass} within {self.readback_deadline:.2f} s")
+        return False
+    
+    def _send(self, msg: bytes, words: Tuple[int, int, int]) -> bool:
+        """
+        Sends one frame and records words as the commanded state on success.
+        The confirmed state (_port_state) is only updated by a readback.
+        """
         if self.debug:
             print(f"[DEBUG] Sending to SBC65EC {self.host}:{self.port}")
-            print(f"  Message: {full_msg.decode(errors='ignore')}")
+            print(f"  Message: {msg.decode(errors='ignore')}")
         
-        send_udp(self.host, self.port, full_msg)
+        if self.transport.send(msg):
+            self._sent_state = words
+            return True
+        # Pin state on the device is unknown now - resync with a full frame
+        self._port_state = None
+        self._sent_state = None
+        if self.debug:
+            print(f"[WARN] Send to SBC65EC failed: {self.transport.stats()} "
+                  f"last error: {self.transport.last_error}")
+        return False
     
     def is_reachable(self) -> bool:
         """Returns True if the tuner is reachable."""
@@ -58,5 +242,24 @@ class TunerServiceImpl(TunerService):
     
     def set_host_port(self, host: str, port: int) -> None:
         """Set the host and port for communication."""
-        self.host = host
-        self.port = port
\ No newline at end of file
+        with self._send_lock:
+            self.host = host
+            self.port = port
+            self.transport.reconnect(host, port)
+            self.prober.set_host(host)
+            if self.readback is not None:
+                self.readback.set_host(host)
+            self._port_state = None
+            self._sent_state = None
+    
+    def get_send_stats(self) -> Dict[str, int]:
+        """Returns the UDP send counters (sent/errors/dropped)."""
+        return self.transport.stats()
+    
+    def get_probe_stats(self) -> Dict[str, object]:
+        """Returns the liveness probe statistics (method, loss, RTT)."""
+        return self.prober.stats()
+    
+    def get_verify_stats(self) -> Dict[str, int]:
+        """Returns the readback verification counters (all 0 without readback)."""
+        return dict(self.verify_stats)
\ No newline at end of file
@@ -40,6 +40,16 @@ class SettingsService(ABC):
         """Save current settings to the JSON file."""
         pass
     
+    @abstractmethod
+    def load_from_json(self, filename: str) -> None:
+        """Switch to another settings file and load it."""
+        pass
+    
+    @abstractmethod
+    def close(self) -> None:
+        """Flush pending writes; called on shutdown."""
+        pass
+    
     @abstractmethod
     def get_for_frequency(self, freq: float) -> Optional[Dict]:
         """Retrieve the settings entry for a specific frequency."""
@@ -25,7 +25,7 @@
 #    available under this license.
 # -----------------------------------------------------------------------------
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional
 
 class TRXService(ABC):
     """Interface for transceiver communication services."""
@@ -57,6 +57,17 @@ class TRXService(ABC):
         """Reads the current frequency from the TRX."""
         pass
     
+    @abstractmethod
+    def get_swr(self) -> Optional[float]:
+        """
+        Reads the rig's SWR meter.
+
+        Returns:
+            The SWR, or None if the rig delivers no reading (e.g. because
+            it is not transmitting or has no SWR meter).
+        """
+        pass
+    
     @abstractmethod
     def is_connected(self) -> bool:
         """Returns True if the TRX is connected."""
@@ -65,4 +76,24 @@ class TRXService(ABC):
     @abstractmethod
     def close(self) -> None:
         """Closes the connection to the TRX."""
+        pass
+    
+    @abstractmethod
+    def start_push(self, callback: Callable[[float], None]) -> bool:
+        """
+        Subscribes to unsolicited frequency updates from the rig/backend.
+
+        Args:
+            callback: Called with each pushed frequency in Hz, possibly from
+                another thread.
+
+        Returns:
+            True if push updates were set up; False if the backend cannot
+            push, in which case the caller has to keep polling.
+        """
+        pass
+    
+    @abstractmethod
+    def stop_push(self) -> None:
+        """Stops unsolicited frequency updates started by start_push()."""
         pass
\ No newline at end of file
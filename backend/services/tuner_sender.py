@@ -0,0 +1,208 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from backend.services.tuner_service import TunerService
+from backend.utils.latency import tracer
+
+class TunerSender:
+    """
+    Sends tuner values from a worker thread, newest value first.
+
+    submit() only drops (L, C, HP) into a single-slot mailbox and returns;
+    a value still waiting there is replaced, so a slider drag or a fast
+    VFO never builds up a queue - the worker always sends the latest state.
+    Sends are spaced at least 1 / max_rate seconds apart (the frame rate
+    the SBC65EC and its relays keep up with), and everything that blocks -
+    socket, relay transition steps - happens on the worker, never on the
+    caller's (GUI) thread.
+
+    Since the tuner only sends values that changed, a tuner that lost its
+    state (reboot, brown-out) would keep its default relays until the next
+    change. A second thread therefore calls TunerService.refresh() every
+    refresh_interval seconds, and right away after request_refresh(), e.g.
+    when the heartbeat sees the device come back. It is a thread of its
+    own, so a slow readback during a refresh never holds up the worker;
+    refresh() gives way to a value waiting in the mailbox or sent
+    meanwhile, and refreshes do not count against the rate limit.
+
+    Attributes:
+        tuner (TunerService): Service doing the actual send.
+        max_rate (float): Maximum sends per second.
+        refresh_interval (float): Seconds between refreshes, 0 = off.
+        submitted (int): Values handed to submit().
+        sent (int): Values passed on to the tuner.
+        coalesced (int): Values replaced by a newer one before being sent.
+        refreshes (int): Refreshes done.
+    """
+
+    def __init__(self, tuner: TunerService, max_rate: float = 25.0, refresh_interval: float = 10.0):
+        """
+        Initialize the sender. Call start() to run the worker.
+
+        Args:
+            tuner (TunerService): Service doing the actual send.
+            max_rate (float, optional): Maximum sends per second. Defaults to 25.
+            refresh_interval (float, optional): Seconds between refreshes,
+                0 = only on request_refresh(). Defaults to 10.
+        """
+        self.tuner = tuner
+        self.max_rate = max_rate
+        self.refresh_interval = refresh_interval
+        self.submitted = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self._refresh_event = threading.Event()   # set by request_refresh() and stop()
+        self._last_refresh = time.monotonic()
+        # (values, armed end_to_end measurement, queue tracepoint)
+        self._pending: Optional[Tuple[Tuple[int, int, bool], Optional[float], Optional[float]]] = None
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._last_send: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def start(self) -> "TunerSender":
+        """
+        Start the worker and refresh threads.
+
+        Returns:
+            TunerSender: self.
+        """
+        self._stopped.clear()
+        self._refresh_event.clear()
+        self._last_refresh = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="tuner-sender", daemon=True)
+        self._thread.start()
+        self._refresh_thread = threading.Thread(target=self._refresh_run, name="tuner-refresh", daemon=True)
+        self._refresh_thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the threads; a value still in the mailbox is dropped.
+        """
+        self._stopped.set()
+        self._refresh_event.set()
+        with self._cond:
+            self._cond.notify()
+        for thread in (self._thread, self._refresh_thread):
+            if thread is not None:
+                thread.join()
+        self._thread = self._refresh_thread = None
+
+    def submit(self, l_value: int, c_value: int, highpass: bool) -> None:
+        """
+        Queue values for sending, replacing any not sent yet. Never blocks.
+
+        A pending end_to_end measurement armed on the calling thread is
+        taken along and completed by the send.
+        """
+        armed = tracer.suspend()
+        with self._cond:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = ((l_value, c_value, highpass), armed, tracer.start())
+            self.submitted += 1
+            self._cond.notify()
+
+    def request_refresh(self) -> None:
+        """
+        Refresh the tuner state now, rather than at the next interval.
+        """
+        self._refresh_event.set()
+
+    def stats(self) -> Dict[str, float]:
+        """Returns the submitted/sent/coalesced/refreshes counters."""
+        return {"submitted": self.submitted, "sent": self.sent, "coalesced": self.coalesced,
+                "refreshes": self.refreshes}
+
+    def format_stats(self) -> str:
+        """One-line summary of stats()."""
+        return (f"Tuner sends: {self.sent} of {self.submitted} submitted "
+                f"({self.coalesced} replaced by newer values), max {self.max_rate:g}/s, "
+                f"{self.refreshes} refreshes")
+
+    def _refresh_due(self) -> Optional[float]:
+        """Seconds until the next periodic refresh, None if they are off."""
+        if self.refresh_interval <= 0:
+            return None
+        return self._last_refresh + self.refresh_interval - time.monotonic()
+
+    def _pending_value(self) -> bool:
+        """True while a submitted value waits in the mailbox."""
+        return self._pending is not None
+
+    def _refresh(self) -> None:
+        """Runs one refresh on the refresh thread."""
+        self._last_refresh = time.monotonic()
+        try:
+            self.tuner.refresh(busy=self._pending_value)
+        except Exception as e:
+            print(f"Error refreshing tuner state: {e}")
+        self.refreshes += 1
+
+    def _run(self) -> None:
+        """Worker loop: wait for a value, respect the rate limit, send the newest."""
+        while not self._stopped.is_set():
+            with self._cond:
+                while self._pending is None and not self._stopped.is_set():
+                    self._cond.wait()
+            if self._stopped.is_set():
+                return
+            if self._last_send is not None and self.max_rate > 0:
+                # Submits keep replacing the value meanwhile
+                delay = self._last_send + 1.0 / self.max_rate - time.monotonic()
+                if delay > 0 and self._stopped.wait(delay):
+                    return
+            with self._cond:
+                item, self._pending = self._pending, None
+            if item is None:
+                continue
+            values, armed, queued = item
+            tracer.stop("queue", queued)
+            tracer.resume(armed)
+            self._last_send = time.monotonic()
+            try:
+                self.tuner.send_values(*values)
+            except Exception as e:
+                print(f"Error sending tuner values: {e}")
+            tracer.disarm()
+            self.sent += 1
+
+    def _refresh_run(self) -> None:
+        """Refresh loop: wait until a refresh is due or requested, then run it."""
+        while True:
+            self._refresh_event.wait(self._refresh_due())
+            if self._stopped.is_set():
+                return
+            due = self._refresh_due()
+            if self._refresh_event.is_set() or (due is not None and due <= 0):
+                self._refresh_event.clear()
+                self._refresh()
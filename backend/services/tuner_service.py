@@ -25,6 +25,7 @@
 #    available under this license.
 # -----------------------------------------------------------------------------
 from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional
 
 class TunerService(ABC):
     """Interface for tuner control services."""
@@ -47,4 +48,27 @@ class TunerService(ABC):
     @abstractmethod
     def set_host_port(self, host: str, port: int) -> None:
         """Set the host and port for communication."""
+        pass
+    
+    @abstractmethod
+    def refresh(self, busy: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Re-send the last requested values in full, e.g. after a device reboot.
+        Gives way (returns False) whenever busy() reports a send waiting.
+        """
+        pass
+    
+    @abstractmethod
+    def get_send_stats(self) -> Dict[str, int]:
+        """Returns counters of sent, failed and dropped frames."""
+        pass
+    
+    @abstractmethod
+    def get_probe_stats(self) -> Dict[str, object]:
+        """Returns liveness probe statistics (loss and round-trip times)."""
+        pass
+    
+    @abstractmethod
+    def get_verify_stats(self) -> Dict[str, int]:
+        """Returns readback verification counters (confirmed, lost, retries)."""
         pass
\ No newline at end of file
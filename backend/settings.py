@@ -27,6 +27,7 @@
 
 import json
 import os
+from backend.utils.frequency_index import FrequencyIndex
 
 class Settings:
     """
@@ -50,6 +51,7 @@ class Settings:
         """
         self.filename = filename
         self.data = []       # Frequency entries
+        self._index = FrequencyIndex()
         self.sbc_ip = "10.1.0.1"
         self.sbc_port = 54123
         self.trx_id = None
@@ -78,6 +80,7 @@ class Settings:
             self.trx_conn_type = obj.get("trx_conn_type", self.trx_conn_type)
         except FileNotFoundError:
             self.data = []
+        self._index.rebuild(self.data)
 
     def load_from_json(self, filename=None):
         """
@@ -118,11 +121,9 @@ class Settings:
 
         Returns:
             dict|None: The matching frequency entry if found, otherwise None.
+                If several entries overlap, the one added first wins.
         """
-        for entry in self.data:
-            if entry["min_freq"] <= freq <= entry["max_freq"]:
-                return entry
-        return None
+        return self._index.lookup(freq)
 
     def add_entry(self, min_freq, max_freq, L, C, highpass):
         """
@@ -135,10 +136,12 @@ class Settings:
             C (float): Capacitance value for the entry.
             highpass (bool): Indicates if the entry uses a high-pass filter.
         """
-        self.data.append({
+        entry = {
             "min_freq": min_freq,
             "max_freq": max_freq,
             "L": L,
             "C": C,
             "highpass": highpass
-        })
+        }
+        self.data.append(entry)
+        self._index.add(entry)
@@ -0,0 +1,165 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+
+"""
+Auto search runner: AutoSearch against a simulated antenna.
+
+Drives the real TunerServiceImpl into an SBC65ECEmulator and reads the SWR
+of a SimulatedLoad at the relay state the emulator has settled to, so relay
+settle times and UDP loss show up as they would on the air. With --rigctld
+the SWR is read the way the GUI does it: through a RigctldSimulator (whose
+"l SWR" is computed from the load) via TRXServiceImpl/Hamlib and
+CatPoller.submit() - this needs the Hamlib Python bindings.
+
+For every run a random load is generated; reported are the settings
+measured, relay operations, wall-clock time and how far the found SWR is
+from the best the load model can reach.
+
+Run from the repository root:
+    python -m backend.tests.auto_search_sim --runs 20 --settle 0.02 --noise 0.01
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import threading
+from typing import Dict, List
+
+from backend.services.auto_search import AutoSearch, SimulatedLoad, L_MAX, C_MAX, C_VALUES
+from backend.services.cat_poller import CatPoller
+from backend.services.impl.tuner_service_impl import TunerServiceImpl
+from backend.tests.sbc65ec_emulator import SBC65ECEmulator
+
+
+def random_load(rng: random.Random) -> SimulatedLoad:
+    """Returns a load with its match somewhere in the tuner's range."""
+    return SimulatedLoad(
+        L0=rng.randint(0, L_MAX), C0=rng.randint(0, C_MAX), highpass=rng.random() < 0.5,
+        width_l=rng.uniform(4.0, 20.0), width_c=rng.uniform(8.0, 50.0),
+        coupling=rng.uniform(-0.8, 0.8)
+    )
+
+
+def best_swr(load: SimulatedLoad) -> float:
+    """Lowest SWR of the load over all settings the relays can take (exhaustive)."""
+    return min(load.swr(L, C, hp) for hp in (False, True)
+               for L in range(L_MAX + 1) for C in C_VALUES)
+
+
+def run(args) -> Dict[str, object]:
+    """Runs args.runs searches and summarises them."""
+    rng = random.Random(args.seed)
+    emulator = SBC65ECEmulator(port=0, probe_port=0, loss=args.loss,
+                               settle=args.relay_settle, seed=args.seed).start()
+    tuner = TunerServiceImpl("127.0.0.1", emulator.port, probe_port=emulator.probe_port)
+    tuner.check_reachability()
+
+    load = random_load(rng)
+
+    def meter() -> float:
+        return load.swr(*emulator.state(settled=True)) + rng.gauss(0.0, args.noise)
+
+    poller = simulator = None
+    read_swr = meter
+    if args.rigctld:
+        from backend.services.impl.trx_service_impl import TRXServiceImpl
+        from backend.tests.rigctld_sim import RigctldSimulator
+        from backend.utils.rig_catalogue import import_hamlib
+        Hamlib = import_hamlib()
+        simulator = RigctldSimulator([(0.0, 14_074_000.0)], port=0,
+                                     latency=args.cat_latency).start(replay=False)
+        simulator.levels["SWR"] = meter
+        connected = threading.Event()
+        poller = CatPoller(TRXServiceImpl(push_address=""),
+                           on_connect_result=lambda ok: connected.set() if ok else None)
+        threading.Thread(target=poller.run, daemon=True).start()
+        poller.request_connect(rig_id=Hamlib.RIG_MODEL_NETRIGCTL, port=f"127.0.0.1:{simulator.port}")
+        if not connected.wait(10.0):
+            raise SystemExit("Could not connect to the rigctld simulator")
+        read_swr = lambda: poller.submit(lambda trx: trx.get_swr()).result(2.0)
+
+    runs: List[Dict[str, object]] = []
+    try:
+        for _ in range(args.runs):
+            search = AutoSearch(tuner, read_swr, settle=args.settle, samples=args.samples,
+                                target_swr=args.target)
+            result = search.run()
+            result["excess"] = result["swr"] - best_swr(load)
+            result["load"] = (load.L0, load.C0, load.highpass)
+            runs.append(result)
+            load = random_load(rng)
+    finally:
+        if poller is not None:
+            poller.stop()
+        if simulator is not None:
+            simulator.stop()
+        emulator.stop()
+
+    def summary(key: str) -> Dict[str, float]:
+        values = [r[key] for r in runs]
+        return {"median": statistics.median(values), "max": max(values)}
+
+    return {
+        "runs": args.runs,
+        "measurements": summary("measurements"),
+        "relay_ops": summary("relay_ops"),
+        "elapsed": summary("elapsed"),
+        "swr_excess": summary("excess"),
+        "frames_lost": emulator.lost,
+        "results": runs if args.verbose else None,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Auto search against a simulated load")
+    parser.add_argument("--runs", type=int, default=20, help="number of random loads")
+    parser.add_argument("--settle", type=float, default=0.02, help="wait after switching (s)")
+    parser.add_argument("--relay-settle", type=float, default=0.004, help="emulated relay settle time (s)")
+    parser.add_argument("--samples", type=int, default=1, help="SWR readings per setting")
+    parser.add_argument("--target", type=float, default=1.1, help="stop at this SWR")
+    parser.add_argument("--noise", type=float, default=0.0, help="SWR meter noise (std dev)")
+    parser.add_argument("--loss", type=float, default=0.0, help="UDP loss at the emulated tuner")
+    parser.add_argument("--rigctld", action="store_true", help="read the SWR through Hamlib/rigctld")
+    parser.add_argument("--cat-latency", type=float, default=0.0, help="CAT reply delay with --rigctld (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-v", "--verbose", action="store_true", help="include every run in the output")
+    parser.add_argument("-o", "--output", help="write the result as JSON to this file")
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
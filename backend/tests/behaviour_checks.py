@@ -0,0 +1,205 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+
+"""
+Behaviour checks for edge cases that are easy to break without noticing:
+each check builds its inputs in memory (no TRX, tuner or Hamlib needed)
+and fails with an AssertionError describing the mismatch.
+
+Run from the repository root:
+    python -m backend.tests.behaviour_checks            # all checks
+    python -m backend.tests.behaviour_checks -k interp  # subset
+Exits with 1 if any check fails.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import traceback
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from backend.services.auto_tune_engine import AutoTuneEngine
+from backend.services.impl.settings_service_impl import SettingsServiceImpl
+from backend.utils.frequency_index import FrequencyIndex
+from backend.utils.interpolation import TuningInterpolator
+
+
+def _segment(lo: float, hi: float, l_value: int, c_value: int, highpass: bool = False) -> Dict:
+    return {"min_freq": lo, "max_freq": hi, "L": l_value, "C": c_value, "highpass": highpass}
+
+
+class _RecordingTuner:
+    """Collects the values AutoTuneEngine sends instead of driving a tuner."""
+
+    def __init__(self):
+        self.sent: List[Tuple[int, int, bool]] = []
+
+    def send_values(self, l_value: int, c_value: int, highpass: bool) -> None:
+        self.sent.append((l_value, c_value, highpass))
+
+
+@contextlib.contextmanager
+def _settings(segments: List[Dict]) -> Iterator[SettingsServiceImpl]:
+    """Default settings on a temporary file, holding segments."""
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        settings = SettingsServiceImpl(os.path.join(directory, "settings.json"))
+        try:
+            for e in segments:
+                settings.add_entry(e["min_freq"], e["max_freq"], e["L"], e["C"], e["highpass"])
+            yield settings
+        finally:
+            settings.close()
+
+
+# --- Checks ---
+
+def check_interpolation_narrow_gaps() -> None:
+    """Gaps narrower than a bin each answer with their own neighbours' values."""
+    segments = [
+        _segment(7_000_000, 7_000_100, 10, 10),
+        _segment(7_000_400, 7_000_500, 20, 20),
+        _segment(7_000_800, 7_000_900, 40, 40),
+        _segment(7_001_200, 7_001_300, 80, 80, highpass=True),
+    ]
+    index = FrequencyIndex(segments)
+    for mode in ("linear", "nearest"):
+        interp = TuningInterpolator(mode, step=1_000)
+        interp.rebuild(segments, index.lookup)
+        for below, above in zip(segments, segments[1:]):
+            for freq in (below["max_freq"] + 1, (below["max_freq"] + above["min_freq"]) / 2,
+                         above["min_freq"] - 1):
+                entry = interp.lookup(freq)
+                assert entry is not None, f"{mode}: no entry at {freq}"
+                assert entry["min_freq"] <= freq <= entry["max_freq"], \
+                    f"{mode}: entry {entry['min_freq']}-{entry['max_freq']} does not contain {freq}"
+                values = {(below["L"], below["C"]), (above["L"], above["C"])}
+                if mode == "linear" and below["highpass"] == above["highpass"]:
+                    low, high = sorted(values)
+                    assert low <= (entry["L"], entry["C"]) <= high, \
+                        f"{mode}: {entry['L']}/{entry['C']} at {freq} not between {low} and {high}"
+                else:
+                    assert (entry["L"], entry["C"]) in values, \
+                        f"{mode}: {entry['L']}/{entry['C']} at {freq} taken from another gap"
+
+
+def check_engine_default_switches_at_once() -> None:
+    """With default settings every segment change is sent when it is seen."""
+    segments = [_segment(7_000_000, 7_000_999, 10, 10), _segment(7_001_000, 7_002_000, 20, 20)]
+    with _settings(segments) as settings:
+        tuner = _RecordingTuner()
+        engine = AutoTuneEngine(settings, tuner)
+        # Across the abutting edge and back, each step well inside the default margin
+        for now, freq in enumerate((7_000_990, 7_001_010, 7_000_995, 7_001_005)):
+            engine.process_frequency(freq, now=float(now))
+            expected = 10 if freq < 7_001_000 else 20
+            assert tuner.sent and tuner.sent[-1][0] == expected, \
+                f"{freq} Hz: tuner at {tuner.sent[-1:]} instead of L={expected}"
+            assert engine.recheck_delay(now=float(now)) is None, f"{freq} Hz: switch held back"
+        assert len(tuner.sent) == 4 and engine.held == 0, f"sent {tuner.sent}, held {engine.held}"
+
+        # The hysteresis still holds once it is switched on
+        settings.hysteresis_hold = 2.0
+        engine.process_frequency(7_000_995, now=10.0)
+        assert len(tuner.sent) == 4 and engine.held == 1, "hold > 0 did not hold the edge switch"
+
+
+def check_engine_default_no_motion_hold() -> None:
+    """With default settings a fast sweep switches at every segment it enters."""
+    segments = [_segment(7_000_000 + i * 1_000, 7_000_999 + i * 1_000, i, i) for i in range(10)]
+    with _settings(segments) as settings:
+        tuner = _RecordingTuner()
+        engine = AutoTuneEngine(settings, tuner)
+        # 100 kHz/s, in 500 Hz steps every 5 ms
+        for step in range(20):
+            now = step * 0.005
+            engine.process_frequency(7_000_250 + step * 500, now=now)
+            assert engine.recheck_delay(now=now) is None, f"step {step}: switch held back"
+        assert [s[0] for s in tuner.sent] == list(range(10)), f"sent {tuner.sent}"
+        assert engine.motion_held == 0, f"{engine.motion_held} switches held while moving"
+
+        # The gate still holds once a speed is set
+        settings.motion_speed = 20_000
+        engine.reset()
+        for step in range(20):
+            engine.process_frequency(7_000_250 + step * 500, now=1.0 + step * 0.005)
+        assert engine.motion_held > 0, "motion_speed > 0 did not hold the sweep"
+
+
+def check_engine_motion_gate_ignores_jumps() -> None:
+    """A band jump followed by a small tuning step is not VFO motion."""
+    segments = [_segment(7_000_000, 7_200_000, 10, 10), _segment(14_000_000, 14_350_000, 20, 20),
+                _segment(21_000_000, 21_450_000, 30, 30)]
+    with _settings(segments) as settings:
+        settings.motion_speed = 20_000
+        tuner = _RecordingTuner()
+        engine = AutoTuneEngine(settings, tuner)
+        engine.process_frequency(7_100_000, now=0.0)
+        # Band jump, then a 10 Hz step 100 ms later: sum/window would be 17 MHz/s
+        engine.process_frequency(14_100_000, now=1.0)
+        engine.process_frequency(14_100_010, now=1.1)
+        # And a jump right back out of a small step
+        engine.process_frequency(21_200_000, now=1.2)
+        assert [s[0] for s in tuner.sent] == [10, 20, 30], f"sent {tuner.sent}"
+        assert engine.motion_held == 0, f"{engine.motion_held} jumps held as motion"
+
+
+CHECKS: Dict[str, Callable[[], None]] = {
+    "interpolation_narrow_gaps": check_interpolation_narrow_gaps,
+    "engine_default_switches_at_once": check_engine_default_switches_at_once,
+    "engine_default_no_motion_hold": check_engine_default_no_motion_hold,
+    "engine_motion_gate_ignores_jumps": check_engine_motion_gate_ignores_jumps,
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ck-netctrl behaviour checks")
+    parser.add_argument("-k", "--filter", default="", help="only run checks containing this text")
+    args = parser.parse_args(argv)
+
+    failed: List[str] = []
+    for name, check in CHECKS.items():
+        if args.filter not in name:
+            continue
+        try:
+            check()
+        except AssertionError:
+            failed.append(name)
+            print(f"FAIL {name}")
+            traceback.print_exc()
+        else:
+            print(f"ok   {name}")
+    if failed:
+        print(f"\n{len(failed)} check(s) failed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+"""
+Micro-benchmark suite for the hot paths: frame encoding, frequency lookup,
+UDP send and settings persistence (edit, compaction, load).
+
+Inputs are fixed (seeded), nothing leaves the machine (the UDP sink is on
+127.0.0.1) and no TRX, tuner or Hamlib is needed.
+
+Run from the repository root:
+    python -m backend.tests.bench_suite                         # print results
+    python -m backend.tests.bench_suite -o results.json         # also write JSON
+    python -m backend.tests.bench_suite -b baseline.json        # compare, exit 1 on regression
+    python -m backend.tests.bench_suite --quick -k lookup       # subset, fewer rounds
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from backend.messages import build_messages, encode_frame
+from backend.services.impl.settings_service_impl import SettingsServiceImpl
+from backend.services.impl.tuner_service_impl import TunerServiceImpl
+
+SEED = 4711
+STATES = [(l, c, hp) for hp in (False, True) for l in range(128) for c in range(256)]
+LOOKUP_SIZES = (10, 100, 1000, 10000, 100000)
+PERSIST_SIZES = (10, 1000, 10000)
+BAND_LOW, BAND_HIGH = 1_800_000, 54_000_000
+
+# name -> (setup, ops per run); setup returns (run, teardown)
+Benchmark = Tuple[Callable[[], Tuple[Callable[[], None], Callable[[], None]]], int]
+
+
+def synthetic_table(n: int) -> List[Dict]:
+    """
+    Builds n non-overlapping frequency entries spread over 1.8-54 MHz, each
+    covering 80% of its slot, so lookups hit gaps as well as entries.
+
+    Args:
+        n (int): Number of entries.
+
+    Returns:
+        list: Entries in ascending frequency order.
+    """
+    rng = random.Random(SEED + n)
+    slot = (BAND_HIGH - BAND_LOW) / n
+    table = []
+    for i in range(n):
+        low = int(BAND_LOW + i * slot)
+        table.append({
+            "min_freq": low,
+            "max_freq": int(low + slot * 0.8),
+            "L": rng.randrange(128),
+            "C": rng.randrange(256),
+            "highpass": rng.random() < 0.5,
+        })
+    return table
+
+
+def _settings(directory: str, table: List[Dict]) -> SettingsServiceImpl:
+    """Returns a settings service on a fresh file in directory, holding table."""
+    settings = SettingsServiceImpl(os.path.join(directory, f"settings_{len(table)}.json"))
+    for e in table:
+        settings.add_entry(e["min_freq"], e["max_freq"], e["L"], e["C"], e["highpass"])
+    return settings
+
+
+# --- Benchmarks ---
+
+def bench_build_messages():
+    """build_messages() + concatenation over the full L/C/HP space."""
+    def run():
+        for l, c, hp in STATES:
+            msg_a, msg_b, msg_c1, msg_c2 = build_messages(l, c, hp)
+            msg_a + msg_b + msg_c1 + msg_c2
+    return run, None
+
+
+def bench_encode_frame():
+    """encode_frame() over the full L/C/HP space (frame table warmed)."""
+    for l, c, hp in STATES:
+        encode_frame(l, c, hp)
+
+    def run():
+        for l, c, hp in STATES:
+            encode_frame(l, c, hp)
+    return run, None
+
+
+def bench_lookup(n: int, walk: bool, queries: int = 10000):
+    """get_for_frequency() on an n-entry table; random or VFO-walk queries."""
+    tmp = tempfile.TemporaryDirectory()
+    settings = _settings(tmp.name, synthetic_table(n))
+    rng = random.Random(SEED)
+    if walk:
+        # Tuning across the band in 100 Hz steps, like a turning VFO knob
+        start = rng.randrange(BAND_LOW, BAND_HIGH - queries * 100)
+        freqs = [float(start + i * 100) for i in range(queries)]
+    else:
+        freqs = [float(rng.randrange(BAND_LOW, BAND_HIGH)) for _ in range(queries)]
+    lookup = settings.get_for_frequency
+
+    def run():
+        for f in freqs:
+            lookup(f)
+    return run, tmp.cleanup
+
+
+def bench_send_values(sends: int = 5000):
+    """TunerServiceImpl.send_values() to a UDP sink on 127.0.0.1 (full frames: no readback)."""
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    sink.bind(("127.0.0.1", 0))
+    sink.settimeout(0.2)
+    stop = threading.Event()
+
+    def drain():
+        while not stop.is_set():
+            try:
+                sink.recv(2048)
+            except socket.timeout:
+                pass
+            except OSError:
+                return
+
+    drainer = threading.Thread(target=drain, daemon=True)
+    drainer.start()
+
+    tuner = TunerServiceImpl("127.0.0.1", sink.getsockname()[1])
+    tuner.reachable = True  # no probe: the sink is local
+    rng = random.Random(SEED)
+    # Consecutive states always differ, so no call is deduplicated away
+    states = [(rng.randrange(128), rng.randrange(256), i % 2 == 0) for i in range(sends)]
+
+    def run():
+        for l, c, hp in states:
+            tuner.send_values(l, c, hp)
+
+    def teardown():
+        stop.set()
+        drainer.join()
+        sink.close()
+        tuner.transport.close()
+    return run, teardown
+
+
+def bench_save(n: int):
+    """One edit (add_entry + save()) on an n-entry table."""
+    tmp = tempfile.TemporaryDirectory()
+    settings = _settings(tmp.name, synthetic_table(n))
+    settings.compact_threshold = float("inf")  # measure the journal append only
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            settings.add_entry(BAND_HIGH, BAND_HIGH + 1000, 1, 2, True)
+            settings.save()
+
+    def teardown():
+        settings.close()
+        tmp.cleanup()
+    return run, teardown
+
+
+def bench_compact(n: int):
+    """Full snapshot rewrite (compact(wait=True)) of an n-entry table."""
+    tmp = tempfile.TemporaryDirectory()
+    settings = _settings(tmp.name, synthetic_table(n))
+
+    def run():
+        settings.compact(wait=True)
+
+    def teardown():
+        settings.close()
+        tmp.cleanup()
+    return run, teardown
+
+
+def bench_load(n: int):
+    """SettingsServiceImpl.load() of an n-entry snapshot (incl. index rebuild)."""
+    tmp = tempfile.TemporaryDirectory()
+    settings = _settings(tmp.name, synthetic_table(n))
+    settings.compact(wait=True)
+
+    def teardown():
+        settings.close()
+        tmp.cleanup()
+    return settings.load, teardown
+
+
+def benchmarks() -> Dict[str, Benchmark]:
+    """
+    Returns all benchmarks by name, with the number of operations per run.
+    """
+    suite: Dict[str, Benchmark] = {
+        "build_messages_full_space": (bench_build_messages, len(STATES)),
+        "encode_frame_full_space": (bench_encode_frame, len(STATES)),
+    }
+    for n in LOOKUP_SIZES:
+        suite[f"lookup_random_{n}"] = (lambda n=n: bench_lookup(n, walk=False), 10000)
+        suite[f"lookup_walk_{n}"] = (lambda n=n: bench_lookup(n, walk=True), 10000)
+    suite["send_values_full"] = (bench_send_values, 5000)
+    for n in PERSIST_SIZES:
+        suite[f"save_{n}"] = (lambda n=n: bench_save(n), 1)
+        suite[f"compact_{n}"] = (lambda n=n: bench_compact(n), 1)
+        suite[f"load_{n}"] = (lambda n=n: bench_load(n), 1)
+    return suite
+
+
+# --- Runner ---
+
+def measure(setup: Callable, ops: int, rounds: int) -> Dict[str, float]:
+    """
+    Runs one benchmark rounds times (after one warm-up run).
+
+    Returns:
+        dict: ops per run, median/min/max time per operation in microseconds.
+    """
+    run, teardown = setup()
+    try:
+        run()
+        times = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) / ops * 1e6)
+    finally:
+        if teardown:
+            teardown()
+    return {
+        "ops": ops,
+        "rounds": rounds,
+        "median_us": statistics.median(times),
+        "min_us": min(times),
+        "max_us": max(times),
+    }
+
+
+def run_suite(rounds: int, pattern: str = "") -> Dict:
+    """
+    Runs all benchmarks whose name contains pattern.
+
+    Returns:
+        dict: {"meta": {...}, "results": {name: measure(...)}}
+    """
+    results = {}
+    for name, (setup, ops) in benchmarks().items():
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(setup, ops, rounds)
+        r = results[name]
+        print(f"{name:<28}{r['median_us']:>12.3f} us/op  (min {r['min_us']:.3f}, max {r['max_us']:.3f})",
+              file=sys.stderr)
+    return {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compares median timings against a baseline run.
+
+    Args:
+        current (dict): Output of run_suite().
+        baseline (dict): Stored output of an earlier run_suite().
+        threshold (float): Ratio above which a benchmark counts as regressed.
+
+    Returns:
+        list: Names of the regressed benchmarks.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<28}{'baseline':>12}{'current':>12}{'ratio':>8}", file=sys.stderr)
+    for name, r in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<28}{'-':>12}{r['median_us']:>12.3f}{'new':>8}", file=sys.stderr)
+            continue
+        ratio = r["median_us"] / base["median_us"] if base["median_us"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28}{base['median_us']:>12.3f}{r['median_us']:>12.3f}{ratio:>8.2f}{flag}",
+              file=sys.stderr)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ck-netctrl micro-benchmarks")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("-b", "--baseline", help="compare against this results file")
+    parser.add_argument("-t", "--threshold", type=float, default=1.25,
+                        help="slowdown ratio counted as regression (default 1.25)")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks containing this text")
+    parser.add_argument("-r", "--rounds", type=int, default=7, help="timed rounds per benchmark (default 7)")
+    parser.add_argument("--quick", action="store_true", help="3 rounds, for a fast sanity check")
+    args = parser.parse_args(argv)
+
+    current = run_suite(3 if args.quick else args.rounds, args.filter)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    else:
+        json.dump(current, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.2f}x: "
+                  f"{', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
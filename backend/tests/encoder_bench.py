@@ -0,0 +1,76 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+"""
+Micro-benchmark: build_messages() + concatenation vs. encode_frame().
+
+Run from the repository root:
+    python -m backend.tests.encoder_bench
+"""
+import time
+from backend.messages import build_messages, encode_frame, encode_frames
+
+STATES = [(l, c, hp) for hp in (False, True) for l in range(128) for c in range(256)]
+
+
+def legacy(states):
+    out = []
+    for l, c, hp in states:
+        msg_a, msg_b, msg_c1, msg_c2 = build_messages(l, c, hp)
+        out.append(msg_a + msg_b + msg_c1 + msg_c2)
+    return out
+
+
+def single(states):
+    return [encode_frame(l, c, hp) for l, c, hp in states]
+
+
+def timed(func, states, rounds=3):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(states)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    # Also warms the frame table, so the timings below are steady-state
+    assert legacy(STATES) == encode_frames(STATES), "encoder output differs from build_messages()"
+
+    n = len(STATES)
+    t_legacy = timed(legacy, STATES)
+    t_single = timed(single, STATES)
+    t_batch = timed(encode_frames, STATES)
+
+    print(f"states: {n}")
+    print(f"build_messages + concat : {t_legacy / n * 1e6:8.3f} us/frame")
+    print(f"encode_frame            : {t_single / n * 1e6:8.3f} us/frame  ({t_legacy / t_single:5.1f}x)")
+    print(f"encode_frames (batch)   : {t_batch / n * 1e6:8.3f} us/frame  ({t_legacy / t_batch:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
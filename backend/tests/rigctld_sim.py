@@ -0,0 +1,447 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+"""
+rigctld-protocol TRX simulator that replays frequency traces.
+
+Speaks enough of the rigctld network protocol for Hamlib's NETRIGCTL backend
+(\chk_vfo, \dump_state, get/set freq, mode, vfo, ptt, levels), so
+TRXServiceImpl can connect to "127.0.0.1:<port>" in network mode as if a
+real rigctld were running. The reported frequency follows a trace, which is
+either recorded (a "seconds,frequency_hz" file) or synthetic:
+
+    contest   band hopping between spots, with small tuning steps in between
+    sweep     slow, continuous VFO sweep across a band
+    spin      fast knob spins separated by pauses
+
+Replies can be delayed (fixed + jitter) and occasionally stalled, to mimic
+a busy rig or a congested CAT link.
+
+Run from the repository root:
+    python -m backend.tests.rigctld_sim --trace contest --speed 2 --latency 0.02
+"""
+
+import argparse
+import random
+import socketserver
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+Trace = List[Tuple[float, float]]  # (seconds since start, frequency in Hz)
+
+HF_BANDS = (
+    (1_810_000, 2_000_000), (3_500_000, 3_800_000), (7_000_000, 7_200_000),
+    (10_100_000, 10_150_000), (14_000_000, 14_350_000), (18_068_000, 18_168_000),
+    (21_000_000, 21_450_000), (24_890_000, 24_990_000), (28_000_000, 29_700_000),
+)
+
+# Answer to \dump_state in protocol version 1 (Hamlib 4.x rigctld), modelled
+# on the dummy rig: one RX/TX range, a few tuning steps and filters.
+DUMP_STATE = "\n".join((
+    "1",
+    "1",
+    "0",
+    "150000.000000 1500000000.000000 0x1ff -1 -1 0x3 0x3",
+    "0 0 0 0 0 0 0",
+    "150000.000000 1500000000.000000 0x1ff 5000 100000 0x3 0x3",
+    "0 0 0 0 0 0 0",
+    "0x1ff 1",
+    "0x1ff 0",
+    "0 0",
+    "0x1e 2400",
+    "0x2 500",
+    "0x1 8000",
+    "0 0",
+    "9990",
+    "9990",
+    "10000",
+    "0",
+    "10 ",
+    "10 20 30 ",
+    "0x0",
+    "0x0",
+    "0x40000000",
+    "0x0",
+    "0x0",
+    "0x0",
+    "vfo_ops=0x0",
+    "ptt_type=0x0",
+    "has_set_vfo=0",
+    "has_get_vfo=1",
+    "has_set_freq=1",
+    "has_get_freq=1",
+    "done",
+    "",
+))
+
+
+# --- Traces ---
+
+def contest_trace(duration: float = 60.0, dwell: float = 3.0, step_interval: float = 0.3,
+                  seed: int = 1) -> Trace:
+    """
+    Band hopping: jump to a random spot on a random band every ~dwell
+    seconds and tune around it in small steps meanwhile.
+    """
+    rng = random.Random(seed)
+    trace: Trace = []
+    t = 0.0
+    while t < duration:
+        low, high = rng.choice(HF_BANDS)
+        freq = rng.randrange(low, high, 100)
+        hop_end = t + rng.uniform(0.5 * dwell, 1.5 * dwell)
+        while t < min(hop_end, duration):
+            trace.append((t, float(freq)))
+            freq = min(high, max(low, freq + rng.choice((-500, -100, 100, 500))))
+            t += step_interval
+    return trace
+
+
+def sweep_trace(duration: float = 60.0, start: float = 7_000_000, stop: float = 7_200_000,
+                step: float = 50.0, step_interval: float = 0.02) -> Trace:
+    """
+    Slow VFO sweep from start to stop and back, step Hz every step_interval s.
+    """
+    trace: Trace = []
+    t, freq, direction = 0.0, start, 1
+    while t < duration:
+        trace.append((t, float(freq)))
+        freq += direction * step
+        if not start <= freq <= stop:
+            direction = -direction
+            freq += 2 * direction * step
+        t += step_interval
+    return trace
+
+
+def spin_trace(duration: float = 60.0, spin: float = 1.0, pause: float = 2.0,
+               step: float = 1000.0, step_interval: float = 0.01, seed: int = 1) -> Trace:
+    """
+    Knob spins: spin seconds of step Hz every step_interval s in a random
+    direction, then pause seconds of rest.
+    """
+    rng = random.Random(seed)
+    trace: Trace = []
+    t = 0.0
+    low, high = 14_000_000, 14_350_000
+    freq = float(rng.randrange(low, high, 100))
+    while t < duration:
+        direction = rng.choice((-1, 1))
+        spin_end = t + spin
+        while t < min(spin_end, duration):
+            trace.append((t, freq))
+            freq = min(high, max(low, freq + direction * step))
+            t += step_interval
+        trace.append((t, freq))
+        t += pause
+    return trace
+
+
+def load_trace(filename: str) -> Trace:
+    """
+    Reads a recorded trace: one "seconds,frequency_hz" (or whitespace
+    separated) pair per line; "#" starts a comment.
+    """
+    trace: Trace = []
+    with open(filename) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            t, freq = line.replace(",", " ").split()[:2]
+            trace.append((float(t), float(freq)))
+    trace.sort()
+    return trace
+
+
+TRACES: Dict[str, Callable[..., Trace]] = {
+    "contest": contest_trace,
+    "sweep": sweep_trace,
+    "spin": spin_trace,
+}
+
+
+# --- Simulator ---
+
+class RigctldSimulator:
+    """
+    Minimal rigctld server whose VFO follows a trace.
+
+    Attributes:
+        host (str): Bind address.
+        port (int): TCP port (actual port once started).
+        trace (list): (seconds, frequency) steps being replayed.
+        speed (float): Replay speed factor (2.0 = twice as fast).
+        loop (bool): Restart the trace when it ends.
+        latency (float): Fixed delay before every reply, in seconds.
+        jitter (float): Additional uniform random delay, in seconds.
+        stall_rate (float): Probability that a reply is held back for stall seconds.
+        stall (float): Length of an injected stall, in seconds.
+        levels (dict): Values returned for "l <LEVEL>", e.g. {"SWR": 1.2}; a
+            callable is called for each read (e.g. a load model).
+        changes (list): (time.monotonic(), frequency) for every VFO change.
+        commands (int): Number of commands answered.
+        stalls (int): Number of injected stalls.
+    """
+
+    def __init__(self, trace: Trace, host: str = "127.0.0.1", port: int = 4532,
+                 speed: float = 1.0, loop: bool = False, latency: float = 0.0,
+                 jitter: float = 0.0, stall_rate: float = 0.0, stall: float = 2.0,
+                 seed: Optional[int] = None):
+        self.trace = list(trace) or [(0.0, 14_074_000.0)]
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.loop = loop
+        self.latency = latency
+        self.jitter = jitter
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.levels: Dict[str, float] = {"SWR": 1.0, "STRENGTH": 0.0, "RFPOWER": 1.0}
+        self.mode = ("USB", 2400)
+        self.ptt = 0
+        self.freq = self.trace[0][1]
+        self.changes: List[Tuple[float, float]] = []
+        self.commands = 0
+        self.stalls = 0
+        self.finished = threading.Event()
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._running = False
+        self._server: Optional[socketserver.ThreadingTCPServer] = None
+        self._threads: List[threading.Thread] = []
+
+    # --- Lifecycle ---
+
+    def start(self, replay: bool = True) -> "RigctldSimulator":
+        """
+        Bind the server and start replaying the trace.
+
+        Args:
+            replay (bool, optional): False to hold the VFO at the first trace
+                frequency until begin_replay() is called, e.g. until the
+                client has connected.
+
+        Returns:
+            RigctldSimulator: self, with port set to the bound port.
+        """
+        simulator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                simulator._serve(self.rfile, self.wfile)
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self._server = socketserver.ThreadingTCPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._running = True
+        self._spawn(self._server.serve_forever, "rigctld-sim")
+        if replay:
+            self.begin_replay()
+        return self
+
+    def begin_replay(self) -> None:
+        """
+        Start replaying the trace (see start()).
+        """
+        self._spawn(self._replay, "rigctld-replay")
+
+    def _spawn(self, target, name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self) -> None:
+        """
+        Stop replaying and shut the server down.
+        """
+        self._running = False
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Replay ---
+
+    def _set_freq(self, freq: float, force: bool = False) -> None:
+        with self._lock:
+            if force or freq != self.freq:
+                self.freq = freq
+                self.changes.append((time.monotonic(), freq))
+
+    def _replay(self) -> None:
+        """Steps the VFO through the trace in (scaled) real time."""
+        while self._running:
+            start = time.monotonic()
+            offset = self.trace[0][0]
+            for i, (t, freq) in enumerate(self.trace):
+                due = start + (t - offset) / self.speed
+                while self._running and time.monotonic() < due:
+                    time.sleep(min(0.005, max(0.0, due - time.monotonic())))
+                if not self._running:
+                    return
+                # The first step is always logged, so changes starts at a known VFO
+                self._set_freq(freq, force=i == 0)
+            if not self.loop:
+                self.finished.set()
+                return
+
+    # --- Protocol ---
+
+    def _serve(self, rfile, wfile) -> None:
+        """Answers one client connection, line by line."""
+        for raw in rfile:
+            line = raw.decode("ascii", errors="replace").strip()
+            if not line:
+                continue
+            reply = self.handle_command(line)
+            if reply is None:  # "q"
+                return
+            delay = self.latency + (self._rng.uniform(0.0, self.jitter) if self.jitter else 0.0)
+            if self.stall_rate and self._rng.random() < self.stall_rate:
+                self.stalls += 1
+                delay += self.stall
+            if delay:
+                time.sleep(delay)
+            try:
+                wfile.write(reply.encode("ascii"))
+                wfile.flush()
+            except OSError:
+                return
+
+    def handle_command(self, line: str) -> Optional[str]:
+        """
+        Computes the reply to one rigctld command line.
+
+        Args:
+            line (str): Command without the trailing newline, e.g. "f" or
+                "\\set_freq 7074000".
+
+        Returns:
+            str|None: Reply text, None if the client asked to quit.
+        """
+        self.commands += 1
+        parts = line.split()
+        cmd, args = parts[0], parts[1:]
+        if cmd in ("q", "Q", "\\quit"):
+            return None
+        if cmd == "\\chk_vfo":
+            return "CHKVFO 0\n"
+        if cmd == "\\dump_state":
+            return DUMP_STATE
+        if cmd in ("f", "\\get_freq"):
+            with self._lock:
+                return f"{self.freq:.0f}\n"
+        if cmd in ("F", "\\set_freq") and args:
+            try:
+                self._set_freq(float(args[0]))
+            except ValueError:
+                return "RPRT -1\n"
+            return "RPRT 0\n"
+        if cmd in ("m", "\\get_mode"):
+            return f"{self.mode[0]}\n{self.mode[1]}\n"
+        if cmd in ("M", "\\set_mode") and len(args) >= 2:
+            self.mode = (args[0], int(args[1]) if args[1].lstrip("-").isdigit() else 0)
+            return "RPRT 0\n"
+        if cmd in ("v", "\\get_vfo"):
+            return "VFOA\n"
+        if cmd in ("t", "\\get_ptt"):
+            return f"{self.ptt}\n"
+        if cmd in ("T", "\\set_ptt") and args:
+            self.ptt = 1 if args[0] != "0" else 0
+            return "RPRT 0\n"
+        if cmd in ("l", "\\get_level") and args:
+            value = self.levels.get(args[0].upper())
+            if callable(value):
+                value = value()
+            if value is None:
+                return "RPRT -11\n"
+            return f"{value:g}\n"
+        if cmd == "\\get_powerstat":
+            return "1\n"
+        if cmd in ("V", "\\set_vfo", "\\set_powerstat"):
+            return "RPRT 0\n"
+        return "RPRT -11\n"  # RIG_ENAVAIL
+
+
+def build_trace(name: str, duration: float, seed: int) -> Trace:
+    """
+    Returns a synthetic trace by name, or loads a file if name is a path.
+    """
+    if name in TRACES:
+        generator = TRACES[name]
+        if generator is sweep_trace:
+            return generator(duration)
+        return generator(duration, seed=seed)
+    return load_trace(name)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="rigctld-protocol TRX simulator")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=4532, help="TCP port (default 4532)")
+    parser.add_argument("--trace", default="contest",
+                        help="contest, sweep, spin or a 'seconds,frequency' file (default contest)")
+    parser.add_argument("--duration", type=float, default=60.0, help="synthetic trace length (s)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor")
+    parser.add_argument("--loop", action="store_true", help="restart the trace when it ends")
+    parser.add_argument("--latency", type=float, default=0.0, help="reply delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="additional random reply delay (s)")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="probability of a stalled reply")
+    parser.add_argument("--stall", type=float, default=2.0, help="length of a stall (s)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for traces and injected faults")
+    args = parser.parse_args(argv)
+
+    simulator = RigctldSimulator(
+        build_trace(args.trace, args.duration, args.seed), args.host, args.port,
+        speed=args.speed, loop=args.loop, latency=args.latency, jitter=args.jitter,
+        stall_rate=args.stall_rate, stall=args.stall, seed=args.seed
+    ).start()
+    print(f"rigctld simulator on {simulator.host}:{simulator.port}, "
+          f"{len(simulator.trace)} trace steps at {args.speed:g}x")
+    try:
+        while not simulator.finished.wait(1.0):
+            print(f"{simulator.freq:12.0f} Hz  commands={simulator.commands} stalls={simulator.stalls}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
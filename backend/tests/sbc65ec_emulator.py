@@ -0,0 +1,389 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+"""
+SBC65EC emulator: a local stand-in for the tuner interface.
+
+Binds a UDP port, parses the "a0=1&b3=0&c5=1&" frames sent by
+TunerServiceImpl/SBC65EC (full frames as well as differential ones) and
+keeps the resulting RA/RB/RC pin state. Each relay pin can be given a settle
+time, datagrams can be dropped at random, and a TCP listener answers the
+TCP liveness probe and "GET /ports" with the latched pin state as a frame,
+for readback verification ("GET /ports?settled": the relay positions).
+ICMP on loopback is answered by the kernel anyway.
+
+Run from the repository root:
+    python -m backend.tests.sbc65ec_emulator --port 54123 --probe-port 8080 \\
+        --loss 0.01 --settle 0.004 --settle-pin b4=0.02
+
+and point the GUI (or TunerServiceImpl(probe_port=8080)) at 127.0.0.1.
+Prints frames/s and the decoded L/C/HP once per second.
+"""
+
+import argparse
+import random
+import re
+import socket
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+PORTS = "abc"
+_SEGMENT = re.compile(rb"([abc])([0-7])=([01])")
+
+
+def parse_frame(data: bytes) -> Tuple[List[Tuple[str, int, int]], int]:
+    """
+    Splits a datagram into pin assignments.
+
+    Args:
+        data (bytes): Datagram payload, e.g. b"a0=1&a1=0&".
+
+    Returns:
+        tuple: ([(port, pin, value), ...], number of malformed segments).
+    """
+    assignments = []
+    errors = 0
+    for segment in data.split(b"&"):
+        if not segment:
+            continue
+        m = _SEGMENT.fullmatch(segment.strip())
+        if m is None:
+            errors += 1
+            continue
+        assignments.append((m.group(1).decode(), int(m.group(2)), int(m.group(3))))
+    return assignments, errors
+
+
+def decode_ports(ra: int, rb: int, rc: int) -> Tuple[int, int, bool]:
+    """
+    Inverse of backend.messages.port_words().
+
+    C bit 4 has no pin in the frame grammar, so it always decodes as 0.
+
+    Returns:
+        tuple: (L, C, highpass)
+    """
+    l_value = (ra & 0x3F) | ((rb & 0x01) << 6)
+    c_value = ((rb >> 1) & 0x0F) | ((rc & 0x07) << 5)
+    return l_value, c_value, bool(rc & 0x20)
+
+
+def format_ports(ra: int, rb: int, rc: int) -> bytes:
+    """Renders port words as a full frame, in the order the host sends them."""
+    pins = (("a", ra, (0, 1, 2, 3, 4, 5)), ("b", rb, (0, 1, 2, 3, 4)), ("c", rc, (0, 1, 2, 5)))
+    return b"".join(b"%s%d=%d&" % (port.encode(), pin, (word >> pin) & 1)
+                    for port, word, pins_ in pins for pin in pins_)
+
+
+class SBC65ECEmulator:
+    """
+    Emulated SBC65EC relay board.
+
+    Attributes:
+        host (str): Bind address.
+        port (int): UDP port (actual port once started).
+        probe_port (int|None): TCP port for liveness probes / status, None = off.
+        loss (float): Probability of dropping a received datagram.
+        settle (float): Default relay settle time in seconds.
+        settle_pins (dict): Per-pin settle times, e.g. {"b4": 0.02}.
+        alive (bool): While False, datagrams and probes go unanswered.
+        frames / lost / errors / segments (int): Counters.
+        history (deque): (timestamp, L, C, HP) after every applied frame.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 54123,
+                 probe_port: Optional[int] = None, loss: float = 0.0,
+                 settle: float = 0.0, settle_pins: Optional[Dict[str, float]] = None,
+                 history: int = 10000, seed: Optional[int] = None):
+        """
+        Initialize the emulator. Call start() to bind the sockets.
+
+        Args:
+            host (str, optional): Bind address. Defaults to "127.0.0.1".
+            port (int, optional): UDP port, 0 = any free port. Defaults to 54123.
+            probe_port (int, optional): TCP port for probes, 0 = any free port,
+                None = no TCP listener.
+            loss (float, optional): Datagram drop probability (0-1).
+            settle (float, optional): Default relay settle time in seconds.
+            settle_pins (dict, optional): Settle time per pin name ("a0".."c5").
+            history (int, optional): Number of decoded states kept.
+            seed (int, optional): Seed for the loss generator.
+        """
+        self.host = host
+        self.port = port
+        self.probe_port = probe_port
+        self.loss = loss
+        self.settle = settle
+        self.settle_pins = dict(settle_pins or {})
+        self.alive = True
+        self.frames = 0
+        self.lost = 0
+        self.errors = 0
+        self.segments = 0
+        self.probes = 0
+        self.history: Deque[Tuple[float, int, int, bool]] = deque(maxlen=history)
+
+        self._rng = random.Random(seed)
+        # Commanded pin values and when each pin's relay has settled
+        self._commanded: Dict[str, int] = {p: 0 for p in PORTS}
+        self._previous: Dict[str, int] = {p: 0 for p in PORTS}
+        self._settled_at: Dict[Tuple[str, int], float] = {}
+        self._frame_times: Deque[float] = deque()
+        self._lock = threading.Lock()
+        self._running = False
+        self._threads: List[threading.Thread] = []
+        self._udp: Optional[socket.socket] = None
+        self._tcp: Optional[socket.socket] = None
+
+    # --- Lifecycle ---
+
+    def start(self) -> "SBC65ECEmulator":
+        """
+        Bind the sockets and start the receiver threads.
+
+        Returns:
+            SBC65ECEmulator: self, with port/probe_port set to the bound ports.
+        """
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._udp.bind((self.host, self.port))
+        self._udp.settimeout(0.2)
+        self.port = self._udp.getsockname()[1]
+        self._running = True
+        self._spawn(self._udp_loop, "sbc65ec-udp")
+        if self.probe_port is not None:
+            self._tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._tcp.bind((self.host, self.probe_port))
+            self._tcp.listen(16)
+            self._tcp.settimeout(0.2)
+            self.probe_port = self._tcp.getsockname()[1]
+            self._spawn(self._tcp_loop, "sbc65ec-tcp")
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the receiver threads and close the sockets.
+        """
+        self._running = False
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        for sock in (self._udp, self._tcp):
+            if sock is not None:
+                sock.close()
+        self._udp = self._tcp = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Frame handling ---
+
+    def feed(self, data: bytes, now: Optional[float] = None) -> bool:
+        """
+        Apply one datagram as if it had been received.
+
+        Args:
+            data (bytes): Datagram payload.
+            now (float, optional): time.monotonic() timestamp. Defaults to now.
+
+        Returns:
+            bool: False if the datagram was dropped (loss or not alive).
+        """
+        now = time.monotonic() if now is None else now
+        if not self.alive or (self.loss and self._rng.random() < self.loss):
+            with self._lock:
+                self.lost += 1
+            return False
+        assignments, errors = parse_frame(data)
+        with self._lock:
+            self.errors += errors
+            self.segments += len(assignments)
+            for port, pin, value in assignments:
+                word = self._commanded[port]
+                if (word >> pin) & 1 == value:
+                    continue
+                # The relay keeps its old position until it has settled
+                self._previous[port] = self._state_at(port, now)
+                self._commanded[port] = word ^ (1 << pin)
+                delay = self.settle_pins.get(f"{port}{pin}", self.settle)
+                self._settled_at[(port, pin)] = now + delay
+            self.frames += 1
+            self._frame_times.append(now)
+            self.history.append((now,) + decode_ports(*(self._commanded[p] for p in PORTS)))
+        return True
+
+    def _state_at(self, port: str, now: float) -> int:
+        """Pin word of one port as the relays actually stand at time now."""
+        word = self._commanded[port]
+        for pin in range(8):
+            settled_at = self._settled_at.get((port, pin))
+            if settled_at is not None and settled_at > now:
+                word = (word & ~(1 << pin)) | (self._previous[port] & (1 << pin))
+        return word
+
+    # --- State ---
+
+    def ports(self, settled: bool = True, now: Optional[float] = None) -> Tuple[int, int, int]:
+        """
+        Returns the RA/RB/RC words.
+
+        Args:
+            settled (bool, optional): True for the relay positions right now
+                (pins still settling keep their old value), False for the
+                last commanded values.
+            now (float, optional): Timestamp for settled, e.g. when frames
+                were fed with explicit timestamps. Defaults to now.
+        """
+        with self._lock:
+            if not settled:
+                return tuple(self._commanded[p] for p in PORTS)
+            now = time.monotonic() if now is None else now
+            return tuple(self._state_at(p, now) for p in PORTS)
+
+    def state(self, settled: bool = True, now: Optional[float] = None) -> Tuple[int, int, bool]:
+        """Returns the decoded (L, C, highpass), see ports()."""
+        return decode_ports(*self.ports(settled, now))
+
+    def is_settled(self) -> bool:
+        """True once every relay has reached its commanded position."""
+        now = time.monotonic()
+        with self._lock:
+            return all(t <= now for t in self._settled_at.values())
+
+    def frames_per_second(self, window: float = 1.0) -> float:
+        """Frames applied per second over the last window seconds."""
+        now = time.monotonic()
+        with self._lock:
+            while self._frame_times and self._frame_times[0] < now - window:
+                self._frame_times.popleft()
+            return len(self._frame_times) / window
+
+    def stats(self) -> Dict[str, object]:
+        """Returns the counters, frame rate and current state."""
+        l_value, c_value, hp = self.state()
+        return {
+            "frames": self.frames,
+            "lost": self.lost,
+            "errors": self.errors,
+            "segments": self.segments,
+            "probes": self.probes,
+            "frames_per_second": self.frames_per_second(),
+            "L": l_value,
+            "C": c_value,
+            "highpass": hp,
+            "settled": self.is_settled(),
+        }
+
+    # --- Threads ---
+
+    def _spawn(self, target, name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _udp_loop(self) -> None:
+        while self._running:
+            try:
+                data = self._udp.recv(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.feed(data)
+
+    def _tcp_loop(self) -> None:
+        while self._running:
+            try:
+                conn, _ = self._tcp.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            with conn:
+                if not self.alive:
+                    continue  # closed without a reply, like a dead web server
+                self.probes += 1
+                conn.settimeout(0.2)
+                try:
+                    request = conn.recv(1024)
+                except OSError:
+                    continue  # bare connect() probe
+                if request.startswith(b"GET /ports"):
+                    settled = request.startswith(b"GET /ports?settled")
+                    body = format_ports(*self.ports(settled=settled))
+                    conn.sendall(b"HTTP/1.0 200 OK\r\nContent-Type: text/plain\r\n"
+                                 b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+                elif request:
+                    conn.sendall(b"HTTP/1.0 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+
+
+def _parse_settle_pin(text: str) -> Tuple[str, float]:
+    pin, _, seconds = text.partition("=")
+    if not re.fullmatch(r"[abc][0-7]", pin):
+        raise argparse.ArgumentTypeError(f"expected e.g. b4=0.02, got {text!r}")
+    return pin, float(seconds)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="SBC65EC emulator")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=54123, help="UDP port (default 54123)")
+    parser.add_argument("--probe-port", type=int, default=8080,
+                        help="TCP port for liveness probes and GET /ports, -1 = off (default 8080)")
+    parser.add_argument("--loss", type=float, default=0.0, help="datagram drop probability 0-1")
+    parser.add_argument("--settle", type=float, default=0.0, help="default relay settle time (s)")
+    parser.add_argument("--settle-pin", type=_parse_settle_pin, action="append", default=[],
+                        metavar="PIN=SECONDS", help="settle time of one relay, repeatable")
+    parser.add_argument("--seed", type=int, help="seed for the loss generator")
+    args = parser.parse_args(argv)
+
+    emulator = SBC65ECEmulator(
+        args.host, args.port, None if args.probe_port < 0 else args.probe_port,
+        loss=args.loss, settle=args.settle, settle_pins=dict(args.settle_pin), seed=args.seed
+    ).start()
+    print(f"SBC65EC emulator on udp://{emulator.host}:{emulator.port}"
+          + (f", probes on tcp/{emulator.probe_port}" if emulator.probe_port else ""))
+    try:
+        while True:
+            time.sleep(1.0)
+            s = emulator.stats()
+            print(f"{s['frames_per_second']:8.0f} frames/s  frames={s['frames']} lost={s['lost']} "
+                  f"errors={s['errors']}  L={s['L']:3d} C={s['C']:3d} HP={int(s['highpass'])}"
+                  f"{'' if s['settled'] else '  (settling)'}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()
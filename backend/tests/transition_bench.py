@@ -0,0 +1,173 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+
+"""
+Relay transition benchmark: single frame vs. TransitionPlanner.
+
+Replays transitions between random tuner settings into SBC65ECEmulator
+instances in virtual time (frames fed with explicit timestamps), once as
+one differential frame and once as the planner's step sequence, and
+samples the relay state as it actually stands while the relays settle:
+
+    settle_ms   time from the first frame until every relay has settled
+    excursion   how far L or C got outside the range between the old and
+                new value (fraction of full scale)
+    relay_ops   relay operations
+    over_limit  share of transitions whose excursion exceeded --max-excursion
+
+Each relay's settle time is drawn around the nominal one (--spread), as
+real relays never switch in lockstep; the planner only knows the nominal
+times unless --exact is given. Also reports the planner's CPU time.
+
+Run from the repository root:
+    python -m backend.tests.transition_bench --count 500 --settle 0.004 \\
+        --spread 0.5 --max-excursion 0.25
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from backend.messages import encode_diff, port_words
+from backend.tests.sbc65ec_emulator import SBC65ECEmulator, decode_ports, format_ports
+from backend.utils.transition_planner import TransitionPlanner
+
+PIN_NAMES = ["a%d" % p for p in range(6)] + ["b%d" % p for p in range(5)] + ["c0", "c1", "c2", "c5"]
+
+
+def replay(old: Tuple[int, int, int], new: Tuple[int, int, int],
+           frames: List[Tuple[float, bytes]], settle_pins: Dict[str, float],
+           resolution: float) -> Dict[str, float]:
+    """
+    Feeds frames (offset, payload) into a fresh emulator that starts settled
+    at old, and samples the relay state until everything has settled.
+    """
+    emulator = SBC65ECEmulator(settle_pins=settle_pins)
+    emulator.feed(format_ports(*old), now=-10.0)
+    segments_before = emulator.segments
+    (l_old, c_old, _), (l_new, c_new, _) = decode_ports(*old), decode_ports(*new)
+    l_lo, l_hi = sorted((l_old, l_new))
+    c_lo, c_hi = sorted((c_old, c_new))
+
+    last_frame = frames[-1][0] if frames else 0.0
+    horizon = last_frame + max(settle_pins.values(), default=0.0) + resolution
+    pending = list(frames)
+    excursion = 0.0
+    settled_at = 0.0
+    previous = None
+    t = 0.0
+    while t <= horizon:
+        # The emulator only moves forward in time: feed each frame once the
+        # sampling clock has reached it
+        while pending and pending[0][0] <= t:
+            offset, payload = pending.pop(0)
+            emulator.feed(payload, now=offset)
+        l_value, c_value, _ = state = emulator.state(now=t)
+        excursion = max(excursion,
+                        max(l_lo - l_value, l_value - l_hi, 0) / 127.0,
+                        max(c_lo - c_value, c_value - c_hi, 0) / 255.0)
+        if state != previous:
+            settled_at = t
+            previous = state
+        t += resolution
+    return {"settle_ms": settled_at * 1e3, "excursion": excursion,
+            "relay_ops": emulator.segments - segments_before}
+
+
+def run(args) -> Dict[str, object]:
+    """Benchmarks args.count random transitions."""
+    rng = random.Random(args.seed)
+    results = {"single": [], "planned": []}
+    plan_times: List[float] = []
+    for _ in range(args.count):
+        settle_pins = {name: args.settle * rng.uniform(1 - args.spread, 1 + args.spread)
+                       for name in PIN_NAMES}
+        planner = TransitionPlanner(settle=args.settle, frame_time=args.frame_time,
+                                    settle_pins=settle_pins if args.exact else None,
+                                    max_excursion=args.max_excursion)
+        old = port_words(rng.randint(0, 127), rng.randint(0, 255), rng.random() < 0.5)
+        new = port_words(rng.randint(0, 127), rng.randint(0, 255), rng.random() < 0.5)
+
+        t0 = time.perf_counter()
+        steps = planner.plan(old, new)
+        plan_times.append(time.perf_counter() - t0)
+
+        results["single"].append(replay(old, new, [(0.0, encode_diff(old, new))], settle_pins, args.resolution))
+        frames = []
+        offset = 0.0
+        current = old
+        for words, wait in steps:
+            frames.append((offset, encode_diff(current, words)))
+            offset += wait
+            current = words
+        results["planned"].append(replay(old, new, frames, settle_pins, args.resolution))
+
+    def summary(rows: List[Dict[str, float]], key: str) -> Dict[str, float]:
+        values = sorted(row[key] for row in rows)
+        return {"median": statistics.median(values),
+                "p95": values[int(0.95 * (len(values) - 1))], "max": values[-1]}
+
+    report = {
+        name: {key: summary(rows, key) for key in ("settle_ms", "excursion", "relay_ops")}
+        for name, rows in results.items()
+    }
+    for name, rows in results.items():
+        report[name]["over_limit"] = sum(row["excursion"] > args.max_excursion for row in rows) / len(rows)
+    report["planner_cpu_ms"] = summary([{"t": t * 1e3} for t in plan_times], "t")
+    report["settings"] = {"count": args.count, "settle": args.settle, "spread": args.spread,
+                          "max_excursion": args.max_excursion, "exact": args.exact}
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Relay transition benchmark")
+    parser.add_argument("--count", type=int, default=500, help="number of random transitions")
+    parser.add_argument("--settle", type=float, default=0.004, help="nominal relay settle time (s)")
+    parser.add_argument("--spread", type=float, default=0.5, help="relative spread of the settle times")
+    parser.add_argument("--frame-time", type=float, default=0.001, help="per-frame overhead assumed (s)")
+    parser.add_argument("--max-excursion", type=float, default=0.25, help="planner excursion limit (0-1)")
+    parser.add_argument("--exact", action="store_true", help="give the planner the drawn settle times")
+    parser.add_argument("--resolution", type=float, default=0.0001, help="sampling step (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="write the result as JSON to this file")
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
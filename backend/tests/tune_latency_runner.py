@@ -0,0 +1,259 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+"""
+Frequency-to-tuner latency runner.
+
+Drives the real auto-tune path - TRXServiceImpl in network mode (Hamlib
+NETRIGCTL) polled by CatPoller, AutoTuneEngine, TunerSender, TunerServiceImpl - between
+a RigctldSimulator replaying a trace and an SBC65ECEmulator, then matches
+every VFO change against the relay state the emulator received:
+
+    latency   time from the simulated VFO change to the emulator holding
+              the L/C/HP of the matching entry
+    dropped   changes to a different entry that never reached the tuner
+              before the VFO moved on to yet another entry
+
+Needs the Hamlib Python bindings; no radio or tuner hardware.
+
+Run from the repository root:
+    python -m backend.tests.tune_latency_runner --trace contest --duration 30 \\
+        --latency 0.02 --stall-rate 0.01 -o results.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import Hamlib
+
+from backend.messages import port_words
+from backend.services.auto_tune_engine import AutoTuneEngine
+from backend.services.cat_poller import CatPoller
+from backend.services.impl.settings_service_impl import SettingsServiceImpl
+from backend.services.impl.trx_service_impl import TRXServiceImpl
+from backend.services.impl.tuner_service_impl import TunerServiceImpl
+from backend.services.tuner_sender import TunerSender
+from backend.tests.rigctld_sim import HF_BANDS, RigctldSimulator, build_trace
+from backend.tests.sbc65ec_emulator import SBC65ECEmulator, decode_ports
+from backend.utils.network import HttpPortReadback
+from backend.utils.poll_scheduler import AdaptivePollScheduler
+
+
+def band_table(settings: SettingsServiceImpl, segment: int = 25_000, seed: int = 1) -> None:
+    """
+    Fills settings with segment-Hz wide entries covering every HF band.
+    """
+    rng = random.Random(seed)
+    for low, high in HF_BANDS:
+        for start in range(low, high, segment):
+            settings.add_entry(start, min(start + segment - 1, high), rng.randrange(128),
+                               rng.randrange(256), rng.random() < 0.5)
+
+
+def expected_state(settings: SettingsServiceImpl, freq: float) -> Optional[Tuple[int, int, bool]]:
+    """The (L, C, HP) the emulator should end up with for freq, as it decodes it."""
+    entry = settings.get_for_frequency(freq)
+    if entry is None:
+        return None
+    return decode_ports(*port_words(entry["L"], entry["C"], entry["highpass"]))
+
+
+def analyse(changes: List[Tuple[float, float]], history: List[Tuple[float, int, int, bool]],
+            settings: SettingsServiceImpl) -> Dict[str, object]:
+    """
+    Matches VFO changes against the emulator's state history.
+
+    Args:
+        changes (list): (time, frequency) from the simulator.
+        history (list): (time, L, C, HP) from the emulator.
+        settings (SettingsServiceImpl): Table the engine tuned from.
+
+    Returns:
+        dict: counts, latency percentiles (ms) and per-switch latencies.
+    """
+    # Only changes that select a different entry require the tuner to switch;
+    # the first one is the state the rig was connected at
+    switches = []
+    current = expected_state(settings, changes[0][1]) if changes else None
+    for t, freq in changes[1:]:
+        target = expected_state(settings, freq)
+        if target is not None and target != current:
+            switches.append((t, target))
+        if target is not None:
+            current = target
+
+    latencies = []
+    dropped = 0
+    h = 0
+    for i, (t, target) in enumerate(switches):
+        deadline = switches[i + 1][0] if i + 1 < len(switches) else float("inf")
+        while h < len(history) and history[h][0] < t:
+            h += 1
+        hit = None
+        # Start at the state the tuner already held when the VFO moved
+        for j in range(max(h - 1, 0), len(history)):
+            when, l_value, c_value, hp = history[j]
+            if when >= deadline:
+                break
+            if (l_value, c_value, hp) == target:
+                hit = max(when, t)
+                break
+        if hit is None:
+            dropped += 1
+        else:
+            latencies.append(hit - t)
+
+    latencies_ms = sorted(x * 1000.0 for x in latencies)
+
+    def pct(p):
+        if not latencies_ms:
+            return None
+        return latencies_ms[min(len(latencies_ms) - 1, int(round(p / 100.0 * len(latencies_ms))) - 1)]
+
+    return {
+        "vfo_changes": len(changes),
+        "switches": len(switches),
+        "applied": len(latencies),
+        "dropped": dropped,
+        "latency_ms": {"p50": pct(50), "p95": pct(95), "p99": pct(99),
+                       "max": latencies_ms[-1] if latencies_ms else None},
+    }
+
+
+def run(args) -> Dict[str, object]:
+    """Runs one trace through simulator -> auto-tune -> emulator."""
+    tmp = tempfile.TemporaryDirectory()
+    settings = SettingsServiceImpl(os.path.join(tmp.name, "settings.json"))
+    if args.settings:
+        settings.filename = args.settings
+        settings.load()
+    else:
+        band_table(settings, args.segment, args.seed)
+
+    emulator = SBC65ECEmulator(port=0, probe_port=0, loss=args.loss, seed=args.seed).start()
+    simulator = RigctldSimulator(
+        build_trace(args.trace, args.duration, args.seed), port=0, speed=args.speed,
+        latency=args.latency, jitter=args.jitter, stall_rate=args.stall_rate,
+        stall=args.stall, seed=args.seed
+    ).start(replay=False)
+
+    tuner = TunerServiceImpl(
+        "127.0.0.1", emulator.port, probe_port=emulator.probe_port,
+        readback=HttpPortReadback("127.0.0.1", emulator.probe_port) if args.readback else None
+    )
+    tuner.check_reachability()
+    sender = TunerSender(tuner, max_rate=settings.sbc_max_frame_rate,
+                         refresh_interval=settings.sbc_state_refresh_interval).start()
+    engine = AutoTuneEngine(settings, tuner, sender=sender)
+    seen: List[float] = []
+    connected = threading.Event()
+
+    def on_frequency(freq: float) -> None:
+        seen.append(freq)
+        engine.process_frequency(freq)
+
+    poller = CatPoller(
+        TRXServiceImpl(push_address=""), on_frequency=on_frequency,
+        on_connect_result=lambda ok: connected.set() if ok else None,
+        scheduler=AdaptivePollScheduler(args.fast, args.slow, args.slow)
+    )
+    poller_thread = threading.Thread(target=poller.run, daemon=True)
+    poller_thread.start()
+    poller.request_connect(rig_id=Hamlib.RIG_MODEL_NETRIGCTL, port=f"127.0.0.1:{simulator.port}")
+    if not connected.wait(10.0):
+        poller.stop()
+        simulator.stop()
+        emulator.stop()
+        raise SystemExit("Could not connect to the rigctld simulator")
+
+    # Measure from the first VFO step on, with the rig already connected
+    simulator.begin_replay()
+    simulator.finished.wait()
+    time.sleep(0.5)  # let the last update reach the tuner
+    poller.stop()
+    poller_thread.join()
+    sender.stop()
+    simulator.stop()
+    emulator.stop()
+
+    result = analyse(list(simulator.changes), list(emulator.history), settings)
+    result.update({
+        "trace": args.trace,
+        "speed": args.speed,
+        "cat_latency": args.latency,
+        "stall_rate": args.stall_rate,
+        "frequencies_seen": len(seen),
+        "cat_commands": simulator.commands,
+        "stalls": simulator.stalls,
+        "frames": emulator.frames,
+        "frames_lost": emulator.lost,
+        "poller": poller.stats(),
+        "engine": engine.stats(),
+        "sender": sender.stats(),
+        "readback": tuner.get_verify_stats(),
+    })
+    tmp.cleanup()
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Frequency-to-tuner latency runner")
+    parser.add_argument("--trace", default="contest", help="contest, sweep, spin or a trace file")
+    parser.add_argument("--duration", type=float, default=30.0, help="synthetic trace length (s)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor")
+    parser.add_argument("--latency", type=float, default=0.0, help="CAT reply delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="additional random CAT delay (s)")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="probability of a stalled CAT reply")
+    parser.add_argument("--stall", type=float, default=2.0, help="length of a stall (s)")
+    parser.add_argument("--loss", type=float, default=0.0, help="UDP loss at the emulated tuner")
+    parser.add_argument("--readback", action="store_true", help="verify every frame via GET /ports")
+    parser.add_argument("--fast", type=float, default=0.075, help="fastest poll interval (s)")
+    parser.add_argument("--slow", type=float, default=0.5, help="slowest poll interval (s)")
+    parser.add_argument("--segment", type=int, default=25_000, help="synthetic table segment width (Hz)")
+    parser.add_argument("--settings", help="use this settings file instead of the synthetic table")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="write the result as JSON to this file")
+    args = parser.parse_args(argv)
+
+    Hamlib.rig_set_debug(Hamlib.RIG_DEBUG_NONE)
+    result = run(args)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,6 +26,7 @@
 # -----------------------------------------------------------------------------
 
 import Hamlib
+from backend.utils.rig_catalogue import catalogue
 
 class TRX:
     def __init__(self, rig_id=None, port="localhost:19090", baudrate=115200,
@@ -90,17 +91,13 @@ class TRX:
         """
         Returns a list of all rigs known to Hamlib.
 
-        The prefix 'RIG_MODEL_' is removed from the names.
+        The prefix 'RIG_MODEL_' is removed from the names. Served from the
+        cached rig catalogue, see backend.utils.rig_catalogue.
 
         Returns:
             list of tuple: List of (name, Hamlib rig ID)
         """
-        rig_models = [
-            (name.replace("RIG_MODEL_", ""), getattr(Hamlib, name))
-            for name in dir(Hamlib)
-            if name.startswith("RIG_MODEL_")
-        ]
-        return rig_models
+        return catalogue.models()
 
     def connect(self):
         """
@@ -0,0 +1,192 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class FrequencyIndex:
+    """
+    Sorted interval index mapping a frequency to its tuning entry.
+
+    Entries are grouped into span classes - class k holds the entries whose
+    width is below 2**k Hz - and each class is kept sorted by min_freq in a
+    plain list. A lookup bisects every class and scans backwards no further
+    than that class's width bound, so a single wide entry (e.g. a
+    general-coverage fallback) only lengthens the scan of its own class,
+    not that of the narrow band segments. Overlapping entries are resolved
+    deterministically: the entry that was added first (lowest position in
+    the settings list) wins, which is exactly what the previous linear scan
+    over the settings list did.
+
+    The index is maintained incrementally by add()/remove(); only load()
+    rebuilds it from scratch. The last result is cached together with the
+    frequency window in which it stays valid, so while the VFO stays inside
+    the active segment a lookup is a simple range check.
+    """
+
+    def __init__(self, entries: Iterable[Dict] = ()):
+        """
+        Initialize the index.
+
+        Args:
+            entries (iterable of dict): Initial entries in priority order.
+        """
+        # span class -> ((min_freq, priority) keys sorted, entries parallel to them)
+        self._classes: Dict[int, Tuple[List[Tuple[float, int]], List[Dict]]] = {}
+        self._priority: Dict[int, int] = {}        # id(entry) -> priority
+        self._next_priority = 0
+        self._last: Optional[Dict] = None
+        self._window = (0.0, -1.0, False, False)   # lo, hi, lo_open, hi_open
+        self.rebuild(entries)
+
+    @staticmethod
+    def _span_class(entry: Dict) -> int:
+        """Returns the class k of entry, i.e. its width is below 2**k Hz."""
+        return int(entry["max_freq"] - entry["min_freq"]).bit_length()
+
+    def rebuild(self, entries: Iterable[Dict]) -> None:
+        """
+        Rebuild the index from scratch, e.g. after loading a settings file.
+
+        Args:
+            entries (iterable of dict): Entries in priority order.
+        """
+        groups: Dict[int, List[Tuple[Tuple[float, int], Dict]]] = {}
+        self._priority = {}
+        priority = -1
+        for priority, entry in enumerate(entries):
+            self._priority[id(entry)] = priority
+            groups.setdefault(self._span_class(entry), []).append(((entry["min_freq"], priority), entry))
+        self._classes = {}
+        for k, items in groups.items():
+            items.sort(key=lambda item: item[0])
+            self._classes[k] = ([key for key, _ in items], [entry for _, entry in items])
+        self._next_priority = priority + 1
+        self._last = None
+
+    def add(self, entry: Dict) -> None:
+        """
+        Insert a new entry with the lowest priority of all indexed entries.
+
+        Args:
+            entry (dict): Entry with min_freq/max_freq keys.
+        """
+        priority = self._next_priority
+        self._next_priority += 1
+        self._priority[id(entry)] = priority
+        keys, entries = self._classes.setdefault(self._span_class(entry), ([], []))
+        key = (entry["min_freq"], priority)
+        pos = bisect_right(keys, key)
+        keys.insert(pos, key)
+        entries.insert(pos, entry)
+        self._last = None
+
+    def remove(self, entry: Dict) -> None:
+        """
+        Remove an entry from the index. Unknown entries are ignored.
+
+        Args:
+            entry (dict): The exact entry object previously added.
+        """
+        priority = self._priority.pop(id(entry), None)
+        if priority is None:
+            return
+        k = self._span_class(entry)
+        keys, entries = self._classes.get(k, ([], []))
+        pos = bisect_left(keys, (entry["min_freq"], priority))
+        if pos >= len(keys) or entries[pos] is not entry:
+            return
+        del keys[pos]
+        del entries[pos]
+        if not keys:
+            del self._classes[k]
+        self._last = None
+
+    def lookup(self, freq: float) -> Optional[Dict]:
+        """
+        Return the entry covering freq, or None.
+
+        Args:
+            freq (float): Frequency in Hz.
+
+        Returns:
+            dict|None: The highest-priority entry with min_freq <= freq <= max_freq.
+        """
+        if self._last is not None:
+            lo, hi, lo_open, hi_open = self._window
+            if (lo < freq or (not lo_open and lo == freq)) and (freq < hi or (not hi_open and hi == freq)):
+                return self._last
+
+        best = None
+        best_priority = None
+        for k, (keys, entries) in self._classes.items():
+            lower = freq - (1 << k)
+            pos = bisect_right(keys, (freq, float("inf"))) - 1
+            while pos >= 0:
+                start, priority = keys[pos]
+                if start < lower:
+                    break
+                entry = entries[pos]
+                if freq <= entry["max_freq"] and (best_priority is None or priority < best_priority):
+                    best = entry
+                    best_priority = priority
+                pos -= 1
+
+        self._last = best
+        if best is not None:
+            self._window = self._valid_window(best, best_priority, freq)
+        return best
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys, _ in self._classes.values())
+
+    def _valid_window(self, entry: Dict, priority: int, freq: float) -> Tuple[float, float, bool, bool]:
+        """
+        Returns the part of entry's range around freq that no higher-priority
+        entry covers, as (lo, hi, lo_open, hi_open).
+        """
+        lo, hi = entry["min_freq"], entry["max_freq"]
+        lo_open = hi_open = False
+        # A higher-priority entry cannot cover freq itself (entry won), so it
+        # either starts above freq or ends below it. Only the nearest one on
+        # each side matters, which keeps this bounded even for a wide entry.
+        for k, (keys, entries) in self._classes.items():
+            pos = bisect_right(keys, (freq, float("inf")))
+            i = pos
+            while i < len(keys) and keys[i][0] <= hi:
+                if keys[i][1] < priority:
+                    hi, hi_open = keys[i][0], True
+                    break
+                i += 1
+            i = pos - 1
+            while i >= 0 and keys[i][0] >= lo - (1 << k):
+                other = entries[i]
+                if keys[i][1] < priority and other["max_freq"] >= lo:
+                    lo, lo_open = other["max_freq"], True
+                i -= 1
+        return lo, hi, lo_open, hi_open
@@ -0,0 +1,193 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Gap filling modes
+MODES = ("off", "nearest", "linear")
+
+
+class TuningInterpolator:
+    """
+    Fills the gaps between saved frequency segments with derived tuner values.
+
+    Saved segments stay authoritative; the interpolator only answers for
+    frequencies no segment covers. For each gap the values at its two edges
+    are taken from the neighbouring segments, and
+
+    * "linear" interpolates L and C across the gap, as long as both edges
+      use the same high-pass setting and the gap is at most max_span wide
+      (i.e. the two segments plausibly belong to the same band);
+    * otherwise, and in "nearest" mode, each frequency gets the values of
+      the closer edge.
+
+    Apart from linearly interpolated gaps, nothing is derived further than
+    max_distance from the nearest saved segment, so the space between two
+    bands stays empty and the usual "no corresponding frequency" warning
+    still shows there.
+
+    All of this is precomputed by rebuild() into a table of step-wide bins
+    per gap, each gap's bins starting at its own lower edge; lookup() is a
+    bisect over the gaps plus an index computation. Gaps never share a bin,
+    so a gap narrower than a bin still gets its own values. Consecutive
+    bins with equal values share one entry dict (with min_freq/max_freq of
+    the run and "interpolated": True), so moving the VFO within such a run
+    does not look like a new entry to AutoTuneEngine.
+
+    Attributes:
+        mode (str): One of MODES.
+        max_distance (float): Max distance (Hz) from a saved segment.
+        max_span (float): Widest gap (Hz) interpolated linearly.
+        step (float): Bin width (Hz) of the bin tables.
+    """
+
+    MAX_BINS = 1_000_000
+
+    def __init__(self, mode: str = "off", max_distance: float = 25_000,
+                 max_span: float = 1_000_000, step: float = 1_000):
+        """
+        Initialize an empty interpolator.
+
+        Args:
+            mode (str, optional): One of MODES. Defaults to "off".
+            max_distance (float, optional): Max distance (Hz) from a saved
+                segment. Defaults to 25 kHz.
+            max_span (float, optional): Widest gap (Hz) interpolated
+                linearly. Defaults to 1 MHz.
+            step (float, optional): Bin width (Hz). Defaults to 1 kHz.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown interpolation mode {mode!r}")
+        self.mode = mode
+        self.max_distance = max_distance
+        self.max_span = max_span
+        self.step = step
+        self._bin = step
+        self._los: List[float] = []     # lower edge of every gap, ascending
+        self._gaps: List[Tuple[float, float, List[Optional[Dict]]]] = []   # (lo, hi, bins)
+
+    def rebuild(self, entries: Iterable[Dict], lookup: Callable[[float], Optional[Dict]]) -> None:
+        """
+        Recompute the bin tables.
+
+        Args:
+            entries (iterable of dict): Saved segments.
+            lookup (callable): Saved-segment lookup (e.g. FrequencyIndex.lookup),
+                used to pick the winning segment at a gap edge.
+        """
+        self._los = []
+        self._gaps = []
+        if self.mode == "off":
+            return
+        coverage = self._coverage(entries)
+        if not coverage:
+            return
+
+        start = coverage[0][0] - self.max_distance
+        end = coverage[-1][1] + self.max_distance
+        self._bin = max(self.step, (end - start) / self.MAX_BINS)
+
+        # (lo edge, hi edge, entry below, entry above) for every gap,
+        # including the open-ended ones before the first / after the last
+        gaps: List[Tuple[float, float, Optional[Dict], Optional[Dict]]] = []
+        gaps.append((start, coverage[0][0], None, lookup(coverage[0][0])))
+        for (_, hi), (lo, _) in zip(coverage, coverage[1:]):
+            gaps.append((hi, lo, lookup(hi), lookup(lo)))
+        gaps.append((coverage[-1][1], end, lookup(coverage[-1][1]), None))
+
+        for gap in gaps:
+            self._los.append(gap[0])
+            self._gaps.append((gap[0], gap[1], self._fill_gap(*gap)))
+
+    def lookup(self, freq: float) -> Optional[Dict]:
+        """
+        Return the derived entry for a frequency no saved segment covers.
+
+        Args:
+            freq (float): Frequency in Hz.
+
+        Returns:
+            dict|None: Entry with L, C, highpass, min_freq, max_freq and
+            "interpolated": True, or None if freq is out of reach.
+        """
+        i = bisect_right(self._los, freq) - 1
+        if i < 0:
+            return None
+        lo, hi, bins = self._gaps[i]
+        if freq > hi:
+            return None
+        return bins[min(int((freq - lo) // self._bin), len(bins) - 1)]
+
+    def __len__(self) -> int:
+        """Number of bins in all gaps."""
+        return sum(len(bins) for _, _, bins in self._gaps)
+
+    @staticmethod
+    def _coverage(entries: Iterable[Dict]) -> List[Tuple[float, float]]:
+        """Returns the union of the saved ranges as sorted, disjoint (lo, hi) pairs."""
+        merged: List[List[float]] = []
+        for lo, hi in sorted((e["min_freq"], e["max_freq"]) for e in entries):
+            if merged and lo <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+        return [(lo, hi) for lo, hi in merged]
+
+    def _fill_gap(self, lo: float, hi: float, below: Optional[Dict], above: Optional[Dict]) -> List[Optional[Dict]]:
+        """Returns the bins of the gap between lo and hi, the first one starting at lo."""
+        linear = (self.mode == "linear" and below is not None and above is not None
+                  and below["highpass"] == above["highpass"] and hi - lo <= self.max_span)
+        bins: List[Optional[Dict]] = [None] * (int((hi - lo) // self._bin) + 1)
+        previous = None
+        for pos in range(len(bins)):
+            bin_lo = lo + pos * self._bin
+            bin_hi = min(bin_lo + self._bin, hi)
+            freq = (bin_lo + bin_hi) / 2
+            if linear:
+                ratio = (freq - lo) / (hi - lo) if hi > lo else 0.0
+                values = (round(below["L"] + (above["L"] - below["L"]) * ratio),
+                          round(below["C"] + (above["C"] - below["C"]) * ratio),
+                          below["highpass"])
+            else:
+                d_below = freq - lo if below is not None else float("inf")
+                d_above = hi - freq if above is not None else float("inf")
+                source = below if d_below <= d_above else above
+                if min(d_below, d_above) > self.max_distance:
+                    previous = None
+                    continue
+                values = (source["L"], source["C"], source["highpass"])
+
+            if previous is not None and previous[0] == values:
+                entry = previous[1]
+                entry["max_freq"] = bin_hi
+            else:
+                entry = {"min_freq": bin_lo, "max_freq": bin_hi,
+                         "L": values[0], "C": values[1], "highpass": values[2],
+                         "interpolated": True}
+                previous = (values, entry)
+            bins[pos] = entry
+        return bins
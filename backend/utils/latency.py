@@ -0,0 +1,248 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+# Stages of the VFO -> tuner path, in pipeline order
+STAGES = ("cat_read", "lookup", "queue", "encode", "send", "end_to_end")
+
+
+class LatencyTracer:
+    """
+    Rolling per-stage latency statistics for the auto-tune path.
+
+    Tracepoints bracket each stage with start()/stop(); the last window
+    durations per stage are kept, and snapshot() reports p50/p95/p99 over
+    them. The end_to_end stage measures from the CAT read that saw a new
+    frequency (mark("vfo") + arm("vfo")) to the frame leaving the socket
+    (fire()). A pending measurement belongs to the thread that armed it;
+    handing the send to another thread takes it along with suspend() and
+    resume().
+
+    Disabled by default: start() then returns None and every tracepoint
+    costs a single attribute check.
+
+    Attributes:
+        enabled (bool): Whether tracepoints record anything.
+        window (int): Number of samples kept per stage.
+    """
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialize the tracer.
+
+        Args:
+            window (int, optional): Samples kept per stage. Defaults to 1000.
+        """
+        self.enabled = False
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._marks: Dict[str, float] = {}
+        self._local = threading.local()   # .armed: pending end_to_end start
+        self._lock = threading.Lock()
+
+    def start(self) -> Optional[float]:
+        """
+        Opens a tracepoint.
+
+        Returns:
+            float|None: Start timestamp to hand to stop(), or None if disabled.
+        """
+        return time.perf_counter() if self.enabled else None
+
+    def stop(self, stage: str, start: Optional[float]) -> None:
+        """
+        Closes a tracepoint opened with start().
+
+        Args:
+            stage (str): Stage name, e.g. "lookup".
+            start (float|None): Value returned by start().
+        """
+        if start is not None:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Adds one duration sample to a stage.
+
+        Args:
+            stage (str): Stage name.
+            seconds (float): Duration in seconds.
+        """
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                self._counts[stage] = 0
+            samples.append(seconds)
+            self._counts[stage] += 1
+
+    def mark(self, name: str, timestamp: Optional[float] = None) -> None:
+        """
+        Remembers when an event happened, e.g. the last CAT read.
+
+        Args:
+            name (str): Event name.
+            timestamp (float, optional): perf_counter() value. Defaults to now.
+        """
+        if self.enabled:
+            self._marks[name] = time.perf_counter() if timestamp is None else timestamp
+
+    def arm(self, name: str) -> None:
+        """
+        Starts an end-to-end measurement at the last mark(name).
+
+        Args:
+            name (str): Event name passed to mark().
+        """
+        if self.enabled:
+            self._local.armed = self._marks.get(name)
+
+    def disarm(self) -> None:
+        """
+        Abandons a pending end-to-end measurement (nothing was sent).
+        """
+        self._local.armed = None
+
+    def suspend(self) -> Optional[float]:
+        """
+        Takes a pending end-to-end measurement off the trigger, so that
+        intermediate frames do not complete it, or to hand it to the thread
+        that does the send.
+
+        Returns:
+            float|None: Start timestamp to hand to resume().
+        """
+        armed = getattr(self._local, "armed", None)
+        self._local.armed = None
+        return armed
+
+    def resume(self, armed: Optional[float]) -> None:
+        """
+        Re-arms a measurement taken off by suspend(), on the calling thread.
+
+        Args:
+            armed (float|None): Value returned by suspend().
+        """
+        self._local.armed = armed
+
+    def fire(self, stage: str = "end_to_end") -> None:
+        """
+        Completes a pending end-to-end measurement.
+
+        Args:
+            stage (str, optional): Stage to record into. Defaults to "end_to_end".
+        """
+        armed = getattr(self._local, "armed", None)
+        if armed is not None:
+            self._local.armed = None
+            self.record(stage, time.perf_counter() - armed)
+
+    def reset(self) -> None:
+        """
+        Discards all samples and marks.
+        """
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._marks.clear()
+        self._local.armed = None
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Computes the current statistics per stage.
+
+        Returns:
+            dict: stage -> {"count", "window", "p50", "p95", "p99", "max"},
+            durations in milliseconds; stages in pipeline order first.
+        """
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+            counts = dict(self._counts)
+        order = [s for s in STAGES if s in samples] + sorted(s for s in samples if s not in STAGES)
+        result = {}
+        for stage in order:
+            values = samples[stage]
+            result[stage] = {
+                "count": counts[stage],
+                "window": len(values),
+                "p50": _percentile(values, 50) * 1000.0,
+                "p95": _percentile(values, 95) * 1000.0,
+                "p99": _percentile(values, 99) * 1000.0,
+                "max": values[-1] * 1000.0,
+            }
+        return result
+
+    def format(self) -> str:
+        """
+        Renders snapshot() as a fixed-width text table.
+
+        Returns:
+            str: One line per stage.
+        """
+        lines = [f"{'stage':<12}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for stage, s in self.snapshot().items():
+            lines.append(f"{stage:<12}{s['count']:>8}{s['p50']:>10.3f}{s['p95']:>10.3f}"
+                         f"{s['p99']:>10.3f}{s['max']:>10.3f}")
+        return "\n".join(lines)
+
+    def dump(self, filename: str) -> None:
+        """
+        Writes the statistics and the raw sample windows to a JSON file.
+
+        Args:
+            filename (str): Target file.
+        """
+        with self._lock:
+            raw = {stage: [round(v * 1000.0, 6) for v in values]
+                   for stage, values in self._samples.items()}
+        with open(filename, "w") as f:
+            json.dump({"time": time.time(), "stats": self.snapshot(), "samples_ms": raw}, f, indent=2)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted, non-empty list.
+
+    Args:
+        sorted_values (list): Ascending samples.
+        pct (float): Percentile, 0-100.
+
+    Returns:
+        float: The sample at that rank.
+    """
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+# Process-wide tracer used by the tracepoints in the services
+tracer = LatencyTracer()
@@ -0,0 +1,116 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class VfoMotionDetector:
+    """
+    Tells a spinning VFO knob from a parked or jumping VFO.
+
+    Fed with every reported frequency, it sums the distance the VFO moved
+    over the last window seconds. The VFO counts as moving while that gives
+    at least min_speed Hz/s from at least min_changes changes. A step larger
+    than max_step is a jump (band change, memory recall), not knob motion:
+    it is left out of the speed and starts a new history, so a jump still
+    switches at once even with a small tuning step right after it. Since
+    frequencies are only reported when they change, the speed also drops
+    without a new report, whenever a change leaves the window - see
+    expires_at().
+
+    Attributes:
+        window (float): Seconds of frequency history considered.
+        min_changes (int): Changes within window needed to count as moving.
+        max_step (float): Largest step in Hz still counted as knob motion.
+    """
+
+    def __init__(self, window: float = 0.4, min_changes: int = 2,
+                 max_step: float = 250_000):
+        """
+        Initialize the detector.
+
+        Args:
+            window (float, optional): History in seconds. Defaults to 0.4.
+            min_changes (int, optional): Changes needed for motion. Defaults to 2.
+            max_step (float, optional): Steps above this many Hz are jumps.
+                Defaults to 250 kHz.
+        """
+        self.window = window
+        self.min_changes = min_changes
+        self.max_step = max_step
+        self._last_freq: Optional[float] = None
+        self._changes: Deque[Tuple[float, float]] = deque()   # (timestamp, Hz moved)
+
+    def record(self, freq: float, now: Optional[float] = None) -> None:
+        """
+        Account for one reported frequency.
+
+        Args:
+            freq (float): VFO frequency in Hz.
+            now (float, optional): time.monotonic() timestamp.
+        """
+        now = time.monotonic() if now is None else now
+        if self._last_freq is not None and freq != self._last_freq:
+            moved = abs(freq - self._last_freq)
+            if moved > self.max_step:
+                self._changes.clear()   # a jump, not motion - start over
+            else:
+                self._changes.append((now, moved))
+        self._last_freq = freq
+        self._expire(now)
+
+    def speed(self, now: Optional[float] = None) -> float:
+        """
+        VFO speed in Hz/s over the last window; 0 with fewer than
+        min_changes changes in it.
+        """
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        if len(self._changes) < self.min_changes:
+            return 0.0
+        return sum(moved for _, moved in self._changes) / self.window
+
+    def is_moving(self, min_speed: float, now: Optional[float] = None) -> bool:
+        """True while the VFO moves at min_speed Hz/s or faster."""
+        return min_speed > 0 and self.speed(now) >= min_speed
+
+    def expires_at(self) -> Optional[float]:
+        """Timestamp at which the oldest change leaves the window, None if none."""
+        if not self._changes:
+            return None
+        return self._changes[0][0] + self.window
+
+    def reset(self) -> None:
+        """Forget the history, e.g. after a reconnect."""
+        self._last_freq = None
+        self._changes.clear()
+
+    def _expire(self, now: float) -> None:
+        while self._changes and self._changes[0][0] <= now - self.window:
+            self._changes.popleft()
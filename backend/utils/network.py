@@ -25,10 +25,19 @@
 #    available under this license.
 # -----------------------------------------------------------------------------
 
+import errno
+import os
+import select
 import socket
+import struct
 import subprocess
 import platform
+import threading
+import time
 from shutil import which
+from typing import Dict, Optional, Tuple
+from backend.messages import parse_ports
+from backend.utils.latency import tracer
 
 def ping_icmp(ip: str, timeout: float = 1.0, attempts: int = 3) -> bool:
     """
@@ -99,3 +108,384 @@ def send_udp(ip: str, port: int, data: bytes, timeout=1.0) -> bool:
         return True
     except Exception:
         return False
+
+class UdpTransport:
+    """
+    Long-lived, pre-connected UDP socket for sending frames to one host/port.
+
+    Unlike send_udp(), the socket is created, resolved and connect()ed once
+    and then reused for every frame, and sends are non-blocking: a frame
+    that does not fit into the socket buffer is dropped and counted instead
+    of stalling the caller. Failures are counted rather than swallowed.
+
+    Attributes:
+        ip (str): Target IP address.
+        port (int): Target UDP port.
+        sent (int): Frames handed to the kernel successfully.
+        errors (int): Frames that failed with a socket error (e.g. ICMP
+            port unreachable reported on a later send, no route to host).
+        dropped (int): Frames dropped because the send buffer was full.
+        last_error (str|None): Text of the most recent socket error.
+    """
+
+    def __init__(self, ip: str, port: int):
+        """
+        Initialize the transport. The socket is opened lazily on first send.
+
+        Args:
+            ip (str): Target IP address.
+            port (int): Target UDP port.
+        """
+        self.ip = ip
+        self.port = port
+        self.sent = 0
+        self.errors = 0
+        self.dropped = 0
+        self.last_error: Optional[str] = None
+        self._sock: Optional[socket.socket] = None
+
+    def open(self) -> bool:
+        """
+        Create and connect the socket if it is not open yet.
+
+        Returns:
+            bool: True if the socket is ready for sending.
+        """
+        if self._sock is not None:
+            return True
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            sock.connect((self.ip, self.port))
+        except OSError as e:
+            self.last_error = str(e)
+            return False
+        self._sock = sock
+        return True
+
+    def close(self) -> None:
+        """
+        Close the socket. A later send() reopens it.
+        """
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def reconnect(self, ip: str, port: int) -> None:
+        """
+        Point the transport at a new host/port, replacing the socket.
+
+        Args:
+            ip (str): New target IP address.
+            port (int): New target UDP port.
+        """
+        self.close()
+        self.ip = ip
+        self.port = port
+        self.open()
+
+    def send(self, data: bytes) -> bool:
+        """
+        Send one datagram without blocking.
+
+        Args:
+            data (bytes): Data payload to send.
+
+        Returns:
+            bool: True if the datagram was handed to the kernel, False if it
+            was dropped or failed (see the counters).
+        """
+        if self._sock is None and not self.open():
+            self.errors += 1
+            return False
+        t0 = tracer.start()
+        try:
+            self._sock.send(data)
+        except BlockingIOError:
+            self.dropped += 1
+            return False
+        except OSError as e:
+            self.errors += 1
+            self.last_error = str(e)
+            return False
+        tracer.stop("send", t0)
+        tracer.fire()
+        self.sent += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the send counters.
+
+        Returns:
+            dict: {"sent": ..., "errors": ..., "dropped": ...}
+        """
+        return {"sent": self.sent, "errors": self.errors, "dropped": self.dropped}
+
+def _icmp_checksum(data: bytes) -> int:
+    """Internet checksum (RFC 1071) of an ICMP message."""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+class LivenessProber:
+    """
+    In-process reachability prober for the SBC65EC, without spawning ping.
+
+    Prefers an unprivileged ICMP echo socket (Linux "ping socket", allowed
+    when the user's group is inside net.ipv4.ping_group_range); the socket is
+    opened once and reused for every probe. Where the kernel does not allow
+    that (or on Windows), it falls back to a TCP connect probe against the
+    SBC65EC's web server port - an accept or a refusal both prove the host
+    is up, only a timeout counts as lost.
+
+    Attributes:
+        ip (str): Target IP address.
+        tcp_port (int): Port used by the TCP fallback. Defaults to 80.
+        method (str): "icmp" or "tcp", whichever is in use.
+        sent (int): Number of probes sent.
+        received (int): Number of probes answered.
+        last_rtt (float|None): Round-trip time of the last answered probe in seconds.
+        min_rtt (float|None): Lowest round-trip time seen.
+        max_rtt (float|None): Highest round-trip time seen.
+    """
+
+    def __init__(self, ip: str, tcp_port: int = 80):
+        """
+        Initialize the prober.
+
+        Args:
+            ip (str): Target IP address.
+            tcp_port (int, optional): Port for the TCP fallback. Defaults to 80.
+        """
+        self.ip = ip
+        self.tcp_port = tcp_port
+        self.sent = 0
+        self.received = 0
+        self.last_rtt: Optional[float] = None
+        self.min_rtt: Optional[float] = None
+        self.max_rtt: Optional[float] = None
+        self._rtt_sum = 0.0
+        self._seq = 0
+        self._ident = os.getpid() & 0xFFFF
+        self._lock = threading.Lock()
+        self._icmp_sock: Optional[socket.socket] = None
+        self.method = "icmp" if self._open_icmp() else "tcp"
+
+    def _open_icmp(self) -> bool:
+        """Opens the reusable unprivileged ICMP socket, if permitted."""
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            sock.setblocking(False)
+        except (OSError, AttributeError):
+            return False
+        self._icmp_sock = sock
+        return True
+
+    def set_host(self, ip: str) -> None:
+        """
+        Point the prober at a new host. Statistics are reset.
+
+        Args:
+            ip (str): New target IP address.
+        """
+        with self._lock:
+            self.ip = ip
+            self.sent = self.received = 0
+            self.last_rtt = self.min_rtt = self.max_rtt = None
+            self._rtt_sum = 0.0
+
+    def close(self) -> None:
+        """
+        Close the ICMP socket.
+        """
+        with self._lock:
+            if self._icmp_sock is not None:
+                self._icmp_sock.close()
+                self._icmp_sock = None
+            self.method = "tcp"
+
+    def probe(self, timeout: float = 0.5, attempts: int = 2) -> bool:
+        """
+        Check whether the host answers.
+
+        Args:
+            timeout (float, optional): Timeout per attempt in seconds. Defaults to 0.5.
+            attempts (int, optional): Number of attempts. Defaults to 2.
+
+        Returns:
+            bool: True if any attempt was answered.
+        """
+        with self._lock:
+            for _ in range(attempts):
+                self.sent += 1
+                start = time.perf_counter()
+                if self._icmp_sock is not None:
+                    ok = self._probe_icmp(timeout)
+                else:
+                    ok = self._probe_tcp(timeout)
+                if ok:
+                    self._record_rtt(time.perf_counter() - start)
+                    return True
+            return False
+
+    def _probe_icmp(self, timeout: float) -> bool:
+        """Sends one echo request on the shared socket and waits for its reply."""
+        self._seq = (self._seq + 1) & 0xFFFF
+        header = struct.pack("!BBHHH", 8, 0, 0, self._ident, self._seq)
+        payload = b"ck-netctrl".ljust(24, b"\0")  # 32-byte packet, as before
+        packet = struct.pack("!BBHHH", 8, 0, _icmp_checksum(header + payload),
+                             self._ident, self._seq) + payload
+        sock = self._icmp_sock
+        try:
+            # Discard late replies to earlier probes
+            while select.select([sock], [], [], 0)[0]:
+                sock.recv(1024)
+            sock.sendto(packet, (self.ip, 0))
+        except OSError:
+            return False
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if not select.select([sock], [], [], remaining)[0]:
+                return False
+            try:
+                reply = sock.recv(1024)
+            except OSError:
+                return False
+            # The kernel strips the IP header and rewrites the identifier,
+            # so only type (0 = echo reply) and sequence need checking.
+            if len(reply) >= 8 and reply[0] == 0 and struct.unpack("!H", reply[6:8])[0] == self._seq:
+                return True
+
+    def _probe_tcp(self, timeout: float) -> bool:
+        """Attempts a TCP connect; both accept and refusal mean the host is up."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            # Reset instead of FIN on close, so no TIME_WAIT state or open
+            # connection is left behind on the SBC65EC's small TCP stack.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            sock.setblocking(False)
+            err = sock.connect_ex((self.ip, self.tcp_port))
+            if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", -1)):
+                return err == errno.ECONNREFUSED
+            if err != 0:
+                _, writable, failed = select.select([], [sock], [sock], timeout)
+                if not writable and not failed:
+                    return False
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            return err in (0, errno.ECONNREFUSED, getattr(errno, "WSAECONNREFUSED", -1))
+        except OSError:
+            return False
+        finally:
+            sock.close()
+
+    def _record_rtt(self, rtt: float) -> None:
+        """Updates the RTT statistics with an answered probe."""
+        self.received += 1
+        self.last_rtt = rtt
+        self._rtt_sum += rtt
+        self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+        self.max_rtt = rtt if self.max_rtt is None else max(self.max_rtt, rtt)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Returns the probe statistics.
+
+        Returns:
+            dict: method, sent, received, lost and last/min/avg/max RTT in
+            seconds (None until a probe was answered).
+        """
+        avg = self._rtt_sum / self.received if self.received else None
+        return {
+            "method": self.method,
+            "sent": self.sent,
+            "received": self.received,
+            "lost": self.sent - self.received,
+            "last_rtt": self.last_rtt,
+            "min_rtt": self.min_rtt,
+            "avg_rtt": avg,
+            "max_rtt": self.max_rtt,
+        }
+
+
+class HttpPortReadback:
+    """
+    Reads the SBC65EC's port state back over HTTP, to confirm that a frame
+    was applied.
+
+    A GET of path on the board's web server must answer with the port pins
+    as a frame ("a0=1&a1=0&...", see backend.messages.parse_ports()). The
+    SBC65EC emulator serves the latched pins at "/ports"; firmware for the
+    real board needs a matching page. One short-lived TCP connection per
+    read, HTTP/1.0.
+
+    Attributes:
+        ip (str): Target IP address.
+        port (int): Web server port.
+        path (str): Request path.
+        reads (int): Reads attempted.
+        errors (int): Reads without a usable answer.
+    """
+
+    def __init__(self, ip: str, port: int = 80, path: str = "/ports"):
+        """
+        Initialize the reader.
+
+        Args:
+            ip (str): Target IP address.
+            port (int, optional): Web server port. Defaults to 80.
+            path (str, optional): Request path. Defaults to "/ports".
+        """
+        self.ip = ip
+        self.port = port
+        self.path = path
+        self.reads = 0
+        self.errors = 0
+
+    def set_host(self, ip: str) -> None:
+        """
+        Point the reader at a new host.
+
+        Args:
+            ip (str): New target IP address.
+        """
+        self.ip = ip
+
+    def read(self, timeout: float = 0.2) -> Optional[Tuple[int, int, int]]:
+        """
+        Reads the port words.
+
+        Args:
+            timeout (float, optional): Seconds for connect and reply. Defaults to 0.2.
+
+        Returns:
+            tuple|None: (RA, RB, RC), or None on any error.
+        """
+        self.reads += 1
+        request = ("GET %s HTTP/1.0\r\nHost: %s\r\n\r\n" % (self.path, self.ip)).encode()
+        deadline = time.monotonic() + timeout
+        try:
+            with socket.create_connection((self.ip, self.port), timeout=timeout) as sock:
+                sock.sendall(request)
+                chunks = []
+                while True:
+                    sock.settimeout(max(deadline - time.monotonic(), 0.001))
+                    chunk = sock.recv(4096)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+        except OSError:
+            self.errors += 1
+            return None
+        head, _, body = b"".join(chunks).partition(b"\r\n\r\n")
+        words = parse_ports(body) if head.split(b" ", 2)[1:2] == [b"200"] else None
+        if words is None:
+            self.errors += 1
+        return words
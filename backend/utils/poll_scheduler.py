@@ -0,0 +1,143 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+class AdaptivePollScheduler:
+    """
+    Chooses the CAT poll interval from recent VFO activity.
+
+    Right after a frequency change the rig is polled at fast_interval, so
+    auto-tune follows a moving VFO quickly. Every poll that sees the same
+    frequency again stretches the interval by backoff, up to slow_interval
+    (or idle_interval while the window is minimised), which keeps serial
+    bus load low while the rig is parked.
+
+    Attributes:
+        fast_interval (float): Interval right after a change, in seconds.
+        slow_interval (float): Upper bound while the window is visible.
+        idle_interval (float): Upper bound while the window is minimised.
+        backoff (float): Factor applied to the interval per unchanged poll.
+        interval (float): Interval until the next poll.
+        minimized (bool): Whether the minimised (idle) bound applies.
+    """
+
+    def __init__(self, fast_interval: float = 0.075, slow_interval: float = 0.5,
+                 idle_interval: float = 2.0, backoff: float = 1.5, window: float = 10.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            fast_interval (float, optional): Interval after a change. Defaults to 0.075.
+            slow_interval (float, optional): Upper bound when stable. Defaults to 0.5.
+            idle_interval (float, optional): Upper bound when minimised. Defaults to 2.0.
+            backoff (float, optional): Growth factor per unchanged poll. Defaults to 1.5.
+            window (float, optional): Seconds covered by polls_per_second. Defaults to 10.0.
+        """
+        self.fast_interval = fast_interval
+        self.slow_interval = max(slow_interval, fast_interval)
+        self.idle_interval = max(idle_interval, self.slow_interval)
+        self.backoff = max(backoff, 1.0)
+        self.window = window
+        self.interval = fast_interval
+        self.minimized = False
+
+        self._polls: deque = deque()
+        self._last_poll: Optional[float] = None
+        self._latency_sum = 0.0
+        self._changes = 0
+
+    def reset(self) -> None:
+        """
+        Poll fast again, e.g. after (re)connecting.
+        """
+        self.interval = self.fast_interval
+        self._last_poll = None
+
+    def set_minimized(self, minimized: bool) -> None:
+        """
+        Switch between the normal and the minimised upper bound.
+
+        Args:
+            minimized (bool): True while the window is minimised.
+        """
+        self.minimized = minimized
+        self.interval = min(self.interval, self._ceiling())
+
+    def record_poll(self, changed: bool, now: Optional[float] = None) -> float:
+        """
+        Account for one poll and compute the interval until the next one.
+
+        Args:
+            changed (bool): Whether the poll returned a new frequency.
+            now (float, optional): time.monotonic() of the poll.
+
+        Returns:
+            float: Seconds until the next poll.
+        """
+        now = time.monotonic() if now is None else now
+        self._polls.append(now)
+        while self._polls and self._polls[0] < now - self.window:
+            self._polls.popleft()
+
+        if changed:
+            if self._last_poll is not None:
+                # The change happened somewhere since the previous poll;
+                # that gap is the worst-case reaction latency.
+                self._latency_sum += now - self._last_poll
+                self._changes += 1
+            self.interval = self.fast_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self._ceiling())
+        self._last_poll = now
+        return self.interval
+
+    def _ceiling(self) -> float:
+        """Returns the current upper bound for the interval."""
+        return self.idle_interval if self.minimized else self.slow_interval
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns polling statistics.
+
+        Returns:
+            dict: polls_per_second over the last window, reaction_latency
+            (mean worst-case delay between a VFO change and the poll that
+            saw it, in seconds; 0.0 before the first change) and the
+            current interval.
+        """
+        span = self.window
+        if self._polls:
+            span = min(self.window, max(time.monotonic() - self._polls[0], 1e-6))
+        return {
+            "polls_per_second": len(self._polls) / span if self._polls else 0.0,
+            "reaction_latency": self._latency_sum / self._changes if self._changes else 0.0,
+            "interval": self.interval,
+        }
@@ -0,0 +1,184 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+
+import importlib
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+
+_hamlib = None
+
+
+def import_hamlib():
+    """
+    Imports the Hamlib bindings on first use.
+
+    Importing Hamlib loads the native library and all rig backends, which
+    is the slowest part of a cold start, so callers defer it until a rig is
+    actually opened.
+
+    Returns:
+        module: The Hamlib module (debug output silenced).
+
+    Raises:
+        ImportError: If the bindings are not installed.
+    """
+    global _hamlib
+    if _hamlib is None:
+        module = importlib.import_module("Hamlib")
+        module.rig_set_debug(module.RIG_DEBUG_NONE)
+        _hamlib = module
+    return _hamlib
+
+
+def default_cache_file() -> str:
+    """
+    Returns the catalogue cache path ($XDG_CACHE_HOME/ck-netctrl/rig_models.json).
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ck-netctrl", "rig_models.json")
+
+
+class RigCatalogue:
+    """
+    List of the rig models known to the installed Hamlib, cached on disk.
+
+    The cache stores the Hamlib version together with a fingerprint (path,
+    size, mtime) of the bindings module, which can be taken without importing
+    Hamlib. As long as the fingerprint matches, models() is served from the
+    cache; after a Hamlib upgrade the list is rebuilt from the RIG_MODEL_*
+    constants once and the cache rewritten.
+
+    Attributes:
+        cache_file (str): Path of the JSON cache.
+        hamlib_version (str|None): Version of the Hamlib the list came from.
+    """
+
+    def __init__(self, cache_file: Optional[str] = None):
+        """
+        Initialize the catalogue. Nothing is read until models() is called.
+
+        Args:
+            cache_file (str, optional): Cache path. Defaults to default_cache_file().
+        """
+        self.cache_file = cache_file or default_cache_file()
+        self.hamlib_version: Optional[str] = None
+        self._models: Optional[List[Tuple[str, int]]] = None
+        self._lock = threading.Lock()  # models() may be warmed on a background thread
+
+    def models(self) -> List[Tuple[str, int]]:
+        """
+        Returns all rig models, sorted by name.
+
+        Returns:
+            list of tuple: (name without "RIG_MODEL_", Hamlib rig ID); empty
+            if Hamlib is not installed.
+        """
+        with self._lock:
+            if self._models is None:
+                fingerprint = self._fingerprint()
+                models = self._read_cache(fingerprint)
+                if models is None:
+                    models = self._scan()
+                    if models and fingerprint is not None:
+                        self._write_cache(fingerprint, models)
+                self._models = models
+            return self._models
+
+    def model_id(self, name: str) -> Optional[int]:
+        """
+        Looks up a rig ID by model name, e.g. "NETRIGCTL".
+
+        Returns:
+            int|None: The rig ID, or None if unknown.
+        """
+        for model_name, rig_id in self.models():
+            if model_name == name:
+                return rig_id
+        return None
+
+    @staticmethod
+    def _fingerprint() -> Optional[List]:
+        """Identifies the installed bindings without importing them."""
+        try:
+            spec = importlib.util.find_spec("Hamlib")
+        except (ImportError, ValueError):
+            return None
+        if spec is None or not spec.origin or not os.path.exists(spec.origin):
+            return None
+        st = os.stat(spec.origin)
+        return [spec.origin, st.st_size, st.st_mtime_ns]
+
+    def _read_cache(self, fingerprint: Optional[List]) -> Optional[List[Tuple[str, int]]]:
+        """Returns the cached models if the cache matches fingerprint."""
+        if fingerprint is None:
+            return None
+        try:
+            with open(self.cache_file, "r") as f:
+                obj = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if obj.get("fingerprint") != fingerprint:
+            return None
+        self.hamlib_version = obj.get("hamlib_version")
+        return [(name, rig_id) for name, rig_id in obj.get("models", [])]
+
+    def _scan(self) -> List[Tuple[str, int]]:
+        """Builds the model list from the Hamlib module (imports it)."""
+        try:
+            hamlib = import_hamlib()
+        except ImportError as e:
+            print(f"Hamlib not available: {e}")
+            return []
+        cvar = getattr(hamlib, "cvar", None)
+        self.hamlib_version = str(getattr(cvar, "hamlib_version", "unknown"))
+        return sorted(
+            ((name.replace("RIG_MODEL_", ""), getattr(hamlib, name))
+             for name in dir(hamlib) if name.startswith("RIG_MODEL_")),
+            key=lambda model: model[0]
+        )
+
+    def _write_cache(self, fingerprint: List, models: List[Tuple[str, int]]) -> None:
+        """Writes the cache atomically; failures only cost the next cold start."""
+        obj = {"hamlib_version": self.hamlib_version, "fingerprint": fingerprint,
+               "models": [list(model) for model in models]}
+        try:
+            directory = os.path.dirname(self.cache_file)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".rig_models-", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, "w") as f:
+                json.dump(obj, f)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            print(f"Cannot write rig model cache {self.cache_file}: {e}")
+
+
+# Process-wide catalogue
+catalogue = RigCatalogue()
@@ -0,0 +1,214 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+
+import json
+import socket
+import struct
+import threading
+from typing import Callable, Optional, Set
+
+
+def parse_state_packet(data: bytes) -> Optional[float]:
+    """
+    Extracts the receive frequency from a rigctld multicast state packet.
+
+    rigctld (Hamlib 4.6+, started with --multicast-addr) publishes its rig
+    state as JSON with a "vfos" list; the VFO flagged "rx" is the one being
+    listened to, otherwise the first VFO is used.
+
+    Args:
+        data (bytes): Raw datagram payload.
+
+    Returns:
+        float|None: Frequency in Hz, or None if the packet has no usable VFO.
+    """
+    try:
+        obj = json.loads(data.decode("utf-8", errors="replace"))
+    except ValueError:
+        return None
+    if not isinstance(obj, dict):
+        return None
+    vfos = obj.get("vfos")
+    if not isinstance(vfos, list) or not vfos:
+        return None
+    candidates = [v for v in vfos if isinstance(v, dict) and "freq" in v]
+    if not candidates:
+        return None
+    vfo = next((v for v in candidates if v.get("rx")), candidates[0])
+    try:
+        return float(vfo["freq"])
+    except (TypeError, ValueError):
+        return None
+
+
+class RigctldMulticastListener:
+    """
+    Receives unsolicited frequency updates published by rigctld.
+
+    Joins rigctld's multicast group on a daemon thread and calls the
+    callback with every frequency it receives, so no CAT command is needed
+    to follow the VFO.
+
+    The group is shared by every rigctld on the LAN, so packets are only
+    accepted from the host the TRX is connected to; otherwise a second
+    rigctld in the shack would drive auto-tune with the wrong rig.
+
+    Attributes:
+        group (str): Multicast group address.
+        port (int): Multicast UDP port.
+        source (str|None): Host of the rigctld to follow, None = any.
+        packets (int): Number of state packets with a frequency received.
+        rejected (int): Number of packets dropped for their source address.
+    """
+
+    def __init__(self, group: str, port: int, callback: Callable[[float], None],
+                 source: Optional[str] = None):
+        """
+        Initialize the listener. Call start() to begin receiving.
+
+        Args:
+            group (str): Multicast group, e.g. "224.0.0.1".
+            port (int): UDP port, e.g. 4532.
+            callback (callable): Called with each received frequency (Hz),
+                on the listener thread.
+            source (str, optional): Host name or address of the rigctld to
+                follow, e.g. the host part of the TRX port. None accepts
+                packets from any sender.
+        """
+        self.group = group
+        self.port = port
+        self.callback = callback
+        self.source = source
+        self.packets = 0
+        self.rejected = 0
+        self._sources: Set[str] = set()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    @staticmethod
+    def parse_address(address: str) -> Optional[tuple]:
+        """
+        Splits "group:port" into (group, port).
+
+        Args:
+            address (str): Address string, e.g. "224.0.0.1:4532".
+
+        Returns:
+            tuple|None: (group, port), or None if empty or malformed.
+        """
+        if not address or ":" not in address:
+            return None
+        group, _, port = address.rpartition(":")
+        try:
+            return group, int(port)
+        except ValueError:
+            return None
+
+    def _source_addresses(self) -> Set[str]:
+        """
+        Resolves source to the IPv4 addresses its packets can arrive from.
+
+        Multicast sent on this machine arrives with the sending interface's
+        address rather than 127.0.0.1, so for a local rigctld the addresses
+        of this host are accepted as well.
+        """
+        host = self.source.strip("[]")
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None, socket.AF_INET)}
+        if any(a.startswith("127.") for a in addresses):
+            try:
+                addresses.update(socket.gethostbyname_ex(socket.gethostname())[2])
+            except OSError:
+                pass
+            # The interface the group is routed through, i.e. rigctld's sender address
+            probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                probe.connect((self.group, self.port))
+                addresses.add(probe.getsockname()[0])
+            except OSError:
+                pass
+            finally:
+                probe.close()
+        return addresses
+
+    def start(self) -> bool:
+        """
+        Join the multicast group and start the listener thread.
+
+        Returns:
+            bool: True if the socket could be set up.
+        """
+        try:
+            self._sources = self._source_addresses() if self.source else set()
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                # Only this group's traffic, not every datagram to the port
+                sock.bind((self.group, self.port))
+            except OSError:
+                # Windows cannot bind to a multicast address
+                sock.bind(("", self.port))
+            membership = struct.pack("4sl", socket.inet_aton(self.group), socket.INADDR_ANY)
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+            sock.settimeout(0.5)
+        except OSError as e:
+            print(f"Cannot listen for rigctld multicast on {self.group}:{self.port}: {e}")
+            return False
+        self._sock = sock
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="rigctld-multicast", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """
+        Stop the listener thread and leave the group.
+        """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _run(self) -> None:
+        """Listener loop."""
+        while self._running:
+            try:
+                data, (address, _) = self._sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if self._sources and address not in self._sources:
+                self.rejected += 1
+                continue
+            freq = parse_state_packet(data)
+            if freq is not None:
+                self.packets += 1
+                self.callback(freq)
@@ -25,7 +25,7 @@
 #    available under this license.
 # -----------------------------------------------------------------------------
 
-from backend.messages import build_messages
+from backend.messages import encode_frame
 from backend.utils import network
 
 class SBC65EC:
@@ -55,18 +55,24 @@ class SBC65EC:
         self.last_c_value = -1
         self.last_hp_value = None
 
+        # Pre-connected socket reused for every frame
+        self.transport = network.UdpTransport(host, port)
+        # In-process liveness probe, reused by check_reachability()
+        self.prober = network.LivenessProber(host)
+
     # --- Check device reachability ---
     def check_reachability(self, timeout: float = 0.5) -> bool:
         """
-        Check if the SBC65EC device is reachable via ICMP ping.
+        Check if the SBC65EC device is reachable (ICMP echo or TCP connect
+        probe, see network.LivenessProber).
 
         Args:
             timeout (float): Maximum time to wait for a response in seconds. Defaults to 0.5.
 
         Returns:
-            bool: True if the device responds to ping, False otherwise.
+            bool: True if the device responds to the probe, False otherwise.
         """
-        self.reachable = network.ping_icmp(self.host, timeout=timeout)
+        self.reachable = self.prober.probe(timeout=timeout)
         if self.debug:
             if self.reachable:
                 print(f"[INFO] SBC65EC {self.host}:{self.port} is reachable")
@@ -102,12 +108,13 @@ class SBC65EC:
         self.last_c_value = c_value
         self.last_hp_value = highpass
 
-        # Build messages
-        msg_a, msg_b, msg_c1, msg_c2 = build_messages(l_value, c_value, highpass)
-        full_msg = msg_a + msg_b + msg_c1 + msg_c2
+        # Build the full datagram (precomputed, no per-byte work)
+        full_msg = encode_frame(l_value, c_value, highpass)
 
         if self.debug:
             print(f"[DEBUG] Sending to SBC65EC {self.host}:{self.port}")
             print(f"  Message: {full_msg.decode(errors='ignore')}")
 
-        network.send_udp(self.host, self.port, full_msg)
+        if not self.transport.send(full_msg) and self.debug:
+            print(f"[WARN] Send to SBC65EC failed: {self.transport.stats()} "
+                  f"last error: {self.transport.last_error}")
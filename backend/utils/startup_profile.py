@@ -0,0 +1,101 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+import sys
+import time
+from typing import List, Optional, TextIO, Tuple
+
+
+class StartupProfiler:
+    """
+    Wall-clock profile of application startup, split into named phases.
+
+    mark() closes the phase that started at the previous mark (or at the
+    process start handed to start()), so consecutive marks partition the
+    startup time. Disabled by default, in which case mark() only costs an
+    attribute check.
+
+    Attributes:
+        enabled (bool): Whether marks are recorded.
+        phases (list): (name, duration, elapsed) tuples in seconds.
+    """
+
+    def __init__(self):
+        """
+        Initialize a disabled profiler.
+        """
+        self.enabled = False
+        self.phases: List[Tuple[str, float, float]] = []
+        self._t0 = 0.0
+        self._last = 0.0
+
+    def start(self, t0: Optional[float] = None) -> None:
+        """
+        Enable the profiler and start the clock.
+
+        Args:
+            t0 (float, optional): time.perf_counter() value the first phase
+                starts at, e.g. taken before the heavy imports. Defaults to now.
+        """
+        self._t0 = self._last = time.perf_counter() if t0 is None else t0
+        self.phases = []
+        self.enabled = True
+
+    def mark(self, phase: str) -> None:
+        """
+        Close the current phase.
+
+        Args:
+            phase (str): Name of the phase that just finished.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last, now - self._t0))
+        self._last = now
+
+    def total(self) -> float:
+        """
+        Returns:
+            float: Seconds from start() to the last mark.
+        """
+        return self._last - self._t0
+
+    def report(self, out: TextIO = sys.stderr) -> None:
+        """
+        Print the phases as a table.
+
+        Args:
+            out (TextIO, optional): Stream to print to. Defaults to stderr.
+        """
+        width = max([len(name) for name, _, _ in self.phases] + [5])
+        print(f"{'phase':<{width}}  {'ms':>8}  {'total':>8}", file=out)
+        for name, duration, elapsed in self.phases:
+            print(f"{name:<{width}}  {duration * 1e3:8.1f}  {elapsed * 1e3:8.1f}", file=out)
+
+
+# Process-wide profiler, enabled by main.py --profile-startup
+profiler = StartupProfiler()
@@ -0,0 +1,305 @@
+# -----------------------------------------------------------------------------
+# Christian-Koppler Control Software (ck-netctrl)
+# Copyright (C) 2025 dl3hc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version, **with the following restriction**:
+#
+# Non-Commercial Use Only:
+# This software may not be used for commercial purposes.
+# Commercial purposes include selling, licensing, or using the software
+# to provide paid services.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details:
+# https://www.gnu.org/licenses/
+#
+# Additional notes:
+# 1. Any modifications or derived works must also be released under
+#    this same license (GPLv3 + Non-Commercial).
+# 2. Redistribution of modified versions must also make the source code
+#    available under this license.
+# -----------------------------------------------------------------------------
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+Words = Tuple[int, int, int]
+
+PORTS = "abc"
+
+# What each SBC65EC pin switches: (bank, weight) with bank "L" or "C", or
+# None for the high-pass relay. Mirrors backend.messages.port_words().
+_PIN_BANKS: Dict[Tuple[int, int], Optional[Tuple[str, int]]] = {}
+for _pin in range(6):
+    _PIN_BANKS[(0, _pin)] = ("L", 1 << _pin)             # RA0-RA5: L bits 0-5
+_PIN_BANKS[(1, 0)] = ("L", 1 << 6)                        # RB0: L bit 6
+for _pin in range(1, 5):
+    _PIN_BANKS[(1, _pin)] = ("C", 1 << (_pin - 1))       # RB1-RB4: C bits 0-3
+for _pin in range(3):
+    _PIN_BANKS[(2, _pin)] = ("C", 1 << (_pin + 5))       # RC0-RC2: C bits 5-7
+_PIN_BANKS[(2, 5)] = None                                 # RC5: high-pass
+
+_FULL_SCALE = {"L": 127.0, "C": 255.0}
+
+
+class TransitionPlanner:
+    """
+    Plans how to move the relay board from one set of port words to another.
+
+    Sending every changed pin in one frame is fastest, but the relays then
+    switch in no particular order, so for a moment the network can take any
+    mix of old and new bits - e.g. L passing through 127 or 0 on the way
+    from 63 to 64. With an amplifier behind the tuner those intermediate
+    settings are what it sees.
+
+    The planner splits a transition into chunks - the pins of one port
+    (RA/RB/RC) switching on, or switching off; if that is too coarse, with
+    the most significant pin of each split off - and picks an ordered
+    sequence of steps, each step one datagram carrying one or more chunks.
+    A step lasts frame_time plus the longest settle time of its relays, and
+    its worst case is any subset of its relays having switched. Among all
+    step sequences (a shortest path over the subsets of chunks) it takes
+    the fastest one whose steps keep L and C within max_excursion (as a
+    fraction of full scale) of the range between the old and new values;
+    if none does, the one with the smallest excursion. Every relay switches
+    exactly once, so the relay operations are the same for every plan.
+
+    Plans are cached per (old, new) pair.
+
+    Attributes:
+        settle (float): Default relay settle time in seconds.
+        settle_pins (dict): Per-pin settle times, e.g. {"b4": 0.02}, as
+            understood by the SBC65EC emulator.
+        frame_time (float): Time to deliver and apply one datagram, seconds.
+        max_excursion (float): Allowed worst-case excursion (0-1); 1 always
+            gives a single frame.
+    """
+
+    MAX_FINE_CHUNKS = 8   # 3^8 candidate steps, a few ms
+
+    def __init__(self, settle: float = 0.004, settle_pins: Optional[Dict[str, float]] = None,
+                 frame_time: float = 0.001, max_excursion: float = 0.25, cache_size: int = 4096):
+        """
+        Initialize the planner.
+
+        Args:
+            settle (float, optional): Default relay settle time (s). Defaults to 4 ms.
+            settle_pins (dict, optional): Settle time per pin name ("a0".."c5").
+            frame_time (float, optional): Per-datagram overhead (s). Defaults to 1 ms.
+            max_excursion (float, optional): Allowed excursion (0-1). Defaults to 0.25.
+            cache_size (int, optional): Number of plans kept.
+        """
+        self.settle = settle
+        self.settle_pins = dict(settle_pins or {})
+        self.frame_time = frame_time
+        self.max_excursion = max_excursion
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[Words, Words], List[Tuple[Words, float]]]" = OrderedDict()
+
+    def settle_time(self, port: int, pin: int) -> float:
+        """Settle time of one relay in seconds."""
+        return self.settle_pins.get(f"{PORTS[port]}{pin}", self.settle)
+
+    def plan(self, old: Words, new: Words) -> List[Tuple[Words, float]]:
+        """
+        Plan the transition from old to new.
+
+        Args:
+            old (tuple): Current (RA, RB, RC) port words.
+            new (tuple): Target port words.
+
+        Returns:
+            list: (port words after the step, seconds to wait for it to
+            settle) per step; the last step's words are new. Empty if
+            nothing changes.
+        """
+        key = (tuple(old), tuple(new))
+        steps = self._cache.get(key)
+        if steps is not None:
+            self._cache.move_to_end(key)
+            return steps
+        steps = self._plan(key[0], key[1])
+        self._cache[key] = steps
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return steps
+
+    def evaluate(self, old: Words, steps: List[Tuple[Words, float]]) -> Dict[str, float]:
+        """
+        Rates a step sequence, e.g. a plan or a single frame [(new, t)].
+
+        Args:
+            old (tuple): Port words before the first step.
+            steps (list): (port words, wait) per step.
+
+        Returns:
+            dict: duration (s, per the timing model), excursion (worst case,
+            fraction of full scale), steps and relay_ops.
+        """
+        if not steps:
+            return {"duration": 0.0, "excursion": 0.0, "steps": 0, "relay_ops": 0}
+        target = steps[-1][0]
+        envelope = self._envelope(old, target)
+        duration = excursion = 0.0
+        relay_ops = 0
+        current = tuple(old)
+        for words, _ in steps:
+            chunk = self._chunk_stats(current, words)
+            duration += self.frame_time + chunk[4]
+            excursion = max(excursion, self._excursion(self._values(current), chunk, envelope))
+            relay_ops += sum(bin(a ^ b).count("1") for a, b in zip(current, words))
+            current = tuple(words)
+        return {"duration": duration, "excursion": excursion,
+                "steps": len(steps), "relay_ops": relay_ops}
+
+    # --- Planning ---
+
+    def _plan(self, old: Words, new: Words) -> List[Tuple[Words, float]]:
+        """Coarse chunks first; finer ones only if those cannot meet max_excursion."""
+        chunks = self._chunks(old, new, split=False)
+        if not chunks:
+            return []
+        overshoot, path = self._shortest_path(old, new, chunks)
+        if overshoot > 0:
+            fine = self._chunks(old, new, split=True)
+            if len(fine) != len(chunks) and len(fine) <= self.MAX_FINE_CHUNKS:
+                fine_overshoot, fine_path = self._shortest_path(old, new, fine)
+                if fine_overshoot < overshoot:
+                    path = fine_path
+        return path
+
+    @staticmethod
+    def _chunks(old: Words, new: Words, split: bool) -> List[Tuple[int, int]]:
+        """
+        (port, pin mask) of the pins switching on and off per port; with
+        split, the most significant pin of each becomes its own chunk, so
+        e.g. a carry from L 63 to 64 can be walked 63 -> 31 -> 95 -> 64.
+        """
+        chunks = []
+        for port in range(3):
+            changed = old[port] ^ new[port]
+            for mask in (changed & new[port], changed & old[port]):   # on, off
+                if not mask:
+                    continue
+                top = 1 << (mask.bit_length() - 1)
+                if split and mask != top:
+                    chunks.append((port, top))
+                    chunks.append((port, mask & ~top))
+                else:
+                    chunks.append((port, mask))
+        return chunks
+
+    def _shortest_path(self, old: Words, new: Words,
+                       chunks: List[Tuple[int, int]]) -> Tuple[float, List[Tuple[Words, float]]]:
+        """Returns (overshoot, steps) of the best step sequence over chunks."""
+        count = len(chunks)
+        full = (1 << count) - 1
+        l_lo, l_hi, c_lo, c_hi = self._envelope(old, new)
+        limit = self.max_excursion
+
+        # Per subset of chunks: port words reached from old, and the step
+        # stats (L on, L off, C on, C off, longest settle) of switching it.
+        # Built incrementally from the subset without its lowest chunk.
+        words: List[Words] = [tuple(old)] * (full + 1)
+        stats: List[Tuple[int, int, int, int, float]] = [(0, 0, 0, 0, 0.0)] * (full + 1)
+        single = [self._chunk_stats(old, self._apply(old, chunk)) for chunk in chunks]
+        for subset in range(1, full + 1):
+            low = subset & -subset
+            i = low.bit_length() - 1
+            rest = subset ^ low
+            w = list(words[rest])
+            w[chunks[i][0]] ^= chunks[i][1]
+            words[subset] = tuple(w)
+            a, b = stats[rest], single[i]
+            stats[subset] = (a[0] + b[0], a[1] + b[1], a[2] + b[2], a[3] + b[3], max(a[4], b[4]))
+        values = [self._values(w) for w in words]
+
+        # best[state] = ((overshoot, duration), previous state); states only
+        # ever gain chunks, so increasing numeric order is a topological one
+        best: List[Optional[Tuple[Tuple[float, float], int]]] = [None] * (full + 1)
+        best[0] = ((0.0, 0.0), -1)
+        for state in range(full):
+            if best[state] is None:
+                continue
+            (overshoot, duration), _ = best[state]
+            l_value, c_value = values[state]
+            remaining = full & ~state
+            step = remaining
+            while step:
+                l_on, l_off, c_on, c_off, settle = stats[step]
+                excursion = max(
+                    max(l_lo - (l_value - l_off), (l_value + l_on) - l_hi, 0) / _FULL_SCALE["L"],
+                    max(c_lo - (c_value - c_off), (c_value + c_on) - c_hi, 0) / _FULL_SCALE["C"])
+                cost = (max(overshoot, excursion - limit, 0.0),
+                        duration + self.frame_time + settle)
+                nxt = state | step
+                if best[nxt] is None or cost < best[nxt][0]:
+                    best[nxt] = (cost, state)
+                step = (step - 1) & remaining
+
+        path = []
+        state = full
+        while state:
+            previous = best[state][1]
+            path.append((words[state], self.frame_time + stats[state ^ previous][4]))
+            state = previous
+        path.reverse()
+        return best[full][0][0], path
+
+    @staticmethod
+    def _apply(words: Words, chunk: Tuple[int, int]) -> Words:
+        """Port words with the pins of chunk toggled."""
+        result = list(words)
+        result[chunk[0]] ^= chunk[1]
+        return tuple(result)
+
+    def _chunk_stats(self, before: Words, after: Words) -> Tuple[int, int, int, int, float]:
+        """Returns (L on, L off, C on, C off, longest settle) for one step."""
+        l_on = l_off = c_on = c_off = 0
+        settle = 0.0
+        for port in range(3):
+            changed = before[port] ^ after[port]
+            pin = 0
+            while changed:
+                if changed & 1:
+                    settle = max(settle, self.settle_time(port, pin))
+                    bank = _PIN_BANKS.get((port, pin))
+                    if bank is not None:
+                        on = after[port] >> pin & 1
+                        if bank[0] == "L":
+                            if on:
+                                l_on += bank[1]
+                            else:
+                                l_off += bank[1]
+                        elif on:
+                            c_on += bank[1]
+                        else:
+                            c_off += bank[1]
+                changed >>= 1
+                pin += 1
+        return l_on, l_off, c_on, c_off, settle
+
+    @staticmethod
+    def _values(words: Words) -> Tuple[int, int]:
+        """(L, C) encoded by port words."""
+        ra, rb, rc = words
+        return (ra & 0x3F) | ((rb & 0x01) << 6), ((rb >> 1) & 0x0F) | ((rc & 0x07) << 5)
+
+    def _envelope(self, old: Words, new: Words) -> Tuple[int, int, int, int]:
+        """(L low, L high, C low, C high) between the two settings."""
+        (l_old, c_old), (l_new, c_new) = self._values(old), self._values(new)
+        return min(l_old, l_new), max(l_old, l_new), min(c_old, c_new), max(c_old, c_new)
+
+    @staticmethod
+    def _excursion(values: Tuple[int, int], stats, envelope) -> float:
+        """Worst-case distance of a step's transient L/C from the envelope (0-1)."""
+        l_value, c_value = values
+        l_on, l_off, c_on, c_off, _ = stats
+        l_lo, l_hi, c_lo, c_hi = envelope
+        out_l = max(l_lo - (l_value - l_off), (l_value + l_on) - l_hi, 0) / _FULL_SCALE["L"]
+        out_c = max(c_lo - (c_value - c_off), (c_value + c_on) - c_hi, 0) / _FULL_SCALE["C"]
+        return max(out_l, out_c)
@@ -25,14 +25,17 @@
 #    available under this license.
 # -----------------------------------------------------------------------------
 
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QLabel, QSlider, QVBoxLayout,
-    QWidget, QListWidget, QCheckBox, QHBoxLayout, QPushButton,
+    QWidget, QTableView, QHeaderView, QAbstractItemView, QCheckBox, QHBoxLayout, QPushButton,
     QSizePolicy, QLineEdit, QMessageBox, QComboBox, QFileDialog,
-    QGroupBox, QTabWidget, QSpinBox, QButtonGroup
+    QGroupBox, QTabWidget, QSpinBox, QDoubleSpinBox, QButtonGroup, QDialog, QPlainTextEdit
+)
+from PyQt6.QtCore import (
+    Qt, QTimer, QThread, QEvent, QObject, QAbstractListModel, QAbstractTableModel,
+    QSortFilterProxyModel, QModelIndex, pyqtSignal
 )
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt6.QtGui import QIntValidator
 from backend.services.trx_service import TRXService
 from backend.services.tuner_service import TunerService
@@ -40,9 +43,20 @@ from backend.services.settings_service import SettingsService
 from backend.services.impl.trx_service_impl import TRXServiceImpl
 from backend.services.impl.tuner_service_impl import TunerServiceImpl
 from backend.services.impl.settings_service_impl import SettingsServiceImpl
+from backend.services.event_bus import EventBus
+from backend.services.cat_poller import CatPoller
+from backend.services.auto_tune_engine import AutoTuneEngine
+from backend.services.auto_search import AutoSearch
+from backend.services.tuner_sender import TunerSender
+from backend.utils.poll_scheduler import AdaptivePollScheduler
+from backend.utils.transition_planner import TransitionPlanner
+from backend.utils.latency import tracer
+from backend.utils.network import HttpPortReadback
+from backend.utils.rig_catalogue import RigCatalogue, catalogue
+from backend.utils.startup_profile import profiler
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
-import Hamlib
-from backend.trx import TRX
 from backend.utils.sbc65ec import SBC65EC
 
 
@@ -227,16 +241,24 @@ QCheckBox::indicator:checked {{
     background-color: {_ACCENT};
     border-color: {_ACCENT};
 }}
-QListWidget {{
+QTableView {{
     background-color: {_BG3};
     color: {_TX};
     border: 1px solid {_BORDER};
     border-radius: 6px;
+    gridline-color: {_BORDER};
 }}
-QListWidget::item:selected {{
+QTableView::item:selected {{
     background-color: {_rgba(_ACCENT, 0.30)};
     color: {_TX_BRIGHT};
 }}
+QHeaderView::section {{
+    background-color: {_BG2};
+    color: {_TX_MUTED};
+    border: none;
+    border-bottom: 1px solid {_BORDER};
+    padding: 3px 6px;
+}}
 QSlider::groove:horizontal {{
     height: 6px;
     background: {_BG3};
@@ -336,6 +358,431 @@ class HeartbeatThread(QThread):
         self.wait()
 
 
+# --- CAT Poller Thread ---
+class CatPollerThread(QThread):
+    """
+    Thread that owns the TRX connection and polls its frequency.
+
+    Runs a backend CatPoller and republishes its results on the EventBus
+    (frequency_changed / trx_status_changed), so the GUI thread never
+    blocks on Hamlib - a slow serial rig or stalled rigctld only delays
+    the next signal.
+
+    Attributes:
+        poller (CatPoller): The backend polling loop.
+        connect_finished (pyqtSignal): Emitted with the result of a connect request.
+    """
+
+    connect_finished = pyqtSignal(bool)
+
+    def __init__(self, trx: TRXService, event_bus: EventBus, interval: float = 0.5,
+                 scheduler: Optional[AdaptivePollScheduler] = None):
+        """
+        Initialize CatPollerThread.
+
+        Args:
+            trx (TRXService): TRX service; only this thread may use it afterwards.
+            event_bus (EventBus): Bus to publish frequency/status changes on.
+            interval (float, optional): Slowest poll interval in seconds. Defaults to 0.5.
+            scheduler (AdaptivePollScheduler, optional): Adaptive poll-rate
+                scheduler; overrides interval.
+        """
+        super().__init__()
+        self.poller = CatPoller(
+            trx, interval=interval,
+            on_frequency=event_bus.frequency_changed.emit,
+            on_status=event_bus.trx_status_changed.emit,
+            on_connect_result=self.connect_finished.emit,
+            scheduler=scheduler,
+        )
+
+    def run(self):
+        """
+        Main loop of the poller thread.
+        """
+        self.poller.run()
+
+    def stop(self):
+        """
+        Stop the poller thread safely (closes the TRX connection).
+        """
+        self.poller.stop()
+        self.wait()
+
+
+# --- Auto search thread ---
+class AutoSearchThread(QThread):
+    """
+    Thread running an SWR-feedback AutoSearch.
+
+    Tuner values are sent directly; SWR readings are submitted to the CAT
+    poller, which stays the only thread talking to the rig.
+
+    Attributes:
+        search (AutoSearch): The search being run.
+        progress (pyqtSignal): Emitted with (L, C, highpass, swr) of the best setting so far.
+        result_ready (pyqtSignal): Emitted with the result dict of AutoSearch.run().
+        failed (pyqtSignal): Emitted with an error message.
+    """
+
+    progress = pyqtSignal(int, int, bool, float)
+    result_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, tuner: TunerService, poller: CatPoller, read_timeout: float = 2.0):
+        """
+        Initialize AutoSearchThread.
+
+        Args:
+            tuner (TunerService): Tuner to drive.
+            poller (CatPoller): Poller owning the TRX connection.
+            read_timeout (float, optional): Seconds to wait for one SWR reading.
+        """
+        super().__init__()
+        self._poller = poller
+        self._read_timeout = read_timeout
+        self.search = AutoSearch(tuner, self._read_swr)
+
+    def _read_swr(self) -> Optional[float]:
+        return self._poller.submit(lambda trx: trx.get_swr()).result(self._read_timeout)
+
+    def run(self):
+        """
+        Runs the search and emits its outcome.
+        """
+        try:
+            result = self.search.run(
+                lambda point, swr, best, best_swr: self.progress.emit(*best, best_swr))
+        except Exception as e:
+            self.failed.emit(str(e) or type(e).__name__)
+            return
+        self.result_ready.emit(result)
+
+    def stop(self):
+        """
+        Stop the search after the current measurement.
+        """
+        self.search.stop()
+        self.wait()
+
+
+# --- Rig model list ---
+class RigModelListModel(QAbstractListModel):
+    """
+    Filterable list model of the Hamlib rig models for the TRX combo box.
+
+    The catalogue is only read when a view first asks for rows, and rows
+    are handed out in batches through canFetchMore()/fetchMore(), so only
+    what the popup actually scrolls into view is materialised. Display text
+    is "NAME (id)", the rig ID is exposed as UserRole (currentData()).
+    """
+
+    BATCH = 50
+
+    def __init__(self, rig_catalogue: RigCatalogue, parent=None):
+        """
+        Initialize the model.
+
+        Args:
+            rig_catalogue (RigCatalogue): Source of the rig models.
+            parent (QObject, optional): Qt parent.
+        """
+        super().__init__(parent)
+        self._catalogue = rig_catalogue
+        self._filter = ""
+        self._rows: Optional[List[Tuple[str, int]]] = None  # rows matching the filter
+        self._fetched = 0
+
+    def _matching(self) -> List[Tuple[str, int]]:
+        """Rows matching the current filter (loads the catalogue on first use)."""
+        if self._rows is None:
+            needle = self._filter
+            self._rows = [model for model in self._catalogue.models()
+                          if not needle or needle in f"{model[0]} ({model[1]})".lower()]
+        return self._rows
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._fetched
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._fetched < len(self._matching())
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        self._fetch_to(self._fetched + self.BATCH - 1)
+
+    def _fetch_to(self, row: int) -> None:
+        """Materialises all rows up to and including row."""
+        last = min(row, len(self._matching()) - 1)
+        if last < self._fetched:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, last)
+        self._fetched = last + 1
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._fetched:
+            return None
+        name, rig_id = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{name} ({rig_id})"
+        if role == Qt.ItemDataRole.UserRole:
+            return rig_id
+        return None
+
+    def set_filter(self, text: str) -> None:
+        """
+        Show only models whose "NAME (id)" contains text (case-insensitive).
+        """
+        self.beginResetModel()
+        self._filter = text.strip().lower()
+        self._rows = None
+        self._fetched = 0
+        self.endResetModel()
+
+    def row_of(self, rig_id: Optional[int]) -> int:
+        """
+        Returns the row of rig_id, materialising rows up to it; -1 if not
+        in the (filtered) list.
+        """
+        for row, (_, model_id) in enumerate(self._matching()):
+            if model_id == rig_id:
+                self._fetch_to(row)
+                return row
+        return -1
+
+
+# --- Frequency table ---
+class FrequencyTableModel(QAbstractTableModel):
+    """
+    Table model over the saved frequency entries of the settings service.
+
+    Rows are the entries in storage order, so a source row is also the
+    index delete_entry() expects. Cells are formatted in data() as the view
+    asks for them, and edits made through add_entry()/remove_entry() emit
+    single-row insert/remove notifications instead of a reset, so the UI
+    work per edit does not grow with the table. UserRole returns the raw
+    value of a cell for sorting.
+    """
+
+    HEADERS = ("Min (Hz)", "Max (Hz)", "L", "C", "HP")
+    KEYS = ("min_freq", "max_freq", "L", "C", "highpass")
+
+    def __init__(self, settings_service: SettingsService, parent=None):
+        """
+        Initialize the model.
+
+        Args:
+            settings_service (SettingsService): Store holding the entries.
+            parent (QObject, optional): Qt parent.
+        """
+        super().__init__(parent)
+        self._settings = settings_service
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._settings.get_entries())
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.KEYS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self.entry(index.row())[self.KEYS[index.column()]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.column() == 4:
+                return "on" if value else "off"
+            return str(value)
+        if role == Qt.ItemDataRole.UserRole:
+            return value
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() < 4:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def entry(self, row: int) -> Dict:
+        """
+        Returns the settings entry shown in source row.
+        """
+        return self._settings.get_entries()[row]
+
+    def add_entry(self, min_freq: float, max_freq: float, L: float, C: float, highpass: bool) -> None:
+        """
+        Append an entry to the settings service as one inserted row.
+        """
+        row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._settings.add_entry(min_freq, max_freq, L, C, highpass)
+        self.endInsertRows()
+
+    def remove_entry(self, row: int) -> None:
+        """
+        Delete the entry at source row as one removed row.
+        """
+        if 0 <= row < self.rowCount():
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._settings.delete_entry(row)
+            self.endRemoveRows()
+
+    def reload(self) -> None:
+        """
+        Reset the model after the entries were replaced wholesale (JSON load).
+        """
+        self.beginResetModel()
+        self.endResetModel()
+
+
+class FrequencyFilterProxy(QSortFilterProxyModel):
+    """
+    Sorts the frequency table by the raw cell values and filters it down to
+    the entries whose range contains a frequency.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._freq: Optional[int] = None
+        self.setSortRole(Qt.ItemDataRole.UserRole)
+
+    def set_frequency(self, freq: Optional[int]) -> None:
+        """
+        Show only entries covering freq; None shows all.
+        """
+        if freq != self._freq:
+            self._freq = freq
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._freq is None:
+            return True
+        entry = self.sourceModel().entry(source_row)
+        return entry["min_freq"] <= self._freq <= entry["max_freq"]
+
+
+# --- Startup profiling ---
+class FirstFrameProbe(QObject):
+    """
+    Application-wide event filter that closes the startup profile at the
+    first paint event and prints the report to stderr.
+    """
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            QApplication.instance().removeEventFilter(self)
+            profiler.mark("first frame")
+            profiler.report()
+        return False
+
+
+# --- Latency debug panel ---
+class LatencyPanel(QDialog):
+    """
+    Debug window showing the rolling per-stage latencies of the auto-tune
+    path (CAT read, lookup, encode, send, end-to-end) from the backend
+    tracer, refreshed once per second while open, plus the auto-tune
+    segment switch and tuner send counters.
+
+    Attributes:
+        record_checkbox (QCheckBox): Enables/disables the tracepoints.
+        stats_view (QPlainTextEdit): p50/p95/p99/max table.
+        refresh_timer (QTimer): Refreshes stats_view while visible.
+    """
+
+    def __init__(self, parent: Optional[QWidget] = None, engine: Optional[AutoTuneEngine] = None,
+                 sender: Optional[TunerSender] = None):
+        """
+        Initialize LatencyPanel.
+
+        Args:
+            parent (QWidget, optional): Parent window.
+            engine (AutoTuneEngine, optional): Source of the switch counters.
+            sender (TunerSender, optional): Source of the send counters.
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Tune latency")
+        self.engine = engine
+        self.sender = sender
+
+        self.record_checkbox: QCheckBox = QCheckBox("Record")
+        self.record_checkbox.setChecked(tracer.enabled)
+        self.record_checkbox.setToolTip("Timestamp every stage of the VFO → tuner path (small overhead).")
+        self.record_checkbox.toggled.connect(self._set_recording)
+        reset_button = QPushButton("Reset")
+        reset_button.setObjectName("secondaryButton")
+        reset_button.clicked.connect(self._reset)
+        dump_button = QPushButton("Dump to file...")
+        dump_button.setObjectName("secondaryButton")
+        dump_button.clicked.connect(self._dump)
+
+        self.stats_view: QPlainTextEdit = QPlainTextEdit()
+        self.stats_view.setReadOnly(True)
+        self.stats_view.setStyleSheet(f"font-family: {_MONO};")
+        self.stats_view.setMinimumSize(520, 160)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.record_checkbox)
+        button_layout.addStretch(1)
+        button_layout.addWidget(reset_button)
+        button_layout.addWidget(dump_button)
+        layout = QVBoxLayout()
+        layout.addLayout(button_layout)
+        layout.addWidget(self.stats_view)
+        self.setLayout(layout)
+
+        self.refresh_timer: QTimer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        """
+        Start refreshing when the panel is shown.
+        """
+        self.refresh()
+        self.refresh_timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """
+        Stop refreshing when the panel is hidden.
+        """
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """
+        Redraw the statistics table.
+        """
+        text = tracer.format()
+        if self.engine is not None:
+            text += "\n\n" + self.engine.format_stats()
+        if self.sender is not None:
+            text += "\n" + self.sender.format_stats()
+            verify = self.sender.tuner.get_verify_stats()
+            if any(verify.values()):
+                text += "\nReadback: " + ", ".join(f"{key} {value}" for key, value in verify.items())
+        self.stats_view.setPlainText(text)
+
+    def _set_recording(self, enabled: bool):
+        tracer.enabled = enabled
+        if not enabled:
+            tracer.disarm()
+
+    def _reset(self):
+        tracer.reset()
+        self.refresh()
+
+    def _dump(self):
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Dump latency statistics", "latency.json", "JSON Files (*.json)"
+        )
+        if filename:
+            try:
+                tracer.dump(filename)
+            except OSError as e:
+                QMessageBox.warning(self, "Error", f"Could not write {filename}: {e}")
+
+
 # --- Main Window ---
 class MainWindow(QMainWindow):
     """
@@ -345,24 +792,38 @@ class MainWindow(QMainWindow):
     setup mode, and user interactions for saving/deleting frequency settings.
     """
 
+    SEARCH_HALF_SPAN = 5000  # Hz on each side of the VFO for an auto-searched entry
+
     def __init__(self):
         """
         Initialize the main window, UI components, backend objects,
         signals, timers, and load saved settings.
         """
         super().__init__()
+        profiler.mark("window: QMainWindow")
         self.setWindowTitle("Christian-Koppler Network Control")
         self.setStyleSheet(APP_STYLESHEET)
+        profiler.mark("window: stylesheet")
 
-        # --- Backend services ---
-        self.trx_service: TRXService = TRXServiceImpl()
-        self.tuner_service: TunerService = TunerServiceImpl()
-        self.settings_service: SettingsService = SettingsServiceImpl()
+        # --- Backend services, loaded concurrently ---
+        # The settings file (snapshot + journal replay) is read on a worker
+        # thread while the status widgets are built below, and the rig
+        # catalogue for the TRX model combo is warmed in the background.
+        loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="settings-load")
+        settings_future = loader.submit(SettingsServiceImpl)
+        loader.shutdown(wait=False)
+        threading.Thread(target=catalogue.models, name="rig-catalogue", daemon=True).start()
 
         # --- Mode ---
         self.setup_mode: bool = True
-        self._active_entry: Optional[dict] = None
         self.connected_once: bool = False
+        self._trx_connected: bool = False
+        self._trx_close_requested: bool = False
+        self._pending_trx_config: Optional[tuple] = None
+        self._advanced_built: bool = False
+        self.advanced_widget: Optional[QWidget] = None
+        self.search_thread: Optional[AutoSearchThread] = None
+        self._pre_search: Optional[tuple] = None   # (L, C, HP) before the running search
 
         # --- Status Widgets ---
         self.trx_status: QLabel = QLabel("TRX: ❌ not connected")
@@ -377,11 +838,145 @@ class MainWindow(QMainWindow):
         self.blink_timer: QTimer = QTimer()
         self.blink_timer.timeout.connect(self._toggle_blink)
 
+        # --- Toggle button for view ---
+        self.toggle_button_view: QPushButton = QPushButton("Reduce view")
+        self.toggle_button_view.setObjectName("secondaryButton")
+        self.toggle_button_view.setCheckable(True)
+        self.toggle_button_view.setChecked(True)
+        self.toggle_button_view.clicked.connect(self.toggle_view)
+
+        # --- Status container ---
+        status_widget = QWidget()
+        status_layout = QVBoxLayout()
+        status_layout.setSpacing(6)
+        status_layout.setContentsMargins(0, 0, 0, 0)
+
+        status_row = QHBoxLayout()
+        status_row.addWidget(self.trx_status)
+        status_row.addWidget(self.tuner_status)
+        status_layout.addLayout(status_row)
+        status_layout.addWidget(self.freq_label)
+        status_widget.setLayout(status_layout)
+        # Keep this whole block at its natural content height regardless of
+        # how much extra vertical space toggle_view()'s reduced/expanded
+        # window sizes leave for it - otherwise the QVBoxLayout stretches
+        # these status pills taller/shorter between the two states.
+        status_widget.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
+
+        # --- Main layout ---
+        layout = QVBoxLayout()
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(8)
+        layout.addWidget(status_widget)
+        layout.addWidget(self.toggle_button_view)
+        self._main_layout: QVBoxLayout = layout
+        container = QWidget()
+        container.setLayout(layout)
+        self.setCentralWidget(container)
+        profiler.mark("window: status widgets")
+
+        # --- Backend services ---
+        self.settings_service: SettingsService = settings_future.result()
+        if self.settings_service.read_only:
+            # Another instance owns the file; say so once the window is up
+            QTimer.singleShot(0, lambda: QMessageBox.warning(
+                self, "Settings",
+                f"{self.settings_service.filename} is in use by another ck-netctrl instance.\n"
+                "Changes made here will not be saved."))
+        self.trx_service: TRXService = TRXServiceImpl(
+            push_address=self.settings_service.trx_push_address
+        )
+        self.tuner_service: TunerService = TunerServiceImpl(
+            full_refresh_interval=self.settings_service.sbc_full_refresh_interval,
+            probe_port=self.settings_service.sbc_probe_port,
+            planner=TransitionPlanner(
+                settle=self.settings_service.sbc_relay_settle,
+                settle_pins=self.settings_service.sbc_relay_settle_pins,
+                max_excursion=self.settings_service.sbc_max_excursion,
+            ) if self.settings_service.sbc_max_excursion is not None else None,
+            readback=HttpPortReadback(
+                self.settings_service.sbc_ip, self.settings_service.sbc_probe_port,
+                self.settings_service.sbc_readback_path
+            ) if self.settings_service.sbc_readback_path else None,
+            readback_deadline=self.settings_service.sbc_readback_deadline
+        )
+        self.event_bus: EventBus = EventBus()
+        # All tuner sends go through one worker thread, newest values first
+        self.tuner_sender: TunerSender = TunerSender(
+            self.tuner_service, max_rate=self.settings_service.sbc_max_frame_rate,
+            refresh_interval=self.settings_service.sbc_state_refresh_interval
+        ).start()
+        self.auto_tune: AutoTuneEngine = AutoTuneEngine(
+            self.settings_service, self.tuner_service, sender=self.tuner_sender
+        )
+        # Re-runs update_status when a switch held back by the band-edge
+        # hysteresis becomes due without a new frequency arriving
+        self.recheck_timer: QTimer = QTimer(self)
+        self.recheck_timer.setSingleShot(True)
+        self.recheck_timer.timeout.connect(self.update_status)
+        profiler.mark("window: services")
+
+        # --- Heartbeat thread ---
+        self.heartbeat_thread: HeartbeatThread = HeartbeatThread(self.tuner_service)
+        self.heartbeat_thread.update_signal.connect(self.update_tuner_status)
+        self._tuner_reachable: Optional[bool] = None
+
+        # --- CAT poller thread ---
+        # Owns the rig from here on: all Hamlib access goes through it, and
+        # the GUI only reacts to the EventBus signals it publishes.
+        # Polls fast right after a VFO change and backs off while it is
+        # parked (further still while the window is minimised).
+        self.cat_poller: CatPollerThread = CatPollerThread(
+            self.trx_service, self.event_bus,
+            scheduler=AdaptivePollScheduler(
+                fast_interval=self.settings_service.trx_poll_fast_interval,
+                slow_interval=self.settings_service.trx_poll_interval,
+                idle_interval=self.settings_service.trx_poll_idle_interval,
+            )
+        )
+        self.cat_poller.connect_finished.connect(self._on_trx_connect_finished)
+        self.event_bus.frequency_changed.connect(self._on_frequency_changed)
+        self.event_bus.trx_status_changed.connect(self._on_trx_status_changed)
+        self.cat_poller.start()
+        profiler.mark("window: worker threads")
+
+        # --- Initial view & mode ---
+        # The advanced section is only built once it is first shown, so a
+        # window that starts in reduced view never pays for it.
+        expanded = bool(self.settings_service.gui_expanded)
+        self.toggle_button_view.setChecked(expanded)
+        self.toggle_button_view.setText("Reduce view" if expanded else "Expand view")
+        if expanded:
+            self._build_advanced()
+        self._apply_mode_settings()
+        self.update_status()
+
+        # Lock the status pills to their natural (styled) height once, after
+        # the first real style/content pass above, so toggling reduced/
+        # expanded view can never stretch or squeeze them.
+        for status_label in (self.trx_status, self.tuner_status, self.freq_label):
+            status_label.setFixedHeight(status_label.sizeHint().height())
+        self.resize(640, 600 if expanded else self.sizeHint().height())
+        profiler.mark("window: initial state")
+
+    def _build_advanced(self):
+        """
+        Build the advanced section - TRX/SBC connection settings, tuner
+        controls, frequency table and setup/active switch - and add it
+        below the view toggle. Runs once, on the first expand.
+        """
         # --- TRX dropdown + input ---
+        # Rows come from the cached rig catalogue and are only materialised
+        # as the popup scrolls; Hamlib itself is not imported until connect.
+        self.trx_model_list: RigModelListModel = RigModelListModel(catalogue, self)
         self.trx_combo: QComboBox = QComboBox()
-        for rig_name, rig_id in sorted(TRX.list_available_rigs(), key=lambda x: x[0]):
-            display_text = f"{rig_name} ({rig_id})"
-            self.trx_combo.addItem(display_text, rig_id)
+        self.trx_combo.setModel(self.trx_model_list)
+        self.trx_combo.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        self.trx_combo.setMinimumContentsLength(24)
+        self.trx_model_filter: QLineEdit = QLineEdit()
+        self.trx_model_filter.setPlaceholderText("Filter models")
+        self.trx_model_filter.setClearButtonEnabled(True)
+        self.trx_model_filter.textChanged.connect(self._on_trx_model_filter_changed)
 
         # --- Connection type: serial CAT vs. network (netrigctl/rigctld) ---
         # This is the single source of truth for how the port field and the
@@ -434,7 +1029,8 @@ class MainWindow(QMainWindow):
         model_row_layout = QHBoxLayout()
         model_row_layout.setContentsMargins(0, 0, 0, 0)
         model_row_layout.addWidget(QLabel("TRX model:"))
-        model_row_layout.addWidget(self.trx_combo)
+        model_row_layout.addWidget(self.trx_combo, 2)
+        model_row_layout.addWidget(self.trx_model_filter, 1)
         self.trx_model_row.setLayout(model_row_layout)
 
         # Row: port / host:port - always shown, label text adapts to mode
@@ -467,13 +1063,6 @@ class MainWindow(QMainWindow):
         trx_group_layout.addLayout(trx_button_layout)
         trx_group.setLayout(trx_group_layout)
 
-        # --- Toggle button for view ---
-        self.toggle_button_view: QPushButton = QPushButton("Reduce view")
-        self.toggle_button_view.setObjectName("secondaryButton")
-        self.toggle_button_view.setCheckable(True)
-        self.toggle_button_view.setChecked(True)
-        self.toggle_button_view.clicked.connect(self.toggle_view)
-
         # --- Sliders / controls ---
         self.L_slider: QSlider = QSlider(Qt.Orientation.Horizontal)
         self.L_slider.setRange(0, 127)
@@ -481,11 +1070,70 @@ class MainWindow(QMainWindow):
         self.C_slider.setRange(0, 255)
         self.HP_checkbox: QCheckBox = QCheckBox("High-pass")
         self.save_button: QPushButton = QPushButton("Save current values")
+        self.search_button: QPushButton = QPushButton("Auto search")
+        self.search_button.setObjectName("secondaryButton")
+        self.search_button.setToolTip("Find L/C/HP with the lowest SWR - key a low-power carrier first")
         self.delete_button: QPushButton = QPushButton("Delete selected value")
         self.delete_button.setObjectName("secondaryButton")
         self.load_json_button: QPushButton = QPushButton("Load values from JSON")
         self.load_json_button.setObjectName("secondaryButton")
-        self.freq_list: QListWidget = QListWidget()
+        self.freq_model: FrequencyTableModel = FrequencyTableModel(self.settings_service, self)
+        self.freq_proxy: FrequencyFilterProxy = FrequencyFilterProxy(self)
+        self.freq_proxy.setSourceModel(self.freq_model)
+        self.freq_filter: QLineEdit = QLineEdit()
+        self.freq_filter.setPlaceholderText("Filter by frequency (Hz)")
+        self.freq_filter.setValidator(QIntValidator(0, 2_000_000_000))
+        self.freq_filter.setClearButtonEnabled(True)
+        self.freq_filter.textChanged.connect(self._on_freq_filter_changed)
+        self.freq_table: QTableView = QTableView()
+        self.freq_table.setModel(self.freq_proxy)
+        self.freq_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.freq_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.freq_table.setShowGrid(False)
+        # Fixed row heights and stretched columns: the view never has to
+        # measure the contents of every row, which keeps large tables fast
+        self.freq_table.verticalHeader().setVisible(False)
+        self.freq_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.freq_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.freq_table.setSortingEnabled(True)
+        self.freq_table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+
+        # --- Gap filling between saved ranges ---
+        self.interp_mode_combo: QComboBox = QComboBox()
+        self.interp_mode_combo.addItem("Gaps: no values", "off")
+        self.interp_mode_combo.addItem("Gaps: nearest range", "nearest")
+        self.interp_mode_combo.addItem("Gaps: interpolate", "linear")
+        self.interp_distance_input: QSpinBox = QSpinBox()
+        self.interp_distance_input.setRange(0, 1000)
+        self.interp_distance_input.setSuffix(" kHz")
+        self.interp_distance_input.setToolTip("Max distance of a derived value from a saved range")
+
+        # --- Band-edge hysteresis ---
+        self.hysteresis_margin_input: QSpinBox = QSpinBox()
+        self.hysteresis_margin_input.setRange(0, 100000)
+        self.hysteresis_margin_input.setSingleStep(10)
+        self.hysteresis_margin_input.setSuffix(" Hz")
+        self.hysteresis_margin_input.setToolTip("Distance beyond a range edge before switching to the next range")
+        self.hysteresis_hold_input: QDoubleSpinBox = QDoubleSpinBox()
+        self.hysteresis_hold_input.setRange(0.0, 60.0)
+        self.hysteresis_hold_input.setSingleStep(0.5)
+        self.hysteresis_hold_input.setDecimals(1)
+        self.hysteresis_hold_input.setSuffix(" s")
+        self.hysteresis_hold_input.setSpecialValueText("off")
+        self.hysteresis_hold_input.setToolTip("Switch anyway once the VFO has stayed within the margin this long")
+
+        # --- Motion gate: hold switching while the VFO knob spins ---
+        self.motion_speed_input: QSpinBox = QSpinBox()
+        self.motion_speed_input.setRange(0, 1000)
+        self.motion_speed_input.setSuffix(" kHz/s")
+        self.motion_speed_input.setSpecialValueText("off")
+        self.motion_speed_input.setToolTip("Hold range switching while the VFO moves at least this fast")
+        self.motion_max_hold_input: QDoubleSpinBox = QDoubleSpinBox()
+        self.motion_max_hold_input.setRange(0.0, 10.0)
+        self.motion_max_hold_input.setSingleStep(0.5)
+        self.motion_max_hold_input.setDecimals(1)
+        self.motion_max_hold_input.setSuffix(" s")
+        self.motion_max_hold_input.setToolTip("Switch anyway after holding this long")
 
         # --- Setup mode switch ---
         # A two-position segmented switch instead of a checkbox whose label
@@ -561,12 +1209,23 @@ class MainWindow(QMainWindow):
         sbc_group_layout.addLayout(sbc_layout)
         sbc_group.setLayout(sbc_group_layout)
 
+        # --- Latency debug panel (created on first use) ---
+        self.latency_panel: Optional[LatencyPanel] = None
+        self.latency_button: QPushButton = QPushButton("Latency...")
+        self.latency_button.setObjectName("secondaryButton")
+        self.latency_button.setToolTip("Show where time is spent between a VFO change and the tuner frame.")
+        self.latency_button.clicked.connect(self.show_latency_panel)
+        debug_layout = QHBoxLayout()
+        debug_layout.addStretch(1)
+        debug_layout.addWidget(self.latency_button)
+
         # --- Tab: Connections ---
         connections_tab = QWidget()
         connections_layout = QVBoxLayout()
         connections_layout.addWidget(trx_group)
         connections_layout.addWidget(sbc_group)
         connections_layout.addStretch(1)
+        connections_layout.addLayout(debug_layout)
         connections_tab.setLayout(connections_layout)
 
         # --- Tab: Tuner Presets ---
@@ -598,6 +1257,7 @@ class MainWindow(QMainWindow):
         tuning_layout.addWidget(self.HP_checkbox)
 
         save_layout = QHBoxLayout()
+        save_layout.addWidget(self.search_button)
         save_layout.addStretch(1)
         save_layout.addWidget(self.save_button)
         tuning_layout.addLayout(save_layout)
@@ -611,14 +1271,32 @@ class MainWindow(QMainWindow):
         list_button_layout.addWidget(self.delete_button)
         list_button_layout.addWidget(self.load_json_button)
         list_layout.addLayout(list_button_layout)
-        list_layout.addWidget(self.freq_list)
+        list_layout.addWidget(self.freq_filter)
+        list_layout.addWidget(self.freq_table)
+        interp_layout = QHBoxLayout()
+        interp_layout.addWidget(self.interp_mode_combo, 1)
+        interp_layout.addWidget(QLabel("within"))
+        interp_layout.addWidget(self.interp_distance_input)
+        list_layout.addLayout(interp_layout)
+        hysteresis_layout = QHBoxLayout()
+        hysteresis_layout.addWidget(QLabel("Edge hysteresis"), 1)
+        hysteresis_layout.addWidget(self.hysteresis_margin_input)
+        hysteresis_layout.addWidget(QLabel("or after"))
+        hysteresis_layout.addWidget(self.hysteresis_hold_input)
+        list_layout.addLayout(hysteresis_layout)
+        motion_layout = QHBoxLayout()
+        motion_layout.addWidget(QLabel("Hold while tuning faster than"), 1)
+        motion_layout.addWidget(self.motion_speed_input)
+        motion_layout.addWidget(QLabel("max."))
+        motion_layout.addWidget(self.motion_max_hold_input)
+        list_layout.addLayout(motion_layout)
         list_group.setLayout(list_layout)
         presets_layout.addWidget(list_group)
 
         presets_tab.setLayout(presets_layout)
 
         # --- Advanced view (collapsible via toggle_button_view) ---
-        self.advanced_widget: QWidget = QWidget()
+        self.advanced_widget = QWidget()
         adv_layout = QVBoxLayout()
         adv_layout.setSpacing(8)
         adv_layout.addWidget(self.setup_mode_switch)
@@ -631,69 +1309,26 @@ class MainWindow(QMainWindow):
         self.advanced_widget.setLayout(adv_layout)
         self.advanced_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
 
-        # --- Status container ---
-        status_widget = QWidget()
-        status_layout = QVBoxLayout()
-        status_layout.setSpacing(6)
-        status_layout.setContentsMargins(0, 0, 0, 0)
-
-        status_row = QHBoxLayout()
-        status_row.addWidget(self.trx_status)
-        status_row.addWidget(self.tuner_status)
-        status_layout.addLayout(status_row)
-        status_layout.addWidget(self.freq_label)
-        status_widget.setLayout(status_layout)
-        # Keep this whole block at its natural content height regardless of
-        # how much extra vertical space toggle_view()'s reduced/expanded
-        # window sizes leave for it - otherwise the QVBoxLayout stretches
-        # these status pills taller/shorter between the two states.
-        status_widget.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
-
-        # --- Main layout ---
-        layout = QVBoxLayout()
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(8)
-        layout.addWidget(status_widget)
-        layout.addWidget(self.toggle_button_view)
-        layout.addWidget(self.advanced_widget)
-        container = QWidget()
-        container.setLayout(layout)
-        self.setCentralWidget(container)
-
-        # --- Debounce for sliders ---
-        self.debounce_timer: QTimer = QTimer()
-        self.debounce_timer.setSingleShot(True)
-        self.debounce_timer.timeout.connect(self._send_tuner_values)
-
-        # --- Heartbeat thread ---
-        self.heartbeat_thread: HeartbeatThread = HeartbeatThread(self.tuner_service)
-        self.heartbeat_thread.update_signal.connect(self.update_tuner_status)
-
         # --- Signals ---
         self.L_slider.valueChanged.connect(self.schedule_update)
         self.C_slider.valueChanged.connect(self.schedule_update)
         self.HP_checkbox.stateChanged.connect(self.schedule_update)
         self.save_button.clicked.connect(self.save_current)
+        self.search_button.clicked.connect(self.toggle_auto_search)
         self.delete_button.clicked.connect(self.delete_selected)
         self.load_json_button.clicked.connect(self.load_from_json)
 
-        # --- Status timer ---
-        self.status_timer: QTimer = QTimer()
-        self.status_timer.timeout.connect(self.update_status)
-        self.status_timer.start(500)
-
-        # --- Initial mode & saved settings ---
-        self._apply_mode_settings()
-        self.load_list()
+        self._main_layout.addWidget(self.advanced_widget)
+        self._advanced_built = True
         self.load_saved_meta()
-        self.update_status()
-
-        # Lock the status pills to their natural (styled) height once, after
-        # the first real style/content pass above, so toggling reduced/
-        # expanded view can never stretch or squeeze them.
-        for status_label in (self.trx_status, self.tuner_status, self.freq_label):
-            status_label.setFixedHeight(status_label.sizeHint().height())
-        self.resize(640, 600)
+        # Connected after the saved values are in place
+        self.interp_mode_combo.currentIndexChanged.connect(self._on_interp_changed)
+        self.interp_distance_input.valueChanged.connect(self._on_interp_changed)
+        self.hysteresis_margin_input.valueChanged.connect(self._on_hysteresis_changed)
+        self.hysteresis_hold_input.valueChanged.connect(self._on_hysteresis_changed)
+        self.motion_speed_input.valueChanged.connect(self._on_hysteresis_changed)
+        self.motion_max_hold_input.valueChanged.connect(self._on_hysteresis_changed)
+        profiler.mark("window: advanced section")
 
     # --- TRX connection ---
     def _on_trx_conn_type_changed(self):
@@ -713,20 +1348,51 @@ class MainWindow(QMainWindow):
         self.trx_serial_extra_row.setVisible(not is_network)
 
         if is_network:
-            idx = self.trx_combo.findData(Hamlib.RIG_MODEL_NETRIGCTL)
-            if idx >= 0:
-                self.trx_combo.setCurrentIndex(idx)
+            self._select_rig_model(catalogue.model_id("NETRIGCTL"))
             self.trx_port_label.setText("Host:Port:")
             self.trx_port_input.setPlaceholderText("host:port, e.g. localhost:4532")
         else:
             self.trx_port_label.setText("Port:")
             self.trx_port_input.setPlaceholderText("COM port, e.g. COM3")
 
+    def _select_rig_model(self, rig_id: Optional[int]) -> bool:
+        """
+        Select rig_id in the TRX model combo, clearing the model filter if
+        it hides that model.
+
+        Returns:
+            bool: False if the model is not in the catalogue.
+        """
+        if rig_id is None:
+            return False
+        row = self.trx_model_list.row_of(rig_id)
+        if row < 0 and self.trx_model_filter.text():
+            self.trx_model_filter.clear()
+            row = self.trx_model_list.row_of(rig_id)
+        if row >= 0:
+            self.trx_combo.setCurrentIndex(row)
+        return row >= 0
+
+    def _on_trx_model_filter_changed(self, text: str):
+        """
+        Narrow the TRX model combo to matching models, keeping the current
+        selection if it still matches.
+        """
+        rig_id = self.trx_combo.currentData()
+        self.trx_model_list.set_filter(text)
+        if self.trx_model_list.row_of(rig_id) >= 0:
+            self.trx_combo.setCurrentIndex(self.trx_model_list.row_of(rig_id))
+        elif self.trx_model_list.canFetchMore():
+            self.trx_model_list.fetchMore()
+            self.trx_combo.setCurrentIndex(0)
+
     def connect_trx(self):
         """
         Connect to the selected TRX device using the selected model and port.
-        Updates TRX status; the periodic status_timer (update_status) then
-        picks up frequency and connection-liveness in a single poll.
+
+        The connect itself runs on the CAT poller thread; the result arrives
+        via _on_trx_connect_finished(), after which the poller publishes
+        frequency and connection-liveness changes on the EventBus.
         """
         rig_id = self.trx_combo.currentData()
         port = self.trx_port_input.text().strip()
@@ -756,19 +1422,28 @@ class MainWindow(QMainWindow):
             dtr_state = "ON" if self.trx_dtr_checkbox.isChecked() else "UNSET"
             rts_state = "ON" if self.trx_rts_checkbox.isChecked() else "UNSET"
 
-        connected = self.trx_service.connect(
+        self._pending_trx_config = (rig_id, port, baudrate, dtr_state, rts_state, conn_type)
+        self.trx_status.setText("TRX: ⏳ connecting...")
+        self.cat_poller.poller.request_connect(
             rig_id=rig_id, port=port, baudrate=baudrate,
             dtr_state=dtr_state, rts_state=rts_state
         )
 
+    def _on_trx_connect_finished(self, connected: bool):
+        """
+        Handle the result of a connect request issued by connect_trx().
+
+        Args:
+            connected (bool): Whether the TRX connection was established.
+        """
         if connected:
-            self.settings_service.set_trx_config(
-                rig_id, port, baudrate, dtr_state, rts_state, conn_type
-            )
-            self.settings_service.save()
+            if self._pending_trx_config:
+                self.settings_service.set_trx_config(*self._pending_trx_config)
+                self.settings_service.save()
             self.trx_status.setText(f"TRX: ✅ connected ({self.trx_combo.currentText()})")
         else:
             self.trx_status.setText("TRX: ❌ connection failed")
+        self._pending_trx_config = None
 
     def disconnect_trx(self):
         """
@@ -776,7 +1451,8 @@ class MainWindow(QMainWindow):
         frees the underlying port so it can be reused, e.g. by another
         application or a new connect attempt with different settings.
         """
-        self.trx_service.close()
+        self._trx_close_requested = True
+        self.cat_poller.poller.request_close()
         self.trx_status.setText("TRX: ❌ not connected")
 
     # --- Status & frequency range ---
@@ -827,46 +1503,67 @@ class MainWindow(QMainWindow):
         self._blink_state = not self._blink_state
         self._update_freq_label(self._last_freq, self._last_show_warning, blink_on=self._blink_state)
 
-    def update_status(self):
+    def _on_frequency_changed(self, freq: float):
         """
-        Update the TRX status and currently tuned frequency.
-        Applies active tuner settings if not in setup mode.
-        Handles connection state changes gracefully.
-        Also manages the blinking "no matching frequency entry" warning.
+        Handle a new frequency published by the CAT poller.
 
-        Issues exactly one Hamlib frequency query per tick. Connection loss
-        is detected from that same query (get_frequency() updates the
-        service's cached connection state internally on failure) instead of
-        a separate, redundant liveness probe.
+        Args:
+            freq (float): Current TRX frequency in Hz.
         """
-        trx_connected = False
-        freq = 0
-        try:
-            trx_connected = self.trx_service.is_connected()
-
-            if trx_connected:
-                freq = self.trx_service.get_frequency()
-                if freq is None:
-                    freq = 0
-                    trx_connected = self.trx_service.is_connected()
-
-                rig_name = self.trx_combo.currentText()
-                self.trx_status.setText(
-                    f"TRX: ✅ connected to {rig_name}" if trx_connected
-                    else "TRX: ❌ connection lost"
-                )
-            else:
+        self._last_freq = freq
+        stats = self.cat_poller.poller.stats()
+        if stats["push_active"]:
+            self.trx_status.setToolTip(
+                f"CAT push updates active ({stats['pushes']} received), "
+                f"keepalive polling at {stats['polls_per_second']:.1f} polls/s"
+            )
+        else:
+            self.trx_status.setToolTip(
+                f"CAT polling: {stats['polls_per_second']:.1f} polls/s, "
+                f"reaction latency ≤ {stats['reaction_latency'] * 1000:.0f} ms"
+            )
+        self.update_status()
+
+    def _on_trx_status_changed(self, connected: bool):
+        """
+        Handle a TRX connection state change published by the CAT poller.
+
+        Args:
+            connected (bool): Whether the TRX is connected.
+        """
+        self._trx_connected = connected
+        if connected:
+            self.trx_status.setText(f"TRX: ✅ connected to {self.trx_combo.currentText()}")
+        else:
+            self._last_freq = 0
+            if self._trx_close_requested:
                 self.trx_status.setText("TRX: ❌ not connected")
+            else:
+                self.trx_status.setText("TRX: ❌ connection lost")
+        self._trx_close_requested = False
+        self.update_status()
 
-        except Exception as e:
-            print(f"Error updating TRX status: {e}")
-            self.trx_status.setText("TRX: ❌ error")
+    def update_status(self):
+        """
+        Update the displayed frequency from the last value published by the
+        CAT poller. Applies active tuner settings if not in setup mode.
+        Also manages the blinking "no matching frequency entry" warning.
 
+        Never talks to the TRX itself - it only runs in response to
+        EventBus signals (and mode changes), so it is cheap and non-blocking.
+        """
+        trx_connected = self._trx_connected
+        freq = self._last_freq
         show_warning = False
         if not self.setup_mode and trx_connected:
-            entry = self.settings_service.get_for_frequency(freq)
-            if entry != self._active_entry:
-                self._active_entry = entry
+            # Lookup + send happen in the engine; only mirror the result here
+            entry, switched = self.auto_tune.process_frequency(freq)
+            delay = self.auto_tune.recheck_delay()
+            if delay is None:
+                self.recheck_timer.stop()
+            else:
+                self.recheck_timer.start(int(delay * 1000) + 1)
+            if switched and self._advanced_built:
                 if entry:
                     self.L_slider.blockSignals(True)
                     self.C_slider.blockSignals(True)
@@ -878,7 +1575,6 @@ class MainWindow(QMainWindow):
                     self.HP_checkbox.setChecked(entry["highpass"])
                     self.L_value_label.setValue(entry["L"])
                     self.C_value_label.setValue(entry["C"])
-                    self._send_tuner_values()
                     self.L_slider.blockSignals(False)
                     self.C_slider.blockSignals(False)
                     self.HP_checkbox.blockSignals(False)
@@ -932,6 +1628,10 @@ class MainWindow(QMainWindow):
         Args:
             reachable (bool): Whether the tuner is reachable.
         """
+        # Back after an outage - it may have rebooted with default relays
+        if reachable and self._tuner_reachable is False:
+            self.tuner_sender.request_refresh()
+        self._tuner_reachable = reachable
         self._set_tuner_status(reachable)
 
     # --- Setup mode ---
@@ -943,29 +1643,36 @@ class MainWindow(QMainWindow):
             checked (bool): True if setup mode should be active.
         """
         self.setup_mode = checked
+        if not checked and self.search_thread is not None:
+            self.search_thread.search.stop()
         self._apply_mode_settings()
+        self.update_status()
 
     def _apply_mode_settings(self):
         """
         Apply UI changes based on setup mode.
         Enables/disables relevant widgets and adjusts style.
         """
-        for w in [self.L_slider, self.C_slider, self.HP_checkbox,
-                  self.L_value_label, self.C_value_label,
-                  self.freq_min_input, self.freq_max_input,
-                  self.save_button, self.delete_button,
-                  self.load_json_button, self.freq_list]:
-            w.setEnabled(self.setup_mode)
-
-        # Keep the switch's checked state in sync regardless of what
-        # triggered this (button click, or a future programmatic caller) -
-        # blockSignals avoids re-entering toggle_setup_mode via clicked.
-        self._setup_mode_btn.blockSignals(True)
-        self._active_mode_btn.blockSignals(True)
-        self._setup_mode_btn.setChecked(self.setup_mode)
-        self._active_mode_btn.setChecked(not self.setup_mode)
-        self._setup_mode_btn.blockSignals(False)
-        self._active_mode_btn.blockSignals(False)
+        if self._advanced_built:
+            for w in [self.L_slider, self.C_slider, self.HP_checkbox,
+                      self.L_value_label, self.C_value_label,
+                      self.freq_min_input, self.freq_max_input,
+                      self.save_button, self.delete_button, self.search_button,
+                      self.load_json_button, self.freq_filter, self.freq_table,
+                      self.interp_mode_combo, self.interp_distance_input,
+                      self.hysteresis_margin_input, self.hysteresis_hold_input,
+                      self.motion_speed_input, self.motion_max_hold_input]:
+                w.setEnabled(self.setup_mode)
+
+            # Keep the switch's checked state in sync regardless of what
+            # triggered this (button click, or a future programmatic caller) -
+            # blockSignals avoids re-entering toggle_setup_mode via clicked.
+            self._setup_mode_btn.blockSignals(True)
+            self._active_mode_btn.blockSignals(True)
+            self._setup_mode_btn.setChecked(self.setup_mode)
+            self._active_mode_btn.setChecked(not self.setup_mode)
+            self._setup_mode_btn.blockSignals(False)
+            self._active_mode_btn.blockSignals(False)
 
         style = _status_style("setup" if self.setup_mode else "active")
         self.trx_status.setStyleSheet(style)
@@ -989,10 +1696,20 @@ class MainWindow(QMainWindow):
         always preserved, since the reduced view naturally needs less
         width than the tabs and would otherwise visibly narrow/widen the
         window on every toggle too.
+
+        The advanced section is built on the first expand, and the chosen
+        view is saved so the next start opens the same way.
         """
         expanded = self.toggle_button_view.isChecked()
-        self.advanced_widget.setVisible(expanded)
-        self.setup_mode_switch.setVisible(expanded)
+        if expanded and not self._advanced_built:
+            self._build_advanced()
+            self._apply_mode_settings()
+        if self._advanced_built:
+            self.advanced_widget.setVisible(expanded)
+            self.setup_mode_switch.setVisible(expanded)
+        if self.settings_service.gui_expanded != expanded:
+            self.settings_service.gui_expanded = expanded
+            self.settings_service.save()
         self.toggle_button_view.setText("Reduce view" if expanded else "Expand view")
         # Clear any leftover fixed/min/max height constraints from previous
         # toggles before asking Qt to recompute the natural size - otherwise
@@ -1010,24 +1727,105 @@ class MainWindow(QMainWindow):
         """
         self.resize(self.width(), self.sizeHint().height())
 
-    # --- Debounce ---
+    # --- Slider changes ---
     def schedule_update(self):
         """
-        Schedule sending tuner values after a short debounce interval.
+        Pass slider changes on to the tuner (setup mode only). The tuner
+        sender streams the newest values at the SBC65EC's frame rate, so a
+        drag shows its intermediate states without queueing them up.
         """
         if self.setup_mode:
-            self.debounce_timer.start(50)
+            self._send_tuner_values()
 
     # --- Send values ---
     def _send_tuner_values(self):
         """
-        Send current L, C, and HP values to tuner if reachable.
+        Queue the current L, C, and HP values for the tuner if reachable.
         """
         if self.tuner_service.is_reachable():
             l_val = self.L_slider.value()
             c_val = self.C_slider.value()
             hp_val = self.HP_checkbox.isChecked()
-            self.tuner_service.send_values(l_val, c_val, hp_val)
+            self.tuner_sender.submit(l_val, c_val, hp_val)
+
+    # --- Auto search ---
+    def toggle_auto_search(self):
+        """
+        Start an SWR-feedback search for the current frequency, or stop the
+        running one.
+        """
+        if self.search_thread is not None:
+            self.search_thread.search.stop()
+            return
+        if not self.setup_mode:
+            return
+        if not self._trx_connected or not self.tuner_service.is_reachable():
+            QMessageBox.warning(self, "Auto search",
+                                "Connect the TRX and the tuner, then key a low-power carrier.")
+            return
+        self.search_thread = AutoSearchThread(self.tuner_service, self.cat_poller.poller)
+        self.search_thread.progress.connect(self._on_search_progress)
+        self.search_thread.result_ready.connect(self._on_search_result)
+        self.search_thread.failed.connect(self._on_search_failed)
+        self.search_thread.finished.connect(self._on_search_finished)
+        self._pre_search = (self.L_slider.value(), self.C_slider.value(), self.HP_checkbox.isChecked())
+        for w in (self.L_slider, self.C_slider, self.HP_checkbox,
+                  self.L_value_label, self.C_value_label, self.save_button):
+            w.setEnabled(False)
+        self.search_button.setText("Stop search")
+        self.search_thread.start()
+
+    def _on_search_progress(self, l_val: int, c_val: int, highpass: bool, swr: float):
+        self.search_button.setText(f"Stop search (best SWR {swr:.2f})")
+
+    def _on_search_result(self, result: dict):
+        """
+        Show the best setting on the controls and save it as a new entry
+        for the entered range (or the current frequency +/- SEARCH_HALF_SPAN).
+        A stopped search, or one ending outside setup mode, is discarded.
+        """
+        print(f"Auto search: L={result['L']}, C={result['C']}, HP={result['highpass']}, "
+              f"SWR {result['swr']:.2f} after {result['measurements']} settings, "
+              f"{result['relay_ops']} relay operations, {result['elapsed']:.1f} s")
+        if result["stopped"] or not self.setup_mode:
+            self._restore_after_search()
+            return
+        # The tuner is already at the best setting; keep the sliders quiet
+        for w, value in ((self.L_slider, result["L"]), (self.C_slider, result["C"]),
+                         (self.L_value_label, result["L"]), (self.C_value_label, result["C"])):
+            w.blockSignals(True)
+            w.setValue(value)
+            w.blockSignals(False)
+        self.HP_checkbox.blockSignals(True)
+        self.HP_checkbox.setChecked(result["highpass"])
+        self.HP_checkbox.blockSignals(False)
+        self.tuner_sender.submit(result["L"], result["C"], result["highpass"])
+        if not (self.freq_min_input.text() and self.freq_max_input.text()) and self._last_freq:
+            self.freq_min_input.setText(str(int(self._last_freq) - self.SEARCH_HALF_SPAN))
+            self.freq_max_input.setText(str(int(self._last_freq) + self.SEARCH_HALF_SPAN))
+        self.save_current()
+
+    def _restore_after_search(self):
+        """
+        Puts the tuner back where it was before the search stepped through
+        its settings: in active mode on the auto-tune engine's entry, in
+        setup mode on the (unchanged) slider values.
+        """
+        entry = None if self.setup_mode else self.auto_tune.active_entry
+        if entry:
+            self.tuner_sender.submit(entry["L"], entry["C"], entry["highpass"])
+        elif self._pre_search is not None:
+            self.tuner_sender.submit(*self._pre_search)
+
+    def _on_search_failed(self, message: str):
+        self._restore_after_search()
+        QMessageBox.warning(self, "Auto search", f"Search aborted: {message}")
+
+    def _on_search_finished(self):
+        self.search_thread = None
+        self._pre_search = None
+        self.search_button.setText("Auto search")
+        self._apply_mode_settings()
 
     # --- Save / delete / JSON ---
     def save_current(self):
@@ -1044,13 +1842,10 @@ class MainWindow(QMainWindow):
         c_val = self.C_slider.value()
         hp_val = self.HP_checkbox.isChecked()
 
-        # Save to settings service
-        self.settings_service.add_entry(min_freq, max_freq, l_val, c_val, hp_val)
+        # Save to settings service; the table picks up the new row
+        self.freq_model.add_entry(min_freq, max_freq, l_val, c_val, hp_val)
         self.settings_service.save()
 
-        # Refresh list
-        self.load_list()
-
     def delete_selected(self):
         """
         Delete currently selected frequency entry.
@@ -1058,11 +1853,11 @@ class MainWindow(QMainWindow):
         if not self.setup_mode:
             return
 
-        current_row = self.freq_list.currentRow()
-        if current_row >= 0:
-            self.settings_service.delete_entry(current_row)
+        # The view is sorted/filtered: map back to the storage index
+        current = self.freq_proxy.mapToSource(self.freq_table.currentIndex())
+        if current.isValid():
+            self.freq_model.remove_entry(current.row())
             self.settings_service.save()
-            self.load_list()
 
     def load_from_json(self):
         """
@@ -1077,18 +1872,34 @@ class MainWindow(QMainWindow):
         )
         if filename:
             self.settings_service.load_from_json(filename)
-            self.load_list()
+            self.freq_model.reload()
 
-    def load_list(self):
+    def _on_interp_changed(self):
         """
-        Refresh the list widget with current frequency entries.
+        Store the gap filling settings; the lookup picks them up right away.
         """
-        self.freq_list.clear()
-        for entry in self.settings_service.data:
-            self.freq_list.addItem(
-                f"{entry['min_freq']}-{entry['max_freq']} Hz: L={entry['L']}, C={entry['C']}, HP={entry['highpass']}"
-            )
+        self.settings_service.interp_mode = self.interp_mode_combo.currentData()
+        self.settings_service.interp_max_distance = self.interp_distance_input.value() * 1000
+        self.settings_service.save()
+        self.auto_tune.reset()
+        self.update_status()
+
+    def _on_hysteresis_changed(self):
+        """
+        Store the band-edge hysteresis and the motion gate; applies from
+        the next frequency on.
+        """
+        self.settings_service.hysteresis_margin = self.hysteresis_margin_input.value()
+        self.settings_service.hysteresis_hold = self.hysteresis_hold_input.value()
+        self.settings_service.motion_speed = self.motion_speed_input.value() * 1000
+        self.settings_service.motion_max_hold = self.motion_max_hold_input.value()
+        self.settings_service.save()
 
+    def _on_freq_filter_changed(self, text: str):
+        """
+        Limit the frequency table to the entries covering the typed frequency.
+        """
+        self.freq_proxy.set_frequency(int(text) if text else None)
 
     # --- SBC connection ---
     def connect_to_sbc(self):
@@ -1136,11 +1947,55 @@ class MainWindow(QMainWindow):
         # Network mode always forces rig model to NETRIGCTL (see above), so
         # only restore a saved rig model when in serial mode.
         if conn_type != "network":
-            index = self.trx_combo.findData(self.settings_service.trx_id)
-            if index >= 0:
-                self.trx_combo.setCurrentIndex(index)
+            self._select_rig_model(self.settings_service.trx_id)
+        if self.trx_combo.currentIndex() < 0 and self.trx_model_list.canFetchMore():
+            # Nothing saved yet: preselect the first model, as before
+            self.trx_model_list.fetchMore()
+            self.trx_combo.setCurrentIndex(0)
 
         self.trx_port_input.setText(self.settings_service.trx_port)
         self.trx_baudrate_input.setCurrentText(str(self.settings_service.trx_baudrate))
         self.trx_dtr_checkbox.setChecked(self.settings_service.trx_dtr_state == "ON")
         self.trx_rts_checkbox.setChecked(self.settings_service.trx_rts_state == "ON")
+
+        interp_index = self.interp_mode_combo.findData(self.settings_service.interp_mode)
+        self.interp_mode_combo.setCurrentIndex(max(interp_index, 0))
+        self.interp_distance_input.setValue(int(self.settings_service.interp_max_distance) // 1000)
+        self.hysteresis_margin_input.setValue(int(self.settings_service.hysteresis_margin))
+        self.hysteresis_hold_input.setValue(float(self.settings_service.hysteresis_hold))
+        self.motion_speed_input.setValue(int(self.settings_service.motion_speed) // 1000)
+        self.motion_max_hold_input.setValue(float(self.settings_service.motion_max_hold))
+
+    # --- Debug ---
+    def show_latency_panel(self):
+        """
+        Open the tune latency debug panel.
+        """
+        if self.latency_panel is None:
+            self.latency_panel = LatencyPanel(self, self.auto_tune, self.tuner_sender)
+        self.latency_panel.show()
+        self.latency_panel.raise_()
+
+    # --- Window state ---
+    def changeEvent(self, event):
+        """
+        Slow CAT polling down to its idle rate while the window is minimised.
+        """
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.cat_poller.poller.set_minimized(self.isMinimized())
+        super().changeEvent(event)
+
+    # --- Shutdown ---
+    def closeEvent(self, event):
+        """
+        Stop the worker threads (closing the TRX connection) and fold the
+        settings journal into the settings file before the window goes away.
+        """
+        if self.search_thread is not None:
+            self.search_thread.stop()
+        self.cat_poller.stop()
+        self.tuner_sender.stop()
+        if self.heartbeat_thread.isRunning():
+            self.heartbeat_thread.stop()
+        self.settings_service.close()
+        super().closeEvent(event)
@@ -28,32 +28,68 @@
 """
 Main entry point for the Christian-Koppler Control Software (ck-netctrl).
 
-This module initializes the Qt application and launches the main GUI window.
+This module initializes the Qt application and launches the main GUI window,
+or runs the auto-tune loop without any GUI.
 
 Usage:
-    python main.py
+    python main.py [--profile-startup]
+    python main.py --headless [--settings settings.json] [--latency-dump latency.json]
 
 Modules:
     gui: Contains the MainWindow class for the GUI.
+    backend.headless: Qt-free auto-tune daemon.
 """
 
-from PyQt6.QtWidgets import QApplication
-from gui import MainWindow
+import time
+_T0 = time.perf_counter()
+
+import argparse
 import sys
+from backend.utils.startup_profile import profiler
 
 def main():
     """
-    Initializes and runs the Qt application.
+    Initializes and runs the Qt application, or the headless daemon.
 
     This function:
-    1. Creates a QApplication instance.
-    2. Instantiates the MainWindow.
-    3. Shows the main window.
-    4. Starts the Qt event loop.
+    1. Parses the command line.
+    2. With --headless, runs backend.headless without importing PyQt at all.
+    3. Otherwise creates a QApplication instance and the MainWindow,
+       shows it and starts the Qt event loop.
     """
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Christian-Koppler Control Software")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the auto-tune loop without GUI (e.g. under systemd)")
+    parser.add_argument("--settings", default="settings.json",
+                        help="settings file for --headless (default: settings.json)")
+    parser.add_argument("--latency-dump", metavar="FILE",
+                        help="with --headless: record tune latencies and write them to FILE on exit")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print the time spent per startup phase up to the first frame")
+    args, qt_args = parser.parse_known_args()
+
+    if args.headless:
+        from backend import headless
+        sys.exit(headless.run(args.settings, args.latency_dump))
+
+    if args.profile_startup:
+        profiler.start(_T0)
+        profiler.mark("argparse")
+
+    # Imported here so the headless mode never loads Qt
+    from PyQt6.QtWidgets import QApplication
+    profiler.mark("import PyQt6")
+    from gui import MainWindow, FirstFrameProbe
+    profiler.mark("import gui + backend")
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    profiler.mark("QApplication")
+    if args.profile_startup:
+        probe = FirstFrameProbe(app)
+        app.installEventFilter(probe)
     window = MainWindow()
     window.show()
+    profiler.mark("window.show")
     sys.exit(app.exec())
 
 if __name__ == "__main__":